@@ -80,8 +80,10 @@ available in the knowledge base and suggest contacting technical support."""
             query_length=len(user_query),
         )
 
-        # Get relevant context from RAG
-        context = await self._get_rag_context(user_query)
+        # Get relevant context from RAG, unless the caller already retrieved it
+        context = state["context"].get("rag_context")
+        if context is None:
+            context = await self._get_rag_context(user_query)
 
         # Generate response with context
         chain = self.prompt | self.llm
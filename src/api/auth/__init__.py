@@ -11,6 +11,7 @@ from src.api.auth.jwt_auth import (
     UserResponse,
     create_tokens,
     decode_token,
+    verify_access_token,
 )
 
 __all__ = [
@@ -24,4 +25,5 @@ __all__ = [
     "UserResponse",
     "create_tokens",
     "decode_token",
+    "verify_access_token",
 ]
@@ -1,7 +1,10 @@
 """Built-in JWT authentication - lightweight, no external service needed."""
 
+import hashlib
+import time
+from collections import OrderedDict
 from datetime import datetime, timedelta
-from typing import Optional
+from typing import Optional, Tuple
 from uuid import uuid4
 
 import structlog
@@ -127,6 +130,50 @@ def decode_token(token: str) -> TokenPayload:
         )
 
 
+# Recently verified access tokens, keyed by blake2b(token) -> (user, expiry timestamp).
+# Repeat requests and WebSocket reconnects skip signature verification while valid.
+ACCESS_CACHE_SIZE = 10_000
+ACCESS_CACHE_TTL_SECONDS = 60
+_access_cache: "OrderedDict[bytes, Tuple[AuthenticatedUser, float]]" = OrderedDict()
+
+
+def verify_access_token(token: str) -> AuthenticatedUser:
+    """
+    Validate an access token and return its user.
+    
+    Results are cached for a short time, never past the token's own expiry.
+    Raises HTTPException (401) for invalid, expired or non-access tokens.
+    """
+    now = time.time()
+    cache_key = hashlib.blake2b(token.encode(), digest_size=16).digest()
+    cached = _access_cache.get(cache_key)
+    if cached is not None:
+        user, expires_at = cached
+        if expires_at > now:
+            _access_cache.move_to_end(cache_key)
+            return user
+        del _access_cache[cache_key]
+    
+    payload = decode_token(token)
+    if payload.type != "access":
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid access token",
+        )
+    
+    user = AuthenticatedUser(
+        user_id=payload.sub,
+        email=payload.email,
+        name=payload.name,
+    )
+    
+    _access_cache[cache_key] = (user, min(payload.exp.timestamp(), now + ACCESS_CACHE_TTL_SECONDS))
+    if len(_access_cache) > ACCESS_CACHE_SIZE:
+        _access_cache.popitem(last=False)
+    
+    return user
+
+
 def create_tokens(user_id: str, email: str, name: str) -> TokenResponse:
     """Create access and refresh tokens."""
     access_token = create_token(user_id, email, name, "access")
@@ -230,19 +277,7 @@ async def get_current_user(
             headers={"WWW-Authenticate": "Bearer"},
         )
 
-    payload = decode_token(credentials.credentials)
-    
-    if payload.type != "access":
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Invalid access token",
-        )
-
-    return AuthenticatedUser(
-        user_id=payload.sub,
-        email=payload.email,
-        name=payload.name,
-    )
+    return verify_access_token(credentials.credentials)
 
 
 async def get_optional_user(
@@ -253,13 +288,6 @@ async def get_optional_user(
         return None
 
     try:
-        payload = decode_token(credentials.credentials)
-        if payload.type != "access":
-            return None
-        return AuthenticatedUser(
-            user_id=payload.sub,
-            email=payload.email,
-            name=payload.name,
-        )
+        return verify_access_token(credentials.credentials)
     except HTTPException:
         return None
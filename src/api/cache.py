@@ -15,6 +15,9 @@ settings = get_settings()
 # Global Redis connection pool
 _redis_pool: Optional[redis.Redis] = None
 
+# Pool for binary values (responses are returned as raw bytes)
+_redis_binary_pool: Optional[redis.Redis] = None
+
 
 async def get_redis() -> redis.Redis:
     """Get Redis connection."""
@@ -30,13 +33,27 @@ async def get_redis() -> redis.Redis:
     return _redis_pool
 
 
+async def get_redis_binary() -> redis.Redis:
+    """Get Redis connection that returns raw bytes (for binary values)."""
+    global _redis_binary_pool
+    
+    if _redis_binary_pool is None:
+        _redis_binary_pool = redis.from_url(settings.redis_url)
+    
+    return _redis_binary_pool
+
+
 async def close_redis():
-    """Close Redis connection."""
-    global _redis_pool
+    """Close Redis connections."""
+    global _redis_pool, _redis_binary_pool
     
     if _redis_pool:
         await _redis_pool.close()
         _redis_pool = None
+    
+    if _redis_binary_pool:
+        await _redis_binary_pool.close()
+        _redis_binary_pool = None
 
 
 class ResponseCache:
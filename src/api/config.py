@@ -48,9 +48,15 @@ class Settings(BaseSettings):
     scheduler_api_url: str = "http://localhost:9000"
     scheduler_api_key: str = ""
 
+    # WebSocket
+    max_ws_connections: int = 500  # Concurrent /ws/chat sessions per process
+
     # Vector search
     similarity_top_k: int = 5
 
+    # RAG evaluation
+    eval_judge_ctx_chars: int = 1200  # Per-context char budget sent to the LLM judge
+
     # PII Protection
     mask_pii: bool = True  # Mask sensitive data in logs
 
@@ -12,6 +12,7 @@ from src.api.config import get_settings
 from src.api.routes import auth, chat, health, documents, metrics as metrics_routes, evaluation, websocket
 from src.api.observability import RequestTracingMiddleware
 from src.api.cache import close_redis
+from src.rag.embeddings import close_http_client
 from src.storage.database import init_db
 
 # Configure structured logging
@@ -45,6 +46,7 @@ async def lifespan(app: FastAPI):
     yield
     logger.info("Shutting down GenAI Auto API")
     await close_redis()
+    await close_http_client()
 
 
 app = FastAPI(
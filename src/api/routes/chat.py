@@ -9,7 +9,7 @@ from pydantic import BaseModel, Field
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.storage.database import get_db
-from src.orchestrator.graph import create_workflow, AgentState
+from src.orchestrator.graph import get_workflow, new_agent_state
 
 logger = structlog.get_logger()
 router = APIRouter()
@@ -49,19 +49,18 @@ async def chat(
     )
 
     try:
-        # Create the LangGraph workflow
-        workflow = create_workflow()
-
-        # Prepare initial state
-        initial_state: AgentState = {
-            "messages": [{"role": "user", "content": request.message}],
-            "session_id": session_id,
-            "customer_id": str(request.customer_id) if request.customer_id else None,
-            "vehicle_id": str(request.vehicle_id) if request.vehicle_id else None,
-            "metadata": request.metadata,
-            "current_agent": None,
-            "context": {},
-        }
+        # Get the (cached) LangGraph workflow
+        workflow = get_workflow()
+
+        # Prepare initial state from the shared template
+        initial_state = new_agent_state()
+        initial_state["messages"].append({"role": "user", "content": request.message})
+        initial_state["session_id"] = session_id
+        if request.customer_id:
+            initial_state["customer_id"] = str(request.customer_id)
+        if request.vehicle_id:
+            initial_state["vehicle_id"] = str(request.vehicle_id)
+        initial_state["metadata"] = request.metadata
 
         # Run the workflow
         final_state = await workflow.ainvoke(initial_state)
@@ -8,52 +8,287 @@ Provides streaming chat responses with:
 - Error handling and reconnection support
 """
 
-from typing import Dict, Any, Optional
-from datetime import datetime
+import asyncio
+import hashlib
+import itertools
+import logging
+import os
+import time
+from typing import Dict, Any, List, Optional, Set, Tuple
 
+import orjson
 import structlog
-from fastapi import APIRouter, WebSocket, WebSocketDisconnect, Query, Depends
-from fastapi.responses import HTMLResponse
-from sqlalchemy.ext.asyncio import AsyncSession
+from fastapi import APIRouter, Request, WebSocket, WebSocketDisconnect, Query
+from fastapi.responses import HTMLResponse, Response
 
-from src.api.auth.jwt_auth import decode_token, AuthenticatedUser
+from src.api.auth.jwt_auth import verify_access_token, AuthenticatedUser
 from src.api.config import get_settings
-from src.storage.database import get_db
-from src.orchestrator.graph import create_workflow, AgentState
+from src.orchestrator.graph import get_workflow, new_agent_state, AgentState
 
 logger = structlog.get_logger()
+# stdlib logger behind structlog; used to skip building debug-only fields
+_stdlib_logger = logging.getLogger(__name__)
 settings = get_settings()
 
 router = APIRouter(tags=["websocket"])
 
+# Client IDs: process id + monotonic counter (unique even under rapid reconnects)
+_WS_PID = os.getpid()
+_WS_COUNTER = itertools.count()
+
+# Workflow nodes whose LLM output is streamed to the client as tokens
+_AGENT_NODES = frozenset({"specs", "maintenance", "troubleshoot"})
+
+# Outbound frames are message dicts, already-serialized JSON bytes, or lists
+# of raw token texts that the writer encodes through the byte templates below
+Frame = Dict[str, Any] | bytes | List[str]
+
+# Outbound queue size per connection and max frames drained per writer wake-up
+OUT_QUEUE_SIZE = 256
+MAX_SEND_BATCH = 64
+
+# Caps concurrent chat sessions; extra clients are closed with 1013 (try again later)
+_WS_SLOTS = asyncio.Semaphore(settings.max_ws_connections)
+
+
+def _dumps(data: Dict[str, Any]) -> bytes:
+    """Serialize a message with orjson (UTF-8 JSON bytes)."""
+    return orjson.dumps(data)
+
+
+# Fixed frames, serialized once at import time
+_PROGRESS_STARTING = _dumps({
+    "type": "progress",
+    "step": "starting",
+    "message": "Processing your question..."
+})
+_PROGRESS_AGENT_ROUTING = _dumps({
+    "type": "progress",
+    "step": "agent_routing",
+    "message": "Routing to the right expert..."
+})
+_PROGRESS_RAG_RETRIEVAL = _dumps({
+    "type": "progress",
+    "step": "rag_retrieval",
+    "message": "Searching knowledge base..."
+})
+_ERROR_EMPTY_MESSAGE = _dumps({
+    "type": "error",
+    "error": "Message is required",
+    "code": "EMPTY_MESSAGE"
+})
+_AUTH_ERROR = _dumps({
+    "type": "auth_error",
+    "message": "Invalid token"
+})
+
+# Token frames are spliced from byte templates; orjson only escapes the value
+_TOKEN_PREFIX = b'{"type":"token","token":'
+_TOKEN_BATCH_PREFIX = b'{"type":"token_batch","tokens":'
+_FRAME_SUFFIX = b"}"
+
+
+def _merge_token_frames(batch: List[Frame]) -> List[Frame]:
+    """Collapse runs of consecutive token frames into single token_batch frames."""
+    frames: List[Frame] = []
+    tokens: List[str] = []
+    
+    for message in batch:
+        if isinstance(message, list):
+            tokens.extend(message)
+            continue
+        if tokens:
+            frames.append(_token_frame(tokens))
+            tokens = []
+        frames.append(message)
+    
+    if tokens:
+        frames.append(_token_frame(tokens))
+    return frames
+
+
+def _token_frame(tokens: List[str]) -> bytes:
+    """Encode a token frame, merging several tokens when more than one is pending."""
+    if len(tokens) == 1:
+        return _TOKEN_PREFIX + orjson.dumps(tokens[0]) + _FRAME_SUFFIX
+    return _TOKEN_BATCH_PREFIX + orjson.dumps(tokens) + _FRAME_SUFFIX
+
+
+async def _receive_json(websocket: WebSocket) -> Dict[str, Any]:
+    """Receive a text or binary frame and parse it with orjson."""
+    message = await websocket.receive()
+    if message["type"] == "websocket.disconnect":
+        raise WebSocketDisconnect(message.get("code", 1000), message.get("reason"))
+    
+    raw = message.get("text")
+    if raw is None:
+        raw = message.get("bytes")
+    return orjson.loads(raw)
+
+
+class FrameQueue(asyncio.Queue):
+    """Bounded outbound queue where token frames coalesce instead of overflowing."""
+    
+    def __init__(self, maxsize: int = 0):
+        super().__init__(maxsize)
+        # Token list of the newest frame, while it is a token frame still in the queue
+        self._open_tokens: Optional[List[str]] = None
+    
+    def put_nowait(self, item: Frame):
+        """Queue a frame; later tokens no longer join the previous token frame."""
+        super().put_nowait(item)
+        self._open_tokens = None
+    
+    def get_nowait(self) -> Frame:
+        """Take the oldest frame; a token frame taken off the queue is closed."""
+        item = super().get_nowait()
+        if item is self._open_tokens:
+            self._open_tokens = None
+        return item
+    
+    def put_token(self, token: str) -> bool:
+        """
+        Queue a token's text without waiting.
+        
+        When the queue is full the token is appended to the newest pending
+        token frame. Returns False (token dropped) only if the newest pending
+        frame is not a token frame; the final "complete" frame still carries
+        the whole response.
+        """
+        if not self.full():
+            tokens = [token]
+            self.put_nowait(tokens)
+            self._open_tokens = tokens
+            return True
+        
+        if self._open_tokens is not None:
+            self._open_tokens.append(token)
+            return True
+        return False
+
 
 class ConnectionManager:
     """Manage WebSocket connections."""
     
     def __init__(self):
         self.active_connections: Dict[str, WebSocket] = {}
+        self.out_queues: Dict[str, FrameQueue] = {}
+        self._writers: Dict[str, asyncio.Task] = {}
+        self._binary_clients: Set[str] = set()
     
-    async def connect(self, websocket: WebSocket, client_id: str):
-        """Accept and store connection."""
+    async def connect(self, websocket: WebSocket, client_id: str, binary: bool = False):
+        """
+        Accept and store connection, starting its writer task.
+        
+        Binary clients receive the orjson bytes as-is in binary frames; text
+        clients get the same JSON decoded into text frames.
+        """
         await websocket.accept()
         self.active_connections[client_id] = websocket
-        logger.info("WebSocket connected", client_id=client_id)
+        if binary:
+            self._binary_clients.add(client_id)
+        self.start_writer(client_id, websocket, binary)
+        logger.info("WebSocket connected", client_id=client_id, binary=binary)
+    
+    def start_writer(self, client_id: str, websocket: WebSocket, binary: bool = False) -> FrameQueue:
+        """Create the client's outbound queue and its single long-lived writer task."""
+        queue = FrameQueue(maxsize=OUT_QUEUE_SIZE)
+        self.out_queues[client_id] = queue
+        self._writers[client_id] = asyncio.create_task(self._writer(client_id, websocket, queue, binary))
+        return queue
     
     def disconnect(self, client_id: str):
-        """Remove connection."""
+        """Remove connection, stop its writer task and drop unsent frames."""
+        writer = self._writers.pop(client_id, None)
+        if writer is not None:
+            writer.cancel()
+        
+        queue = self.out_queues.pop(client_id, None)
+        if queue is not None:
+            while not queue.empty():
+                queue.get_nowait()
+                queue.task_done()
+        
+        self._binary_clients.discard(client_id)
         if client_id in self.active_connections:
             del self.active_connections[client_id]
             logger.info("WebSocket disconnected", client_id=client_id)
     
-    async def send_json(self, client_id: str, data: Dict[str, Any]):
-        """Send JSON message to client."""
-        if client_id in self.active_connections:
-            await self.active_connections[client_id].send_json(data)
+    def enqueue_token(self, client_id: str, token: str):
+        """Queue a token frame; never waits, coalesces when the client is slow."""
+        queue = self.out_queues.get(client_id)
+        if queue is not None and not queue.put_token(token):
+            logger.warning("WebSocket token dropped, client too slow", client_id=client_id)
+    
+    async def enqueue(self, client_id: str, data: Frame):
+        """
+        Queue a JSON message (dict or pre-serialized bytes) for the client's writer task.
+        
+        Waits for room when the queue is full, so control frames such as
+        "complete" are always delivered (back-pressure on the producer).
+        """
+        queue = self.out_queues.get(client_id)
+        if queue is not None:
+            await queue.put(data)
+    
+    async def _writer(self, client_id: str, websocket: WebSocket, queue: FrameQueue, binary: bool):
+        """
+        Drain the outbound queue, merging pending token frames into one send.
+        
+        The socket and queue are bound once here, so the per-frame path never
+        goes back through the connection registry. Frames go out as raw ASGI
+        messages, skipping the send_bytes/send_text wrappers.
+        """
+        send = websocket.send
+        key = "bytes" if binary else "text"
+        try:
+            while True:
+                batch = [await queue.get()]
+                while not queue.empty() and len(batch) < MAX_SEND_BATCH:
+                    batch.append(queue.get_nowait())
+                
+                for frame in _merge_token_frames(batch):
+                    payload = frame if isinstance(frame, bytes) else _dumps(frame)
+                    await send({"type": "websocket.send", key: payload if binary else payload.decode()})
+                
+                for _ in batch:
+                    queue.task_done()
+        except Exception as e:
+            logger.warning("WebSocket writer stopped", client_id=client_id, error=str(e))
+    
+    async def run_turn(self, client_id: str, producer: asyncio.Task) -> Any:
+        """
+        Await a producer task while the client's writer keeps draining its queue.
+        
+        If the writer stops first (socket gone), the producer is cancelled so
+        the LLM doesn't keep generating for nobody.
+        """
+        writer = self._writers.get(client_id)
+        try:
+            if writer is not None:
+                await asyncio.wait({producer, writer}, return_when=asyncio.FIRST_COMPLETED)
+                if not producer.done():
+                    raise WebSocketDisconnect()
+            return await producer
+        finally:
+            if not producer.done():
+                producer.cancel()
+    
+    async def send(self, client_id: str, payload: bytes):
+        """Send serialized JSON to client directly (broadcast/admin use)."""
+        websocket = self.active_connections.get(client_id)
+        if websocket is None:
+            return
+        if client_id in self._binary_clients:
+            await websocket.send_bytes(payload)
+        else:
+            await websocket.send_text(payload.decode())
     
     async def send_text(self, client_id: str, message: str):
-        """Send text message to client."""
-        if client_id in self.active_connections:
-            await self.active_connections[client_id].send_text(message)
+        """Send text message to client directly (broadcast/admin use)."""
+        websocket = self.active_connections.get(client_id)
+        if websocket is not None:
+            await websocket.send_text(message)
 
 
 manager = ConnectionManager()
@@ -63,6 +298,9 @@ async def authenticate_websocket(token: Optional[str]) -> Optional[Authenticated
     """
     Authenticate WebSocket connection.
     
+    Verified tokens are cached by verify_access_token, so reconnects don't
+    pay for a full JWT decode.
+    
     Args:
         token: JWT token from query param or message
         
@@ -72,29 +310,73 @@ async def authenticate_websocket(token: Optional[str]) -> Optional[Authenticated
     if not token:
         return None
     
+    # Remove "Bearer " prefix if present
+    if token.startswith("Bearer "):
+        token = token[7:]
+    
     try:
-        # Remove "Bearer " prefix if present
-        if token.startswith("Bearer "):
-            token = token[7:]
-        
-        payload = decode_token(token)
-        return AuthenticatedUser(
-            user_id=payload["sub"],
-            email=payload["email"],
-            name=payload["name"]
-        )
+        return verify_access_token(token)
     except Exception as e:
         logger.warning("WebSocket auth failed", error=str(e))
         return None
 
 
+async def _stream_workflow(
+    workflow, state: AgentState, client_id: str
+) -> Tuple[Optional[Dict[str, Any]], int]:
+    """
+    Run the workflow, forwarding agent LLM deltas as they are generated.
+    
+    LangGraph yields each chunk's new text, so no diffing of the accumulated
+    response is needed. Returns the final state and the number of tokens sent.
+    """
+    final_state = None
+    tokens_sent = 0
+    async for mode, chunk in workflow.astream(state, stream_mode=["messages", "values"]):
+        if mode == "values":
+            final_state = chunk
+            continue
+        
+        message_chunk, chunk_metadata = chunk
+        if chunk_metadata.get("langgraph_node") not in _AGENT_NODES:
+            continue
+        
+        delta = message_chunk.content
+        if delta and isinstance(delta, str):
+            manager.enqueue_token(client_id, delta)
+            tokens_sent += 1
+    
+    return final_state, tokens_sent
+
+
 @router.websocket("/ws/chat")
-async def websocket_chat(websocket: WebSocket):
+async def websocket_chat(
+    websocket: WebSocket,
+    token: Optional[str] = Query(None),
+    frames: str = Query("text"),
+):
     """
     WebSocket endpoint for streaming chat (PoC - No authentication required).
     
     Protocol:
     
+    Server → Client frames are JSON. By default they are text frames; connect
+    with ?frames=binary to receive the same UTF-8 JSON as binary frames
+    (skips the bytes → str decode on the server).
+    
+    Client → Server (optional auth, or pass ?token=... on connect):
+    {
+        "type": "auth",
+        "token": "jwt-token"
+    }
+    
+    Server → Client (auth result):
+    {
+        "type": "auth_success" | "auth_error",
+        "message": "Human-readable result",
+        "user": {"id": "...", "email": "...", "name": "..."}  (auth_success only)
+    }
+    
     Client → Server (message):
     {
         "type": "message",
@@ -113,8 +395,16 @@ async def websocket_chat(websocket: WebSocket):
     Server → Client (streaming tokens):
     {
         "type": "token",
-        "token": "word or phrase",
-        "partial_response": "accumulated response so far"
+        "token": "word or phrase"
+    }
+    
+    Token frames carry only the new text; clients concatenate them. The full
+    response is sent once, in the "complete" message.
+    
+    Server → Client (merged tokens, when several are pending at once):
+    {
+        "type": "token_batch",
+        "tokens": ["word", " or", " phrase"]
     }
     
     Server → Client (complete response):
@@ -136,22 +426,46 @@ async def websocket_chat(websocket: WebSocket):
         "code": "error_code"
     }
     """
-    client_id = f"ws_{datetime.utcnow().timestamp()}"
+    if _WS_SLOTS.locked():
+        await websocket.accept()
+        await websocket.close(code=1013)
+        logger.warning("WebSocket rejected, connection limit reached", limit=settings.max_ws_connections)
+        return
+    
+    await _WS_SLOTS.acquire()
+    client_id = f"ws_{_WS_PID}_{next(_WS_COUNTER)}"
+    
+    try:
+        await manager.connect(websocket, client_id, binary=frames == "binary")
+    except Exception:
+        _WS_SLOTS.release()
+        raise
     
-    await manager.connect(websocket, client_id)
+    # One state object per connection; `context` carries over between turns
+    state = new_agent_state()
+    
+    # Optional authentication via query param (PoC: messages don't require it)
+    user = await authenticate_websocket(token)
     
     try:
         while True:
             # Receive message
-            data = await websocket.receive_json()
+            data = await _receive_json(websocket)
             message_type = data.get("type")
             
-            logger.info(
-                "WebSocket data received",
-                client_id=client_id,
-                message_type=message_type,
-                data_keys=list(data.keys())
-            )
+            logger.debug("WebSocket data received", client_id=client_id, message_type=message_type)
+            
+            if message_type == "auth":
+                user = await authenticate_websocket(data.get("token"))
+                if user is None:
+                    await manager.enqueue(client_id, _AUTH_ERROR)
+                else:
+                    await manager.enqueue(client_id, {
+                        "type": "auth_success",
+                        "message": "Authentication successful",
+                        "user": {"id": user.user_id, "email": user.email, "name": user.name}
+                    })
+                continue
             
             # Handle messages (no authentication required for PoC)
             if message_type == "message":
@@ -161,116 +475,66 @@ async def websocket_chat(websocket: WebSocket):
                 customer_id = data.get("customer_id")
                 
                 if not user_message:
-                    await manager.send_json(client_id, {
-                        "type": "error",
-                        "error": "Message is required",
-                        "code": "EMPTY_MESSAGE"
-                    })
+                    await manager.enqueue(client_id, _ERROR_EMPTY_MESSAGE)
                     continue
                 
-                logger.info(
+                started = time.perf_counter()
+                logger.debug(
                     "WebSocket message received",
                     client_id=client_id,
                     message_length=len(user_message),
-                    session_id=session_id
+                    session_id=session_id,
+                    user_id=user.user_id if user else None
                 )
                 
                 try:
                     # Send progress: Starting
-                    await manager.send_json(client_id, {
-                        "type": "progress",
-                        "step": "starting",
-                        "message": "Processing your question..."
-                    })
+                    await manager.enqueue(client_id, _PROGRESS_STARTING)
                     
-                    # Create workflow
-                    workflow = create_workflow()
+                    # Compiled once per process and reused for every message
+                    workflow = get_workflow()
                     
                     # Send progress: Agent routing
-                    await manager.send_json(client_id, {
-                        "type": "progress",
-                        "step": "agent_routing",
-                        "message": "Routing to the right expert..."
-                    })
+                    await manager.enqueue(client_id, _PROGRESS_AGENT_ROUTING)
                     
-                    # Initialize state
-                    initial_state: AgentState = {
-                        "messages": [{"role": "user", "content": user_message}],
-                        "session_id": session_id or f"session-{client_id}",
-                        "customer_id": customer_id,
-                        "vehicle_id": None,
-                        "metadata": {},
-                        "current_agent": None,
-                        "context": {}
-                    }
+                    # Reset per-turn fields on the connection state
+                    state["messages"].clear()
+                    state["messages"].append({"role": "user", "content": user_message})
+                    state["session_id"] = session_id or f"session-{client_id}"
+                    state["customer_id"] = customer_id
                     
                     # Send progress: RAG retrieval
-                    await manager.send_json(client_id, {
-                        "type": "progress",
-                        "step": "rag_retrieval",
-                        "message": "Searching knowledge base..."
-                    })
+                    await manager.enqueue(client_id, _PROGRESS_RAG_RETRIEVAL)
                     
-                    # Run workflow and get final state
-                    final_state = await workflow.ainvoke(initial_state)
+                    # Generation runs in its own task and hands frames to the
+                    # writer through the bounded outbound queue
+                    producer = asyncio.create_task(_stream_workflow(workflow, state, client_id))
+                    final_state, tokens_sent = await manager.run_turn(client_id, producer)
                     
-                    logger.info(
-                        "Workflow completed",
-                        client_id=client_id,
-                        final_state_keys=list(final_state.keys()) if final_state else [],
-                        messages_count=len(final_state.get("messages", [])) if final_state else 0
-                    )
+                    # Keep the latest context for the next turn
+                    if final_state and final_state.get("context") is not None:
+                        state["context"] = final_state["context"]
                     
-                    # Debug: Log final state
-                    logger.info(
-                        "Final state received",
-                        client_id=client_id,
-                        has_messages="messages" in final_state if final_state else False,
-                        message_count=len(final_state.get("messages", [])) if final_state else 0,
-                        all_messages=final_state.get("messages", []) if final_state and "messages" in final_state else []
-                    )
-                    
-                    # Extract response from final state messages
+                    # Extract response: last assistant message in the final state
+                    messages = final_state.get("messages", []) if final_state else []
                     response_text = ""
-                    if final_state and "messages" in final_state:
-                        # Get last assistant message
-                        messages = final_state["messages"]
-                        logger.info(
-                            "Extracting response from messages",
-                            client_id=client_id,
-                            total_messages=len(messages),
-                            message_roles=[msg.get("role") if isinstance(msg, dict) else type(msg).__name__ for msg in messages]
-                        )
-                        
-                        for msg in reversed(messages):
-                            logger.info(
-                                "Checking message",
-                                client_id=client_id,
-                                msg_type=type(msg).__name__,
-                                msg_dict=msg if isinstance(msg, dict) else str(msg)[:200],
-                                is_dict=isinstance(msg, dict),
-                                role=msg.get("role") if isinstance(msg, dict) else None
-                            )
-                            
-                            if isinstance(msg, dict) and msg.get("role") == "assistant":
-                                response_text = msg.get("content", "")
-                                logger.info(
-                                    "Found assistant message",
-                                    client_id=client_id,
-                                    content_length=len(response_text),
-                                    content_preview=response_text[:200] if response_text else "(empty)"
-                                )
-                                break
-                            
-                        logger.info(
-                            "Response extraction complete",
+                    for msg in reversed(messages):
+                        if isinstance(msg, dict) and msg.get("role") == "assistant":
+                            response_text = msg.get("content", "")
+                            break
+                    
+                    if _stdlib_logger.isEnabledFor(logging.DEBUG):
+                        logger.debug(
+                            "Workflow completed",
                             client_id=client_id,
+                            final_state_keys=list(final_state.keys()) if final_state else [],
+                            message_roles=[msg.get("role") if isinstance(msg, dict) else type(msg).__name__ for msg in messages],
                             response_found=bool(response_text),
-                            response_length=len(response_text)
+                            content_preview=response_text[:200] if response_text else "(empty)"
                         )
                     
                     # Send complete message
-                    await manager.send_json(client_id, {
+                    await manager.enqueue(client_id, {
                         "type": "complete",
                         "response": response_text,
                         "session_id": final_state.get("session_id") if final_state else session_id,
@@ -281,13 +545,19 @@ async def websocket_chat(websocket: WebSocket):
                         }
                     })
                     
+                    # One summary line per turn; progress/token frames are never logged
                     logger.info(
                         "WebSocket response sent",
                         client_id=client_id,
+                        agent=final_state.get("current_agent") if final_state else None,
+                        tokens_sent=tokens_sent,
                         response_length=len(response_text),
-                        agent=final_state.get("current_agent") if final_state else None
+                        duration_ms=round((time.perf_counter() - started) * 1000, 1)
                     )
                 
+                except WebSocketDisconnect:
+                    raise
+                
                 except Exception as e:
                     logger.error(
                         "WebSocket message processing failed",
@@ -296,7 +566,7 @@ async def websocket_chat(websocket: WebSocket):
                         exc_info=True
                     )
                     
-                    await manager.send_json(client_id, {
+                    await manager.enqueue(client_id, {
                         "type": "error",
                         "error": str(e),
                         "code": "PROCESSING_ERROR"
@@ -314,253 +584,272 @@ async def websocket_chat(websocket: WebSocket):
             exc_info=True
         )
         manager.disconnect(client_id)
+    
+    finally:
+        _WS_SLOTS.release()
 
 
-@router.get("/ws/test", response_class=HTMLResponse)
-async def websocket_test_page():
-    """
-    Simple HTML page to test WebSocket chat.
+# Test page is static: encode it and compute its ETag once at import time
+_WS_TEST_PAGE = """
+<!DOCTYPE html>
+<html>
+<head>
+    <title>WebSocket Chat Test</title>
+    <style>
+        body {
+            font-family: Arial, sans-serif;
+            max-width: 800px;
+            margin: 50px auto;
+            padding: 20px;
+        }
+        #chat {
+            border: 1px solid #ccc;
+            height: 400px;
+            overflow-y: scroll;
+            padding: 10px;
+            margin-bottom: 10px;
+            background: #f9f9f9;
+        }
+        .message {
+            margin: 5px 0;
+            padding: 5px;
+        }
+        .user {
+            color: blue;
+            font-weight: bold;
+        }
+        .assistant {
+            color: green;
+        }
+        .progress {
+            color: orange;
+            font-style: italic;
+        }
+        .error {
+            color: red;
+        }
+        input, button {
+            padding: 10px;
+            font-size: 16px;
+        }
+        #message {
+            width: 70%;
+        }
+        #send {
+            width: 15%;
+        }
+        #auth {
+            margin-bottom: 20px;
+        }
+    </style>
+</head>
+<body>
+    <h1>WebSocket Chat Test</h1>
     
-    Access at: http://localhost:8000/ws/test
-    """
-    html = """
-    <!DOCTYPE html>
-    <html>
-    <head>
-        <title>WebSocket Chat Test</title>
-        <style>
-            body {
-                font-family: Arial, sans-serif;
-                max-width: 800px;
-                margin: 50px auto;
-                padding: 20px;
-            }
-            #chat {
-                border: 1px solid #ccc;
-                height: 400px;
-                overflow-y: scroll;
-                padding: 10px;
-                margin-bottom: 10px;
-                background: #f9f9f9;
-            }
-            .message {
-                margin: 5px 0;
-                padding: 5px;
-            }
-            .user {
-                color: blue;
-                font-weight: bold;
-            }
-            .assistant {
-                color: green;
-            }
-            .progress {
-                color: orange;
-                font-style: italic;
-            }
-            .error {
-                color: red;
-            }
-            input, button {
-                padding: 10px;
-                font-size: 16px;
-            }
-            #message {
-                width: 70%;
-            }
-            #send {
-                width: 15%;
-            }
-            #auth {
-                margin-bottom: 20px;
-            }
-        </style>
-    </head>
-    <body>
-        <h1>WebSocket Chat Test</h1>
-        
-        <div id="auth">
-            <input type="text" id="token" placeholder="JWT Token (optional)" style="width: 80%;">
-            <button onclick="authenticate()">Authenticate</button>
-        </div>
-        
-        <div id="chat"></div>
-        
-        <div>
-            <input type="text" id="message" placeholder="Type your message..." onkeypress="handleKeyPress(event)">
-            <button id="send" onclick="sendMessage()">Send</button>
-            <button onclick="clearChat()">Clear</button>
-        </div>
-        
-        <div style="margin-top: 20px;">
-            <strong>Status:</strong> <span id="status">Disconnected</span>
-        </div>
+    <div id="auth">
+        <input type="text" id="token" placeholder="JWT Token (optional)" style="width: 80%;">
+        <button onclick="authenticate()">Authenticate</button>
+    </div>
+    
+    <div id="chat"></div>
+    
+    <div>
+        <input type="text" id="message" placeholder="Type your message..." onkeypress="handleKeyPress(event)">
+        <button id="send" onclick="sendMessage()">Send</button>
+        <button onclick="clearChat()">Clear</button>
+    </div>
+    
+    <div style="margin-top: 20px;">
+        <strong>Status:</strong> <span id="status">Disconnected</span>
+    </div>
+    
+    <script>
+        let ws = null;
+        let authenticated = false;
+        const decoder = new TextDecoder();
         
-        <script>
-            let ws = null;
-            let authenticated = false;
+        function connect() {
+            const protocol = window.location.protocol === 'https:' ? 'wss:' : 'ws:';
+            const wsUrl = `${protocol}//${window.location.host}/ws/chat?frames=binary`;
             
-            function connect() {
-                const protocol = window.location.protocol === 'https:' ? 'wss:' : 'ws:';
-                const wsUrl = `${protocol}//${window.location.host}/ws/chat`;
-                
-                ws = new WebSocket(wsUrl);
-                
-                ws.onopen = () => {
-                    document.getElementById('status').textContent = 'Connected';
-                    document.getElementById('status').style.color = 'green';
-                    addMessage('system', 'Connected to WebSocket');
-                };
-                
-                ws.onmessage = (event) => {
-                    const data = JSON.parse(event.data);
-                    handleMessage(data);
-                };
-                
-                ws.onclose = () => {
-                    document.getElementById('status').textContent = 'Disconnected';
-                    document.getElementById('status').style.color = 'red';
-                    addMessage('system', 'Disconnected from WebSocket');
-                    authenticated = false;
-                };
-                
-                ws.onerror = (error) => {
-                    addMessage('error', 'WebSocket error: ' + error);
-                };
+            ws = new WebSocket(wsUrl);
+            ws.binaryType = 'arraybuffer';
+            
+            ws.onopen = () => {
+                document.getElementById('status').textContent = 'Connected';
+                document.getElementById('status').style.color = 'green';
+                addMessage('system', 'Connected to WebSocket');
+            };
+            
+            ws.onmessage = (event) => {
+                const data = JSON.parse(
+                    typeof event.data === 'string' ? event.data : decoder.decode(event.data)
+                );
+                handleMessage(data);
+            };
+            
+            ws.onclose = () => {
+                document.getElementById('status').textContent = 'Disconnected';
+                document.getElementById('status').style.color = 'red';
+                addMessage('system', 'Disconnected from WebSocket');
+                authenticated = false;
+            };
+            
+            ws.onerror = (error) => {
+                addMessage('error', 'WebSocket error: ' + error);
+            };
+        }
+        
+        function authenticate() {
+            const token = document.getElementById('token').value;
+            if (!token) {
+                alert('Please enter a token');
+                return;
             }
             
-            function authenticate() {
-                const token = document.getElementById('token').value;
-                if (!token) {
-                    alert('Please enter a token');
-                    return;
-                }
-                
-                if (!ws || ws.readyState !== WebSocket.OPEN) {
-                    connect();
-                    setTimeout(() => {
-                        ws.send(JSON.stringify({
-                            type: 'auth',
-                            token: token
-                        }));
-                    }, 500);
-                } else {
+            if (!ws || ws.readyState !== WebSocket.OPEN) {
+                connect();
+                setTimeout(() => {
                     ws.send(JSON.stringify({
                         type: 'auth',
                         token: token
                     }));
-                }
-            }
-            
-            function sendMessage() {
-                const input = document.getElementById('message');
-                const message = input.value.trim();
-                
-                if (!message) return;
-                
-                if (!ws || ws.readyState !== WebSocket.OPEN) {
-                    connect();
-                    setTimeout(() => sendMessageInternal(message), 500);
-                } else {
-                    sendMessageInternal(message);
-                }
-                
-                input.value = '';
-            }
-            
-            function sendMessageInternal(message) {
-                addMessage('user', message);
-                
+                }, 500);
+            } else {
                 ws.send(JSON.stringify({
-                    type: 'message',
-                    message: message,
-                    session_id: 'test-session-' + Date.now()
+                    type: 'auth',
+                    token: token
                 }));
             }
+        }
+        
+        function sendMessage() {
+            const input = document.getElementById('message');
+            const message = input.value.trim();
             
-            function handleMessage(data) {
-                switch (data.type) {
-                    case 'auth_success':
-                        authenticated = true;
-                        addMessage('system', '✅ ' + data.message);
-                        break;
-                    
-                    case 'auth_error':
-                        addMessage('error', '❌ ' + data.message);
-                        break;
-                    
-                    case 'progress':
-                        addMessage('progress', '⏳ ' + data.message);
-                        break;
-                    
-                    case 'token':
-                        appendToken(data.token);
-                        break;
-                    
-                    case 'complete':
-                        finalizeResponse(data.response, data.metadata);
-                        break;
-                    
-                    case 'error':
-                        addMessage('error', '❌ Error: ' + data.error);
-                        break;
-                }
-            }
-            
-            let currentResponse = null;
-            
-            function appendToken(token) {
-                if (!currentResponse) {
-                    currentResponse = document.createElement('div');
-                    currentResponse.className = 'message assistant';
-                    document.getElementById('chat').appendChild(currentResponse);
-                }
-                currentResponse.textContent += token;
-                scrollToBottom();
-            }
+            if (!message) return;
             
-            function finalizeResponse(response, metadata) {
-                if (currentResponse) {
-                    currentResponse.textContent = response;
-                    if (metadata && metadata.agent) {
-                        currentResponse.textContent += ` [${metadata.agent}]`;
-                    }
-                } else {
-                    addMessage('assistant', response);
-                }
-                currentResponse = null;
-                scrollToBottom();
+            if (!ws || ws.readyState !== WebSocket.OPEN) {
+                connect();
+                setTimeout(() => sendMessageInternal(message), 500);
+            } else {
+                sendMessageInternal(message);
             }
             
-            function addMessage(type, text) {
-                const chat = document.getElementById('chat');
-                const msg = document.createElement('div');
-                msg.className = 'message ' + type;
-                msg.textContent = text;
-                chat.appendChild(msg);
-                scrollToBottom();
-            }
+            input.value = '';
+        }
+        
+        function sendMessageInternal(message) {
+            addMessage('user', message);
             
-            function scrollToBottom() {
-                const chat = document.getElementById('chat');
-                chat.scrollTop = chat.scrollHeight;
+            ws.send(JSON.stringify({
+                type: 'message',
+                message: message,
+                session_id: 'test-session-' + Date.now()
+            }));
+        }
+        
+        function handleMessage(data) {
+            switch (data.type) {
+                case 'auth_success':
+                    authenticated = true;
+                    addMessage('system', '✅ ' + data.message);
+                    break;
+                
+                case 'auth_error':
+                    addMessage('error', '❌ ' + data.message);
+                    break;
+                
+                case 'progress':
+                    addMessage('progress', '⏳ ' + data.message);
+                    break;
+                
+                case 'token':
+                    appendToken(data.token);
+                    break;
+                
+                case 'token_batch':
+                    appendToken(data.tokens.join(''));
+                    break;
+                
+                case 'complete':
+                    finalizeResponse(data.response, data.metadata);
+                    break;
+                
+                case 'error':
+                    addMessage('error', '❌ Error: ' + data.error);
+                    break;
             }
-            
-            function clearChat() {
-                document.getElementById('chat').innerHTML = '';
-                currentResponse = null;
+        }
+        
+        let currentResponse = null;
+        
+        function appendToken(token) {
+            if (!currentResponse) {
+                currentResponse = document.createElement('div');
+                currentResponse.className = 'message assistant';
+                document.getElementById('chat').appendChild(currentResponse);
             }
-            
-            function handleKeyPress(event) {
-                if (event.key === 'Enter') {
-                    sendMessage();
+            currentResponse.textContent += token;
+            scrollToBottom();
+        }
+        
+        function finalizeResponse(response, metadata) {
+            if (currentResponse) {
+                currentResponse.textContent = response;
+                if (metadata && metadata.agent) {
+                    currentResponse.textContent += ` [${metadata.agent}]`;
                 }
+            } else {
+                addMessage('assistant', response);
             }
-            
-            // Connect on page load
-            connect();
-        </script>
-    </body>
-    </html>
+            currentResponse = null;
+            scrollToBottom();
+        }
+        
+        function addMessage(type, text) {
+            const chat = document.getElementById('chat');
+            const msg = document.createElement('div');
+            msg.className = 'message ' + type;
+            msg.textContent = text;
+            chat.appendChild(msg);
+            scrollToBottom();
+        }
+        
+        function scrollToBottom() {
+            const chat = document.getElementById('chat');
+            chat.scrollTop = chat.scrollHeight;
+        }
+        
+        function clearChat() {
+            document.getElementById('chat').innerHTML = '';
+            currentResponse = null;
+        }
+        
+        function handleKeyPress(event) {
+            if (event.key === 'Enter') {
+                sendMessage();
+            }
+        }
+        
+        // Connect on page load
+        connect();
+    </script>
+</body>
+</html>
+"""
+_WS_TEST_HTML = _WS_TEST_PAGE.encode("utf-8")
+_WS_TEST_ETAG = f'"{hashlib.blake2b(_WS_TEST_HTML, digest_size=16).hexdigest()}"'
+_WS_TEST_HEADERS = {"ETag": _WS_TEST_ETAG, "Cache-Control": "public, max-age=3600"}
+
+
+@router.get("/ws/test", response_class=HTMLResponse)
+async def websocket_test_page(request: Request):
+    """
+    Simple HTML page to test WebSocket chat.
+    
+    Access at: http://localhost:8000/ws/test
     """
-    return HTMLResponse(content=html)
+    if request.headers.get("if-none-match") == _WS_TEST_ETAG:
+        return Response(status_code=304, headers=_WS_TEST_HEADERS)
+    return Response(content=_WS_TEST_HTML, media_type="text/html", headers=_WS_TEST_HEADERS)
@@ -1,15 +1,24 @@
 """Evaluation dataset management."""
 
-import json
-from typing import List, Optional
-from dataclasses import dataclass, field, asdict
+import os
+from typing import Dict, Iterable, List, Optional, Tuple
+from dataclasses import dataclass, field
 
+import orjson
 import structlog
 
+try:
+    import ijson
+except ImportError:  # optional; only used for very large datasets
+    ijson = None
+
 logger = structlog.get_logger()
 
+# Datasets larger than this are parsed incrementally when ijson is installed
+STREAM_LOAD_THRESHOLD_BYTES = 50_000_000
+
 
-@dataclass
+@dataclass(slots=True)
 class TestCase:
     """A single test case for RAG evaluation."""
     
@@ -23,7 +32,17 @@ class TestCase:
     tags: List[str] = field(default_factory=list)
     
     def to_dict(self) -> dict:
-        return asdict(self)
+        # Shallow: list fields are shared, not deep-copied like asdict() would
+        return {
+            "id": self.id,
+            "query": self.query,
+            "expected_answer": self.expected_answer,
+            "relevant_doc_ids": self.relevant_doc_ids,
+            "relevant_sources": self.relevant_sources,
+            "category": self.category,
+            "difficulty": self.difficulty,
+            "tags": self.tags,
+        }
     
     @classmethod
     def from_dict(cls, data: dict) -> "TestCase":
@@ -36,53 +55,111 @@ class EvaluationDataset:
     def __init__(self, name: str = "default"):
         self.name = name
         self.test_cases: List[TestCase] = []
+        # Inverted indices for the get_by_* lookups, kept in insertion order
+        self._by_category: Dict[str, List[TestCase]] = {}
+        self._by_difficulty: Dict[str, List[TestCase]] = {}
+        self._by_tag: Dict[str, List[TestCase]] = {}
+        # filter() results keyed by (categories, difficulties); cleared on add
+        self._filter_cache: Dict[tuple, Tuple[TestCase, ...]] = {}
+    
+    def _index(self, test_case: TestCase):
+        """Add a test case to the lookup indices."""
+        self._by_category.setdefault(test_case.category, []).append(test_case)
+        self._by_difficulty.setdefault(test_case.difficulty, []).append(test_case)
+        for tag in dict.fromkeys(test_case.tags):
+            self._by_tag.setdefault(tag, []).append(test_case)
     
     def add_test_case(self, test_case: TestCase):
         """Add a test case to the dataset."""
         self.test_cases.append(test_case)
+        self._index(test_case)
+        self._filter_cache.clear()
     
     def add_test_cases(self, test_cases: List[TestCase]):
         """Add multiple test cases."""
-        self.test_cases.extend(test_cases)
+        for test_case in test_cases:
+            self.add_test_case(test_case)
     
     def get_by_category(self, category: str) -> List[TestCase]:
         """Get test cases by category."""
-        return [tc for tc in self.test_cases if tc.category == category]
+        return list(self._by_category.get(category, ()))
     
     def get_by_difficulty(self, difficulty: str) -> List[TestCase]:
         """Get test cases by difficulty."""
-        return [tc for tc in self.test_cases if tc.difficulty == difficulty]
+        return list(self._by_difficulty.get(difficulty, ()))
     
     def get_by_tag(self, tag: str) -> List[TestCase]:
         """Get test cases with a specific tag."""
-        return [tc for tc in self.test_cases if tag in tc.tags]
+        return list(self._by_tag.get(tag, ()))
+    
+    def filter(
+        self,
+        categories: Optional[Iterable[str]] = None,
+        difficulties: Optional[Iterable[str]] = None,
+    ) -> List[TestCase]:
+        """Get test cases matching any of the categories and any of the difficulties."""
+        category_set = frozenset(categories) if categories else None
+        difficulty_set = frozenset(difficulties) if difficulties else None
+        key = (category_set, difficulty_set)
+        
+        # Repeated runs over the same slice (e.g. one per A/B variant) reuse the first walk
+        matched = self._filter_cache.get(key)
+        if matched is None:
+            matched = tuple(
+                tc for tc in self.test_cases
+                if (category_set is None or tc.category in category_set)
+                and (difficulty_set is None or tc.difficulty in difficulty_set)
+            )
+            self._filter_cache[key] = matched
+        return list(matched)
     
     def save(self, path: str):
-        """Save dataset to JSON file."""
-        data = {
-            "name": self.name,
-            "test_cases": [tc.to_dict() for tc in self.test_cases],
-        }
+        """
+        Save dataset to JSON file.
         
-        with open(path, 'w') as f:
-            json.dump(data, f, indent=2)
+        Test cases are serialized one per line as they are written, so the
+        whole document is never built in memory.
+        """
+        with open(path, 'wb') as f:
+            f.write(b'{"name":' + orjson.dumps(self.name) + b',"test_cases":[')
+            separator = b"\n"
+            for tc in self.test_cases:
+                f.write(separator)
+                f.write(orjson.dumps(tc.to_dict()))
+                separator = b",\n"
+            f.write(b"\n]}\n")
         
         logger.info("Dataset saved", path=path, count=len(self.test_cases))
     
     @classmethod
     def load(cls, path: str) -> "EvaluationDataset":
         """Load dataset from JSON file."""
-        with open(path, 'r') as f:
-            data = json.load(f)
+        if ijson is not None and os.path.getsize(path) > STREAM_LOAD_THRESHOLD_BYTES:
+            return cls._load_streaming(path)
+        
+        with open(path, 'rb') as f:
+            data = orjson.loads(f.read())
         
         dataset = cls(name=data.get("name", "loaded"))
-        dataset.test_cases = [
+        dataset.add_test_cases([
             TestCase.from_dict(tc) for tc in data.get("test_cases", [])
-        ]
+        ])
         
         logger.info("Dataset loaded", path=path, count=len(dataset.test_cases))
         return dataset
     
+    @classmethod
+    def _load_streaming(cls, path: str) -> "EvaluationDataset":
+        """Load a large dataset one test case at a time with ijson."""
+        with open(path, 'rb') as f:
+            dataset = cls(name=next(ijson.items(f, "name"), "loaded"))
+            f.seek(0)
+            for tc in ijson.items(f, "test_cases.item"):
+                dataset.add_test_case(TestCase.from_dict(tc))
+        
+        logger.info("Dataset loaded", path=path, count=len(dataset.test_cases), streamed=True)
+        return dataset
+    
     def __len__(self) -> int:
         return len(self.test_cases)
     
@@ -1,17 +1,37 @@
 """RAG quality metrics for evaluation."""
 
+import asyncio
+import re
 import time
-import math
-from typing import List, Optional
+from array import array
+from contextlib import asynccontextmanager, contextmanager, nullcontext
+from contextvars import ContextVar
+from functools import lru_cache
+from typing import TYPE_CHECKING, AsyncIterator, List, Optional, Sequence, Tuple
 from dataclasses import dataclass, field
 from datetime import datetime
 
+import numpy as np
 import structlog
 from langchain_openai import ChatOpenAI
-from langchain_core.prompts import ChatPromptTemplate
+from langchain_core.messages import HumanMessage, SystemMessage
 
 from src.api.config import get_settings
 
+if TYPE_CHECKING:
+    from src.evaluation.dataset import TestCase
+    from src.rag.vectorstore import SearchResult
+
+try:
+    from numba import njit, prange
+except ImportError:  # numba is optional; kernels then run as plain Python
+    def njit(*args, **kwargs):
+        if args and callable(args[0]):
+            return args[0]
+        return lambda func: func
+    
+    prange = range
+
 logger = structlog.get_logger()
 settings = get_settings()
 
@@ -72,6 +92,41 @@ class LatencyMetrics:
         }
 
 
+# Shared timestamp for every result created inside an eval_batch() block
+_BATCH_TS: ContextVar[Optional[str]] = ContextVar("eval_batch_ts", default=None)
+
+
+@contextmanager
+def eval_batch():
+    """Stamp all EvaluationResults created in this block with one batch timestamp."""
+    token = _BATCH_TS.set(datetime.utcnow().isoformat())
+    try:
+        yield
+    finally:
+        _BATCH_TS.reset(token)
+
+
+# overall_score weights: generation judges, then retrieval (itself a weighted blend)
+_W_FAITHFULNESS = 0.25
+_W_ANSWER_RELEVANCE = 0.25
+_W_CONTEXT_RELEVANCE = 0.20
+_W_RETRIEVAL = 0.30
+_W_PRECISION = 0.4
+_W_MRR = 0.3
+_W_HIT_RATE = 0.3
+
+
+# overall_score weights in aggregate_overall_scores() column order
+_OVERALL_WEIGHTS = np.array([
+    _W_FAITHFULNESS,
+    _W_ANSWER_RELEVANCE,
+    _W_CONTEXT_RELEVANCE,
+    _W_RETRIEVAL * _W_PRECISION,
+    _W_RETRIEVAL * _W_MRR,
+    _W_RETRIEVAL * _W_HIT_RATE,
+])
+
+
 @dataclass
 class EvaluationResult:
     """Complete evaluation result for a single query."""
@@ -80,12 +135,12 @@ class EvaluationResult:
     expected_answer: Optional[str] = None
     generated_answer: Optional[str] = None
     retrieved_contexts: List[str] = field(default_factory=list)
-    retrieval_scores: List[float] = field(default_factory=list)
+    retrieval_scores: array = field(default_factory=lambda: array("f"))  # float32, unboxed
     retrieval_metrics: RetrievalMetrics = field(default_factory=RetrievalMetrics)
     generation_metrics: GenerationMetrics = field(default_factory=GenerationMetrics)
     latency_metrics: LatencyMetrics = field(default_factory=LatencyMetrics)
     tokens_used: int = 0
-    timestamp: str = field(default_factory=lambda: datetime.utcnow().isoformat())
+    timestamp: str = field(default_factory=lambda: _BATCH_TS.get() or datetime.utcnow().isoformat())
     
     def to_dict(self) -> dict:
         return {
@@ -103,25 +158,111 @@ class EvaluationResult:
     @property
     def overall_score(self) -> float:
         """Calculate overall quality score (0-1)."""
-        weights = {
-            "faithfulness": 0.25,
-            "answer_relevance": 0.25,
-            "context_relevance": 0.20,
-            "retrieval": 0.30,
-        }
-        
-        retrieval_score = (
-            self.retrieval_metrics.precision_at_k * 0.4 +
-            self.retrieval_metrics.mrr * 0.3 +
-            self.retrieval_metrics.hit_rate * 0.3
-        )
-        
+        generation = self.generation_metrics
+        retrieval = self.retrieval_metrics
         return (
-            self.generation_metrics.faithfulness * weights["faithfulness"] +
-            self.generation_metrics.answer_relevance * weights["answer_relevance"] +
-            self.generation_metrics.context_relevance * weights["context_relevance"] +
-            retrieval_score * weights["retrieval"]
+            generation.faithfulness * _W_FAITHFULNESS +
+            generation.answer_relevance * _W_ANSWER_RELEVANCE +
+            generation.context_relevance * _W_CONTEXT_RELEVANCE +
+            (
+                retrieval.precision_at_k * _W_PRECISION +
+                retrieval.mrr * _W_MRR +
+                retrieval.hit_rate * _W_HIT_RATE
+            ) * _W_RETRIEVAL
+        )
+
+
+@lru_cache(maxsize=64)
+def _discounts(k: int) -> np.ndarray:
+    """Rank discounts 1/log2(i+2) for the first k positions (read-only, shared)."""
+    discounts = 1.0 / np.log2(np.arange(2, k + 2, dtype=np.float64))
+    discounts.flags.writeable = False
+    return discounts
+
+
+@njit(cache=True)
+def _retrieval_metrics_kernel(relevant, scores, total_relevant, k):
+    """
+    Compute all ground-truth retrieval metrics in one pass.
+    
+    Returns (precision@k, recall@k, mrr, ndcg, hit_rate, avg_score), matching
+    the MetricsCalculator methods. `relevant` and `scores` are the top-k items.
+    """
+    hits = 0
+    first_hit = 0
+    for i in range(relevant.shape[0]):
+        if relevant[i]:
+            hits += 1
+            if first_hit == 0:
+                first_hit = i + 1
+    
+    n = scores.shape[0]
+    dcg = 0.0
+    idcg = 0.0
+    total = 0.0
+    ideal = np.sort(scores)[::-1]
+    for i in range(n):
+        discount = 1.0 / np.log2(i + 2.0)
+        dcg += scores[i] * discount
+        idcg += ideal[i] * discount
+        total += scores[i]
+    
+    precision = hits / k if relevant.shape[0] > 0 else 0.0
+    recall = hits / total_relevant if total_relevant > 0 else 0.0
+    mrr = 1.0 / first_hit if first_hit > 0 else 0.0
+    ndcg = dcg / idcg if idcg > 0 else 0.0
+    hit_rate = 1.0 if hits > 0 else 0.0
+    avg_score = total / n if n > 0 else 0.0
+    return precision, recall, mrr, ndcg, hit_rate, avg_score
+
+
+# Compile (or load from the numba cache) at import, not on the first request
+_retrieval_metrics_kernel(np.zeros(1, dtype=np.bool_), np.zeros(1, dtype=np.float64), 1, 1)
+
+
+@njit(parallel=True, cache=True)
+def _batch_retrieval_metrics_kernel(relevant, scores, lengths, total_relevant, k):
+    """
+    Run _retrieval_metrics_kernel over many queries, spread across cores.
+    
+    `relevant` and `scores` are (n_queries, k) arrays padded past each row's
+    `lengths` entry. Returns an (n_queries, 6) array in the kernel's order.
+    """
+    n = relevant.shape[0]
+    out = np.zeros((n, 6), dtype=np.float64)
+    for q in prange(n):
+        m = lengths[q]
+        p, r, mrr, ndcg, hit, avg = _retrieval_metrics_kernel(
+            relevant[q, :m], scores[q, :m], total_relevant[q], k
+        )
+        out[q, 0] = p
+        out[q, 1] = r
+        out[q, 2] = mrr
+        out[q, 3] = ndcg
+        out[q, 4] = hit
+        out[q, 5] = avg
+    return out
+
+
+def aggregate_overall_scores(results: List["EvaluationResult"]) -> np.ndarray:
+    """
+    Compute overall_score for many results in one matrix-vector product.
+    
+    Returns an array aligned with `results`; take .mean()/.std() for reports.
+    """
+    metrics = np.empty((len(results), 6), dtype=np.float64)
+    for i, r in enumerate(results):
+        generation = r.generation_metrics
+        retrieval = r.retrieval_metrics
+        metrics[i] = (
+            generation.faithfulness,
+            generation.answer_relevance,
+            generation.context_relevance,
+            retrieval.precision_at_k,
+            retrieval.mrr,
+            retrieval.hit_rate,
         )
+    return metrics @ _OVERALL_WEIGHTS
 
 
 class MetricsCalculator:
@@ -160,20 +301,12 @@ class MetricsCalculator:
             return 0.0
         
         k = k or len(relevance_scores)
-        scores = relevance_scores[:k]
+        scores = np.asarray(relevance_scores[:k], dtype=np.float64)
+        discounts = _discounts(len(scores))
         
-        # DCG
-        dcg = sum(
-            score / math.log2(i + 2)
-            for i, score in enumerate(scores)
-        )
-        
-        # Ideal DCG (sorted scores)
-        ideal_scores = sorted(scores, reverse=True)
-        idcg = sum(
-            score / math.log2(i + 2)
-            for i, score in enumerate(ideal_scores)
-        )
+        # DCG, and ideal DCG over the scores sorted descending
+        dcg = float(scores @ discounts)
+        idcg = float(np.sort(scores)[::-1] @ discounts)
         
         return dcg / idcg if idcg > 0 else 0.0
     
@@ -183,29 +316,8 @@ class MetricsCalculator:
         return 1.0 if any(relevant_items) else 0.0
 
 
-class LLMJudge:
-    """Use LLM to evaluate generation quality."""
-    
-    def __init__(self):
-        self.llm = ChatOpenAI(
-            model=settings.llm_model,
-            api_key=settings.openrouter_api_key,
-            base_url=settings.openrouter_base_url,
-            temperature=0.0,
-            default_headers={
-                "HTTP-Referer": "https://github.com/genai-auto",
-                "X-Title": "GenAI Auto - RAG Evaluator",
-            },
-        )
-    
-    async def evaluate_faithfulness(
-        self,
-        answer: str,
-        contexts: List[str],
-    ) -> float:
-        """Evaluate if the answer is grounded in the provided contexts."""
-        prompt = ChatPromptTemplate.from_messages([
-            ("system", """You are an evaluation judge. Your task is to evaluate if an answer is faithful to the given contexts.
+# Judge prompts: fixed system messages plus human templates filled with str.format
+_FAITHFULNESS_SYSTEM = SystemMessage(content="""You are an evaluation judge. Your task is to evaluate if an answer is faithful to the given contexts.
 
 Faithfulness means the answer only contains information that can be derived from the contexts.
 
@@ -214,34 +326,17 @@ Score from 0 to 1:
 - 0.5: Partially faithful, some claims are not supported
 - 0.0: Not faithful, contains hallucinated information
 
-Respond with ONLY a number between 0 and 1."""),
-            ("human", """Contexts:
+Respond with ONLY a number between 0 and 1.""")
+
+_FAITHFULNESS_HUMAN = """Contexts:
 {contexts}
 
 Answer:
 {answer}
 
-Faithfulness score (0-1):"""),
-        ])
-        
-        response = await (prompt | self.llm).ainvoke({
-            "contexts": "\n---\n".join(contexts),
-            "answer": answer,
-        })
-        
-        try:
-            return float(response.content.strip())
-        except ValueError:
-            return 0.5
-    
-    async def evaluate_answer_relevance(
-        self,
-        query: str,
-        answer: str,
-    ) -> float:
-        """Evaluate if the answer addresses the question."""
-        prompt = ChatPromptTemplate.from_messages([
-            ("system", """You are an evaluation judge. Your task is to evaluate if an answer is relevant to the question.
+Faithfulness score (0-1):"""
+
+_ANSWER_RELEVANCE_SYSTEM = SystemMessage(content="""You are an evaluation judge. Your task is to evaluate if an answer is relevant to the question.
 
 Answer relevance means the answer directly addresses what was asked.
 
@@ -250,34 +345,17 @@ Score from 0 to 1:
 - 0.5: Partially relevant, addresses some aspects
 - 0.0: Not relevant, does not answer the question
 
-Respond with ONLY a number between 0 and 1."""),
-            ("human", """Question:
+Respond with ONLY a number between 0 and 1.""")
+
+_ANSWER_RELEVANCE_HUMAN = """Question:
 {query}
 
 Answer:
 {answer}
 
-Answer relevance score (0-1):"""),
-        ])
-        
-        response = await (prompt | self.llm).ainvoke({
-            "query": query,
-            "answer": answer,
-        })
-        
-        try:
-            return float(response.content.strip())
-        except ValueError:
-            return 0.5
-    
-    async def evaluate_context_relevance(
-        self,
-        query: str,
-        contexts: List[str],
-    ) -> float:
-        """Evaluate if the retrieved contexts are relevant to the query."""
-        prompt = ChatPromptTemplate.from_messages([
-            ("system", """You are an evaluation judge. Your task is to evaluate if retrieved contexts are relevant to a query.
+Answer relevance score (0-1):"""
+
+_CONTEXT_RELEVANCE_SYSTEM = SystemMessage(content="""You are an evaluation judge. Your task is to evaluate if retrieved contexts are relevant to a query.
 
 Context relevance means the contexts contain information useful for answering the query.
 
@@ -286,35 +364,18 @@ Score from 0 to 1:
 - 0.5: Partially relevant, some useful information
 - 0.0: Not relevant, contexts don't help answer the query
 
-Respond with ONLY a number between 0 and 1."""),
-            ("human", """Query:
+Respond with ONLY a number between 0 and 1.""")
+
+_CONTEXT_RELEVANCE_HUMAN = """Query:
 {query}
 
 Retrieved Contexts:
 {contexts}
 
-Context relevance score (0-1):"""),
-        ])
-        
-        response = await (prompt | self.llm).ainvoke({
-            "query": query,
-            "contexts": "\n---\n".join(contexts),
-        })
-        
-        try:
-            return float(response.content.strip())
-        except ValueError:
-            return 0.5
-    
-    async def evaluate_completeness(
-        self,
-        query: str,
-        answer: str,
-        expected_answer: str = None,
-    ) -> float:
-        """Evaluate if the answer fully addresses the query."""
-        prompt = ChatPromptTemplate.from_messages([
-            ("system", """You are an evaluation judge. Your task is to evaluate if an answer is complete.
+Context relevance score (0-1):"""
+
+# The only system prompt with a placeholder; formatted per call when there is an expected answer
+_COMPLETENESS_SYSTEM_TEMPLATE = """You are an evaluation judge. Your task is to evaluate if an answer is complete.
 
 Completeness means the answer fully addresses all aspects of the question.
 
@@ -325,30 +386,134 @@ Score from 0 to 1:
 - 0.5: Partial, misses some aspects
 - 0.0: Incomplete, major aspects missing
 
-Respond with ONLY a number between 0 and 1."""),
-            ("human", """Question:
+Respond with ONLY a number between 0 and 1."""
+
+_COMPLETENESS_SYSTEM = SystemMessage(
+    content=_COMPLETENESS_SYSTEM_TEMPLATE.format(expected_context="")
+)
+
+_COMPLETENESS_HUMAN = """Question:
 {query}
 
 Answer:
 {answer}
 
-Completeness score (0-1):"""),
-        ])
-        
-        expected_context = ""
+Completeness score (0-1):"""
+
+
+# First standalone score in [0, 1] ("0.8", "Score: .75", "1/1"); not part of a larger number
+_SCORE_RE = re.compile(r"(?<![\d.])([01](?:\.\d+)?|0?\.\d+)(?!\d)")
+
+
+def _parse_score(text: str) -> float:
+    """Extract a judge score clamped to [0, 1]; 0.5 when none is found."""
+    match = _SCORE_RE.search(text)
+    if match is None:
+        return 0.5
+    return max(0.0, min(1.0, float(match.group(1))))
+
+
+# Context budget for judge prompts; judge latency and cost scale with input size
+MAX_JUDGE_CTX_CHARS = settings.eval_judge_ctx_chars
+MAX_JUDGE_TOTAL_CHARS = MAX_JUDGE_CTX_CHARS * 5
+
+
+def _clip_contexts(contexts: tuple) -> List[str]:
+    """Truncate each context to the per-context budget, stopping at the total budget."""
+    clipped = []
+    used = 0
+    for context in contexts:
+        if len(context) > MAX_JUDGE_CTX_CHARS:
+            context = context[:MAX_JUDGE_CTX_CHARS] + "…"
+        clipped.append(context)
+        used += len(context)
+        if used >= MAX_JUDGE_TOTAL_CHARS:
+            break
+    return clipped
+
+
+@lru_cache(maxsize=32)
+def _join_contexts(contexts: tuple) -> str:
+    """Clip and join contexts for a judge prompt; judges sharing the same contexts reuse it."""
+    return "\n---\n".join(_clip_contexts(contexts))
+
+
+class LLMJudge:
+    """Use LLM to evaluate generation quality."""
+    
+    def __init__(self):
+        self.llm = ChatOpenAI(
+            model=settings.llm_model,
+            api_key=settings.openrouter_api_key,
+            base_url=settings.openrouter_base_url,
+            temperature=0.0,
+            default_headers={
+                "HTTP-Referer": "https://github.com/genai-auto",
+                "X-Title": "GenAI Auto - RAG Evaluator",
+            },
+        )
+    
+    async def _score(self, system: SystemMessage, human: str) -> float:
+        """Send one judge prompt straight to the LLM and parse the score."""
+        response = await self.llm.ainvoke([system, HumanMessage(content=human)])
+        return _parse_score(response.content)
+    
+    async def evaluate_faithfulness(
+        self,
+        answer: str,
+        contexts: List[str],
+    ) -> float:
+        """Evaluate if the answer is grounded in the provided contexts."""
+        return await self._score(
+            _FAITHFULNESS_SYSTEM,
+            _FAITHFULNESS_HUMAN.format(
+                contexts=_join_contexts(tuple(contexts)),
+                answer=answer,
+            ),
+        )
+    
+    async def evaluate_answer_relevance(
+        self,
+        query: str,
+        answer: str,
+    ) -> float:
+        """Evaluate if the answer addresses the question."""
+        return await self._score(
+            _ANSWER_RELEVANCE_SYSTEM,
+            _ANSWER_RELEVANCE_HUMAN.format(query=query, answer=answer),
+        )
+    
+    async def evaluate_context_relevance(
+        self,
+        query: str,
+        contexts: List[str],
+    ) -> float:
+        """Evaluate if the retrieved contexts are relevant to the query."""
+        return await self._score(
+            _CONTEXT_RELEVANCE_SYSTEM,
+            _CONTEXT_RELEVANCE_HUMAN.format(
+                query=query,
+                contexts=_join_contexts(tuple(contexts)),
+            ),
+        )
+    
+    async def evaluate_completeness(
+        self,
+        query: str,
+        answer: str,
+        expected_answer: str = None,
+    ) -> float:
+        """Evaluate if the answer fully addresses the query."""
+        system = _COMPLETENESS_SYSTEM
         if expected_answer:
-            expected_context = f"Expected answer for reference: {expected_answer}"
+            system = SystemMessage(content=_COMPLETENESS_SYSTEM_TEMPLATE.format(
+                expected_context=f"Expected answer for reference: {expected_answer}",
+            ))
         
-        response = await (prompt | self.llm).ainvoke({
-            "query": query,
-            "answer": answer,
-            "expected_context": expected_context,
-        })
-        
-        try:
-            return float(response.content.strip())
-        except ValueError:
-            return 0.5
+        return await self._score(
+            system,
+            _COMPLETENESS_HUMAN.format(query=query, answer=answer),
+        )
 
 
 class RAGEvaluator:
@@ -362,28 +527,95 @@ class RAGEvaluator:
     async def evaluate_retrieval(
         self,
         query: str,
-        retrieved_docs: List[dict],
+        retrieved_docs: List["SearchResult"],
         relevant_doc_ids: List[str] = None,
         k: int = 5,
     ) -> RetrievalMetrics:
-        """Evaluate retrieval quality."""
-        scores = [doc.get("score", 0) for doc in retrieved_docs[:k]]
+        """Evaluate retrieval quality from the top-k search results."""
+        top_k = retrieved_docs[:k]
         
         # If we have ground truth relevance
         if relevant_doc_ids:
-            doc_ids = [doc.get("document_id", doc.get("id", "")) for doc in retrieved_docs]
-            relevant_items = [doc_id in relevant_doc_ids for doc_id in doc_ids[:k]]
+            relevant_set = (
+                relevant_doc_ids
+                if isinstance(relevant_doc_ids, (set, frozenset))
+                else frozenset(relevant_doc_ids)
+            )
+            n = len(top_k)
+            scores = np.empty(n, dtype=np.float64)
+            relevant_items = np.empty(n, dtype=np.bool_)
+            for i, doc in enumerate(top_k):
+                scores[i] = doc.score
+                relevant_items[i] = doc.document_id in relevant_set
             
+            precision, recall, mrr, ndcg, hit_rate, avg_score = _retrieval_metrics_kernel(
+                relevant_items,
+                scores,
+                len(relevant_set),
+                k,
+            )
             return RetrievalMetrics(
-                precision_at_k=self.calculator.precision_at_k(relevant_items, k),
-                recall_at_k=self.calculator.recall_at_k(relevant_items, len(relevant_doc_ids), k),
-                mrr=self.calculator.mrr(relevant_items),
-                ndcg=self.calculator.ndcg(scores, k),
-                hit_rate=self.calculator.hit_rate(relevant_items),
-                avg_score=sum(scores) / len(scores) if scores else 0,
+                precision_at_k=precision,
+                recall_at_k=recall,
+                mrr=mrr,
+                ndcg=ndcg,
+                hit_rate=hit_rate,
+                avg_score=avg_score,
             )
         
-        # Without ground truth, use scores as proxy
+        return self._proxy_retrieval_metrics(top_k, k)
+    
+    def evaluate_retrieval_batch(
+        self,
+        batch: Sequence[Tuple[List["SearchResult"], Optional[List[str]]]],
+        k: int = 5,
+    ) -> List[RetrievalMetrics]:
+        """
+        Evaluate retrieval for many queries at once (offline evaluation runs).
+        
+        Each item is (search results, relevant doc ids). Queries with ground
+        truth go through one parallel kernel call; the rest use the same
+        score-based proxy as evaluate_retrieval.
+        """
+        results: List[Optional[RetrievalMetrics]] = [None] * len(batch)
+        labelled = [i for i, (_, relevant_doc_ids) in enumerate(batch) if relevant_doc_ids]
+        
+        n = len(labelled)
+        relevant = np.zeros((n, k), dtype=np.bool_)
+        scores = np.zeros((n, k), dtype=np.float64)
+        lengths = np.zeros(n, dtype=np.int64)
+        total_relevant = np.zeros(n, dtype=np.int64)
+        for row, i in enumerate(labelled):
+            docs, relevant_doc_ids = batch[i]
+            relevant_set = frozenset(relevant_doc_ids)
+            top_k = docs[:k]
+            for j, doc in enumerate(top_k):
+                scores[row, j] = doc.score
+                relevant[row, j] = doc.document_id in relevant_set
+            lengths[row] = len(top_k)
+            total_relevant[row] = len(relevant_set)
+        
+        if n:
+            values = _batch_retrieval_metrics_kernel(relevant, scores, lengths, total_relevant, k)
+            for row, i in enumerate(labelled):
+                precision, recall, mrr, ndcg, hit_rate, avg_score = values[row].tolist()
+                results[i] = RetrievalMetrics(
+                    precision_at_k=precision,
+                    recall_at_k=recall,
+                    mrr=mrr,
+                    ndcg=ndcg,
+                    hit_rate=hit_rate,
+                    avg_score=avg_score,
+                )
+        
+        for i, (docs, relevant_doc_ids) in enumerate(batch):
+            if results[i] is None:
+                results[i] = self._proxy_retrieval_metrics(docs[:k], k)
+        return results
+    
+    def _proxy_retrieval_metrics(self, top_k: List["SearchResult"], k: int) -> RetrievalMetrics:
+        """Without ground truth, use similarity scores as a relevance proxy."""
+        scores = [doc.score for doc in top_k]
         return RetrievalMetrics(
             precision_at_k=sum(1 for s in scores if s > 0.7) / k if scores else 0,
             recall_at_k=0.0,  # Can't calculate without ground truth
@@ -401,10 +633,13 @@ class RAGEvaluator:
         expected_answer: str = None,
     ) -> GenerationMetrics:
         """Evaluate generation quality using LLM judge."""
-        faithfulness = await self.judge.evaluate_faithfulness(answer, contexts)
-        answer_relevance = await self.judge.evaluate_answer_relevance(query, answer)
-        context_relevance = await self.judge.evaluate_context_relevance(query, contexts)
-        completeness = await self.judge.evaluate_completeness(query, answer, expected_answer)
+        # The four judge calls are independent, so run them concurrently
+        faithfulness, answer_relevance, context_relevance, completeness = await asyncio.gather(
+            self.judge.evaluate_faithfulness(answer, contexts),
+            self.judge.evaluate_answer_relevance(query, answer),
+            self.judge.evaluate_context_relevance(query, contexts),
+            self.judge.evaluate_completeness(query, answer, expected_answer),
+        )
         
         return GenerationMetrics(
             faithfulness=faithfulness,
@@ -424,61 +659,223 @@ class RAGEvaluator:
         from src.rag.pipeline import RAGPipeline
         from src.storage.database import async_session
         
-        result = EvaluationResult(
-            query=query,
-            expected_answer=expected_answer,
-        )
-        
-        async with async_session() as db:
-            pipeline = RAGPipeline(db)
-            
-            # Measure retrieval
-            retrieval_start = time.perf_counter()
-            search_results = await pipeline.query(query, top_k=k)
-            retrieval_time = (time.perf_counter() - retrieval_start) * 1000
-            
-            result.retrieved_contexts = [r.content for r in search_results]
-            result.retrieval_scores = [r.score for r in search_results]
-            
-            # Evaluate retrieval
-            result.retrieval_metrics = await self.evaluate_retrieval(
+        # Reuse the session passed to the constructor instead of opening one per query
+        ctx = nullcontext(self.db) if self.db is not None else async_session()
+        async with ctx as db:
+            return await self._evaluate_with_pipeline(
+                RAGPipeline(db),
                 query,
-                [r.to_dict() for r in search_results],
+                expected_answer,
                 relevant_doc_ids,
                 k,
             )
+    
+    async def evaluate_many(
+        self,
+        cases: List["TestCase"],
+        k: int = 5,
+        max_concurrent: int = 3,
+        semaphore: Optional[asyncio.Semaphore] = None,
+        return_exceptions: bool = False,
+    ) -> List[EvaluationResult | Exception]:
+        """
+        Evaluate many test cases over one DB session and pipeline.
+        
+        Args:
+            cases: Test cases to evaluate
+            k: Number of documents to retrieve per query
+            max_concurrent: Maximum cases in flight at once
+            semaphore: Optional limit shared with other concurrent runs
+            return_exceptions: Put a failed case's exception in its slot
+                instead of raising the first failure
+        
+        Returns:
+            One result (or exception) per case, in the order of cases
+        """
+        outcomes: List[EvaluationResult | Exception] = [None] * len(cases)
+        async for i, outcome in self.evaluate_stream(cases, k, max_concurrent, semaphore):
+            outcomes[i] = outcome
+        
+        if not return_exceptions:
+            for outcome in outcomes:
+                if isinstance(outcome, Exception):
+                    raise outcome
+        return outcomes
+    
+    async def evaluate_stream(
+        self,
+        cases: List["TestCase"],
+        k: int = 5,
+        max_concurrent: int = 3,
+        semaphore: Optional[asyncio.Semaphore] = None,
+    ) -> AsyncIterator[Tuple[int, EvaluationResult | Exception]]:
+        """
+        Evaluate many test cases over one DB session and pipeline, yielding each as it finishes.
+        
+        An AsyncSession cannot run two statements at once, so vector queries are
+        serialized while embedding, generation and judging run concurrently.
+        Cases that finish together are scored with one evaluate_retrieval_batch
+        call and their search results dropped before being yielded, so memory
+        is bounded by max_concurrent rather than by the number of cases.
+        
+        Args:
+            cases: Test cases to evaluate
+            k: Number of documents to retrieve per query
+            max_concurrent: Maximum cases in flight at once
+            semaphore: Optional limit shared with other concurrent runs
+        
+        Yields:
+            (index into cases, result or the exception that case raised), in completion order
+        """
+        from src.rag.pipeline import RAGPipeline
+        from src.storage.database import async_session
+        
+        db_lock = asyncio.Lock()
+        finished: asyncio.Queue = asyncio.Queue()
+        
+        ctx = nullcontext(self.db) if self.db is not None else async_session()
+        async with ctx as db:
+            pipeline = RAGPipeline(db)
             
-            # Generate answer
-            generation_start = time.perf_counter()
-            _context = await pipeline.get_context(query, top_k=k)
-            
-            from src.agents.specs.agent import SpecsAgent
-            agent = SpecsAgent()
-            state = {
-                "messages": [{"role": "user", "content": query}],
-                "session_id": "eval-session",
-                "customer_id": None,
-                "vehicle_id": None,
-                "metadata": {},
-                "current_agent": "specs",
-                "context": {},
-            }
-            result.generated_answer = await agent.process(state)
-            generation_time = (time.perf_counter() - generation_start) * 1000
+            # A fixed pool of workers pulls from one shared iterator, so concurrency
+            # is bounded without a wrapper coroutine per case
+            pending = iter(enumerate(cases))
             
-            # Evaluate generation
-            result.generation_metrics = await self.evaluate_generation(
-                query,
-                result.generated_answer,
-                result.retrieved_contexts,
-                expected_answer,
-            )
+            async def worker():
+                for i, case in pending:
+                    try:
+                        async with semaphore or nullcontext():
+                            outcome = await self._run_pipeline(
+                                pipeline,
+                                case.query,
+                                case.expected_answer,
+                                k,
+                                db_lock,
+                            )
+                    except Exception as e:
+                        outcome = e
+                    finished.put_nowait((i, outcome))
             
-            # Latency metrics
-            result.latency_metrics = LatencyMetrics(
-                retrieval_ms=retrieval_time,
-                generation_ms=generation_time,
-                total_ms=retrieval_time + generation_time,
-            )
+            workers = [asyncio.create_task(worker()) for _ in range(min(max_concurrent, len(cases)))]
+            try:
+                remaining = len(cases)
+                while remaining:
+                    # Everything that finished while the consumer was busy forms one batch
+                    batch = [await finished.get()]
+                    while not finished.empty():
+                        batch.append(finished.get_nowait())
+                    remaining -= len(batch)
+                    
+                    done = [(i, outcome) for i, outcome in batch if not isinstance(outcome, Exception)]
+                    retrieval_metrics = self.evaluate_retrieval_batch(
+                        [(outcome[1], cases[i].relevant_doc_ids) for i, outcome in done],
+                        k,
+                    )
+                    for (_, (result, _)), metrics in zip(done, retrieval_metrics):
+                        result.retrieval_metrics = metrics
+                    
+                    for i, outcome in batch:
+                        yield i, outcome if isinstance(outcome, Exception) else outcome[0]
+            finally:
+                for task in workers:
+                    task.cancel()
+                await asyncio.gather(*workers, return_exceptions=True)
+    
+    async def _evaluate_with_pipeline(
+        self,
+        pipeline,
+        query: str,
+        expected_answer: str = None,
+        relevant_doc_ids: List[str] = None,
+        k: int = 5,
+        db_lock: Optional[asyncio.Lock] = None,
+    ) -> EvaluationResult:
+        """Evaluate one query against an already-open RAG pipeline."""
+        result, search_results = await self._run_pipeline(
+            pipeline,
+            query,
+            expected_answer,
+            k,
+            db_lock,
+        )
         
+        # Evaluate retrieval
+        result.retrieval_metrics = await self.evaluate_retrieval(
+            query,
+            search_results,
+            relevant_doc_ids,
+            k,
+        )
         return result
+    
+    async def _run_pipeline(
+        self,
+        pipeline,
+        query: str,
+        expected_answer: str = None,
+        k: int = 5,
+        db_lock: Optional[asyncio.Lock] = None,
+    ) -> Tuple[EvaluationResult, List["SearchResult"]]:
+        """Retrieve, generate and judge one query; retrieval metrics are left to the caller."""
+        result = EvaluationResult(
+            query=query,
+            expected_answer=expected_answer,
+        )
+        
+        # Measure retrieval; only the DB query holds the shared lock, and time
+        # spent queued behind other workers is not counted as retrieval
+        lock_wait = 0.0
+        
+        @asynccontextmanager
+        async def timed_lock():
+            nonlocal lock_wait
+            wait_start = time.perf_counter()
+            async with db_lock:
+                lock_wait = time.perf_counter() - wait_start
+                yield
+        
+        retrieval_start = time.perf_counter()
+        search_results = await pipeline.query(
+            query,
+            top_k=k,
+            db_lock=timed_lock() if db_lock is not None else None,
+        )
+        retrieval_time = (time.perf_counter() - retrieval_start - lock_wait) * 1000
+        
+        for r in search_results:
+            result.retrieved_contexts.append(r.content)
+            result.retrieval_scores.append(r.score)
+        
+        # Generate answer from the results retrieved above (no second search)
+        generation_start = time.perf_counter()
+        
+        from src.agents.specs.agent import SpecsAgent
+        agent = SpecsAgent()
+        state = {
+            "messages": [{"role": "user", "content": query}],
+            "session_id": "eval-session",
+            "customer_id": None,
+            "vehicle_id": None,
+            "metadata": {},
+            "current_agent": "specs",
+            "context": {"rag_context": pipeline.format_context(search_results)},
+        }
+        result.generated_answer = await agent.process(state)
+        generation_time = (time.perf_counter() - generation_start) * 1000
+        
+        # Evaluate generation
+        result.generation_metrics = await self.evaluate_generation(
+            query,
+            result.generated_answer,
+            result.retrieved_contexts,
+            expected_answer,
+        )
+        
+        # Latency metrics
+        result.latency_metrics = LatencyMetrics(
+            retrieval_ms=retrieval_time,
+            generation_ms=generation_time,
+            total_ms=retrieval_time + generation_time,
+        )
+        
+        return result, search_results
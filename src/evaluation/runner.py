@@ -1,25 +1,42 @@
 """Evaluation runner for batch evaluation and reporting."""
 
 import asyncio
-import json
-from datetime import datetime
-from typing import List, Dict
-from dataclasses import dataclass, field, asdict
+import os
+from datetime import UTC, datetime
+from typing import List, Dict, Optional
+from dataclasses import dataclass, field
 
+import numpy as np
+import orjson
 import structlog
 
-from src.evaluation.metrics import RAGEvaluator, EvaluationResult
+from src.evaluation.metrics import RAGEvaluator, EvaluationResult, aggregate_overall_scores, eval_batch
 from src.evaluation.dataset import EvaluationDataset, TestCase
 
 logger = structlog.get_logger()
 
+# EvaluationReport averages, in the column order run_dataset stages them
+_METRIC_COLUMNS = (
+    "avg_retrieval_precision",
+    "avg_retrieval_mrr",
+    "avg_retrieval_hit_rate",
+    "avg_faithfulness",
+    "avg_answer_relevance",
+    "avg_context_relevance",
+    "avg_completeness",
+    "avg_overall_score",
+    "avg_retrieval_latency_ms",
+    "avg_generation_latency_ms",
+    "avg_total_latency_ms",
+)
 
-@dataclass
+
+@dataclass(slots=True)
 class EvaluationReport:
     """Complete evaluation report."""
     
     name: str
-    timestamp: str = field(default_factory=lambda: datetime.utcnow().isoformat())
+    timestamp: str = field(default_factory=lambda: datetime.now(UTC).isoformat(timespec="seconds"))
     dataset_name: str = ""
     total_queries: int = 0
     successful_queries: int = 0
@@ -45,23 +62,74 @@ class EvaluationReport:
     category_scores: Dict[str, float] = field(default_factory=dict)
     
     # Individual results
-    results: List[dict] = field(default_factory=list)
+    results: List[EvaluationResult] = field(default_factory=list)
     errors: List[dict] = field(default_factory=list)
     
+    # summary() is rendered once after finalize(); until then it reflects live values
+    _finalized: bool = field(default=False, init=False, repr=False, compare=False)
+    _summary: Optional[str] = field(default=None, init=False, repr=False, compare=False)
+    
     def to_dict(self) -> dict:
-        return asdict(self)
+        # errors already hold plain dicts and are shared; results convert here, not per query
+        return {
+            "name": self.name,
+            "timestamp": self.timestamp,
+            "dataset_name": self.dataset_name,
+            "total_queries": self.total_queries,
+            "successful_queries": self.successful_queries,
+            "failed_queries": self.failed_queries,
+            "avg_retrieval_precision": self.avg_retrieval_precision,
+            "avg_retrieval_mrr": self.avg_retrieval_mrr,
+            "avg_retrieval_hit_rate": self.avg_retrieval_hit_rate,
+            "avg_faithfulness": self.avg_faithfulness,
+            "avg_answer_relevance": self.avg_answer_relevance,
+            "avg_context_relevance": self.avg_context_relevance,
+            "avg_completeness": self.avg_completeness,
+            "avg_overall_score": self.avg_overall_score,
+            "avg_retrieval_latency_ms": self.avg_retrieval_latency_ms,
+            "avg_generation_latency_ms": self.avg_generation_latency_ms,
+            "avg_total_latency_ms": self.avg_total_latency_ms,
+            "p95_latency_ms": self.p95_latency_ms,
+            "category_scores": self.category_scores,
+            "results": [r.to_dict() for r in self.results],
+            "errors": self.errors,
+        }
+    
+    def _dumps(self, indent: bool = True) -> bytes:
+        # orjson only supports a 2-space indent
+        return orjson.dumps(self.to_dict(), option=orjson.OPT_INDENT_2 if indent else 0)
     
     def to_json(self, indent: int = 2) -> str:
-        return json.dumps(self.to_dict(), indent=indent)
+        return self._dumps(bool(indent)).decode()
     
     def save(self, path: str):
         """Save report to JSON file."""
-        with open(path, 'w') as f:
-            f.write(self.to_json())
+        # One unbuffered write of the whole blob, bypassing the file object layer
+        data = memoryview(self._dumps())
+        fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+        try:
+            while data:
+                data = data[os.write(fd, data):]
+        finally:
+            os.close(fd)
         logger.info("Report saved", path=path)
     
+    def finalize(self):
+        """Mark the report complete so summary() can be cached."""
+        self._finalized = True
+        self._summary = None
+    
     def summary(self) -> str:
         """Generate a text summary of the report."""
+        if self._summary is not None:
+            return self._summary
+        
+        summary = self._render_summary()
+        if self._finalized:
+            self._summary = summary
+        return summary
+    
+    def _render_summary(self) -> str:
         return f"""
 ╔══════════════════════════════════════════════════════════════╗
 ║                    RAG EVALUATION REPORT                      ║
@@ -134,21 +202,21 @@ class EvaluationRunner:
         max_concurrent: int = 3,
         categories: List[str] = None,
         difficulties: List[str] = None,
+        semaphore: Optional[asyncio.Semaphore] = None,
     ) -> EvaluationReport:
-        """Run evaluation on an entire dataset."""
+        """
+        Run evaluation on an entire dataset.
+        
+        At most max_concurrent test cases run at once. Pass one semaphore to
+        several concurrent runs to also share a single limit between them.
+        """
         report = EvaluationReport(
             name=name,
             dataset_name=dataset.name,
         )
         
-        # Filter test cases
-        test_cases = list(dataset)
-        
-        if categories:
-            test_cases = [tc for tc in test_cases if tc.category in categories]
-        
-        if difficulties:
-            test_cases = [tc for tc in test_cases if tc.difficulty in difficulties]
+        # Filter test cases (cached on the dataset for repeated runs)
+        test_cases = dataset.filter(categories, difficulties)
         
         report.total_queries = len(test_cases)
         logger.info(
@@ -157,77 +225,74 @@ class EvaluationRunner:
             total_cases=len(test_cases),
         )
         
-        # Run evaluations with concurrency limit
-        semaphore = asyncio.Semaphore(max_concurrent)
-        results: List[EvaluationResult] = []
         errors: List[dict] = []
         
-        async def evaluate_with_limit(test_case: TestCase):
-            async with semaphore:
-                try:
-                    result = await self.run_single(test_case, k)
-                    return ("success", test_case, result)
-                except Exception as e:
-                    logger.error("Evaluation failed", id=test_case.id, error=str(e))
-                    return ("error", test_case, str(e))
-        
-        tasks = [evaluate_with_limit(tc) for tc in test_cases]
-        completed = await asyncio.gather(*tasks)
+        # One row of per-query scalars per successful result (SoA layout), reduced in one call
+        metrics_matrix = np.empty((len(test_cases), len(_METRIC_COLUMNS)), dtype=np.float64)
+        row_categories: List[str] = []
         
-        # Process results
-        category_results: Dict[str, List[float]] = {}
-        latencies: List[float] = []
+        def record(test_case: TestCase, result: EvaluationResult):
+            report.results.append(result)
+            
+            rm, gm, lm = result.retrieval_metrics, result.generation_metrics, result.latency_metrics
+            metrics_matrix[report.successful_queries] = (
+                rm.precision_at_k,
+                rm.mrr,
+                rm.hit_rate,
+                gm.faithfulness,
+                gm.answer_relevance,
+                gm.context_relevance,
+                gm.completeness,
+                0.0,  # overall score, filled for all rows at once below
+                lm.retrieval_ms,
+                lm.generation_ms,
+                lm.total_ms,
+            )
+            row_categories.append(test_case.category)
+            report.successful_queries += 1
         
-        for status, test_case, data in completed:
-            if status == "success":
-                result: EvaluationResult = data
-                results.append(result)
-                report.results.append(result.to_dict())
-                report.successful_queries += 1
-                latencies.append(result.latency_metrics.total_ms)
-                
-                # Category tracking
-                if test_case.category not in category_results:
-                    category_results[test_case.category] = []
-                category_results[test_case.category].append(result.overall_score)
-            else:
-                report.failed_queries += 1
-                errors.append({
-                    "test_case_id": test_case.id,
-                    "query": test_case.query,
-                    "error": data,
-                })
+        # One DB session and pipeline for the whole run; each result is folded in
+        # as it completes, so no per-case intermediates pile up. Workers copy the
+        # context when created, so they all see the batch timestamp
+        with eval_batch():
+            async for i, outcome in self.evaluator.evaluate_stream(test_cases, k, max_concurrent, semaphore):
+                test_case = test_cases[i]
+                if isinstance(outcome, Exception):
+                    logger.error("Evaluation failed", id=test_case.id, error=str(outcome))
+                    report.failed_queries += 1
+                    errors.append({
+                        "test_case_id": test_case.id,
+                        "query": test_case.query,
+                        "error": str(outcome),
+                    })
+                else:
+                    record(test_case, outcome)
         
         report.errors = errors
         
         # Calculate aggregate metrics
-        if results:
-            n = len(results)
-            
-            report.avg_retrieval_precision = sum(r.retrieval_metrics.precision_at_k for r in results) / n
-            report.avg_retrieval_mrr = sum(r.retrieval_metrics.mrr for r in results) / n
-            report.avg_retrieval_hit_rate = sum(r.retrieval_metrics.hit_rate for r in results) / n
+        n = report.successful_queries
+        if n:
+            metrics_matrix = metrics_matrix[:n]
+            metrics_matrix[:, _METRIC_COLUMNS.index("avg_overall_score")] = aggregate_overall_scores(report.results)
+            for column, mean in zip(_METRIC_COLUMNS, metrics_matrix.mean(axis=0).tolist()):
+                setattr(report, column, mean)
             
-            report.avg_faithfulness = sum(r.generation_metrics.faithfulness for r in results) / n
-            report.avg_answer_relevance = sum(r.generation_metrics.answer_relevance for r in results) / n
-            report.avg_context_relevance = sum(r.generation_metrics.context_relevance for r in results) / n
-            report.avg_completeness = sum(r.generation_metrics.completeness for r in results) / n
-            
-            report.avg_overall_score = sum(r.overall_score for r in results) / n
-            
-            report.avg_retrieval_latency_ms = sum(r.latency_metrics.retrieval_ms for r in results) / n
-            report.avg_generation_latency_ms = sum(r.latency_metrics.generation_ms for r in results) / n
-            report.avg_total_latency_ms = sum(r.latency_metrics.total_ms for r in results) / n
-            
-            if latencies:
-                sorted_latencies = sorted(latencies)
-                p95_idx = int(len(sorted_latencies) * 0.95)
-                report.p95_latency_ms = sorted_latencies[min(p95_idx, len(sorted_latencies) - 1)]
+            # Select the p95 element in O(n) rather than sorting every latency
+            latencies = metrics_matrix[:, -1]
+            p95_idx = min(int(n * 0.95), n - 1)
+            report.p95_latency_ms = float(np.partition(latencies, p95_idx)[p95_idx])
             
             # Category scores
+            overall_scores = metrics_matrix[:, _METRIC_COLUMNS.index("avg_overall_score")].tolist()
+            category_results: Dict[str, List[float]] = {}
+            for category, score in zip(row_categories, overall_scores):
+                category_results.setdefault(category, []).append(score)
             for category, scores in category_results.items():
                 report.category_scores[category] = sum(scores) / len(scores)
         
+        report.finalize()
+        
         logger.info(
             "Evaluation complete",
             name=name,
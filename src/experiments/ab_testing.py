@@ -2,13 +2,29 @@
 A/B Testing framework for GenAI experiments with metrics tracking.
 """
 
+import asyncio
+import bisect
 import hashlib
-import random
+import time
 from typing import Dict, List, Optional, Any
 from dataclasses import dataclass
+from functools import lru_cache
 from enum import Enum
 from datetime import datetime
 
+import httpx
+
+from ..observability.prometheus import instant_query
+
+# How long is_active() may reuse its last start/end date check
+ACTIVE_CHECK_TTL_SECONDS = 1.0
+
+# Per-experiment number of memoized user -> variant assignments
+ASSIGNMENT_CACHE_SIZE = 65_536
+
+# Connection pool size (and in-flight request cap) for Prometheus queries
+PROMETHEUS_MAX_CONNECTIONS = 100
+
 
 class ExperimentStatus(Enum):
     """Experiment status."""
@@ -18,7 +34,7 @@ class ExperimentStatus(Enum):
     COMPLETED = "completed"
 
 
-@dataclass
+@dataclass(slots=True)
 class Variant:
     """
     A/B test variant.
@@ -32,7 +48,7 @@ class Variant:
             raise ValueError("Weight must be between 0 and 1")
 
 
-@dataclass
+@dataclass(slots=True)
 class ExperimentMetrics:
     """Aggregated metrics for a variant."""
     variant_name: str
@@ -88,12 +104,36 @@ class Experiment:
         self.variants = variants
         self.start_date = start_date or datetime.now()
         self.end_date = end_date
-        self.status = ExperimentStatus.DRAFT
+        self.status = ExperimentStatus.DRAFT  # also sets self._running
+        
+        # is_active() re-checks the date window at most once per ACTIVE_CHECK_TTL_SECONDS
+        self._window_checked_at = float("-inf")
+        self._in_window = False
         
         # Validate weights sum to 1.0
         total_weight = sum(v.weight for v in variants)
         if not (0.99 <= total_weight <= 1.01):  # Allow small float errors
             raise ValueError(f"Variant weights must sum to 1.0 (got {total_weight})")
+        
+        # Cumulative weights for bisecting in assign_variant
+        self._cum_weights: List[float] = []
+        cumulative = 0.0
+        for variant in variants:
+            cumulative += variant.weight
+            self._cum_weights.append(cumulative)
+        
+        # Assignment is a pure function of (name, user_id); repeat users skip the hash
+        self._assign_cached = lru_cache(maxsize=ASSIGNMENT_CACHE_SIZE)(self._assign)
+    
+    @property
+    def status(self) -> ExperimentStatus:
+        return self._status
+    
+    @status.setter
+    def status(self, status: ExperimentStatus):
+        self._status = status
+        # Plain bool for the is_active() hot path instead of an Enum comparison
+        self._running = status is ExperimentStatus.RUNNING
     
     def assign_variant(self, user_id: str) -> Variant:
         """
@@ -105,25 +145,24 @@ class Experiment:
         Returns:
             Assigned variant
         """
-        # Hash user_id to get consistent assignment
-        hash_value = int(hashlib.md5(f"{self.name}:{user_id}".encode()).hexdigest(), 16)
-        random.seed(hash_value)
-        rand = random.random()
-        
-        # Assign based on weights
-        cumulative = 0.0
-        for variant in self.variants:
-            cumulative += variant.weight
-            if rand <= cumulative:
-                return variant
+        return self._assign_cached(user_id)
+    
+    def _assign(self, user_id: str) -> Variant:
+        """Hash user_id onto the cumulative weights (uncached)."""
+        # Hash user_id to a uniform float in [0, 1) for consistent assignment
+        digest = hashlib.blake2b(f"{self.name}:{user_id}".encode(), digest_size=8).digest()
+        rand = int.from_bytes(digest, "big") / 2**64
         
-        # Fallback (should never reach here)
-        return self.variants[0]
+        # First variant whose cumulative weight reaches rand; weights summing
+        # slightly under 1.0 fall through to the last variant
+        idx = bisect.bisect_left(self._cum_weights, rand)
+        return self.variants[min(idx, len(self.variants) - 1)]
     
     def start(self):
         """Start experiment."""
         self.status = ExperimentStatus.RUNNING
         self.start_date = datetime.now()
+        self._window_checked_at = float("-inf")
     
     def pause(self):
         """Pause experiment."""
@@ -138,21 +177,21 @@ class Experiment:
         """Mark experiment as completed."""
         self.status = ExperimentStatus.COMPLETED
         self.end_date = datetime.now()
+        self._window_checked_at = float("-inf")
     
     def is_active(self) -> bool:
         """Check if experiment is currently active."""
-        if self.status != ExperimentStatus.RUNNING:
+        if not self._running:
             return False
         
-        now = datetime.now()
+        checked_at = time.monotonic()
+        if checked_at - self._window_checked_at < ACTIVE_CHECK_TTL_SECONDS:
+            return self._in_window
         
-        if now < self.start_date:
-            return False
-        
-        if self.end_date and now > self.end_date:
-            return False
-        
-        return True
+        now = datetime.now()
+        self._in_window = now >= self.start_date and not (self.end_date and now > self.end_date)
+        self._window_checked_at = checked_at
+        return self._in_window
 
 
 class ExperimentManager:
@@ -201,6 +240,30 @@ class ExperimentMetricsCollector:
     
     def __init__(self, prometheus_url: str = "http://localhost:9090"):
         self.prometheus_url = prometheus_url
+        # One pooled client for every query, opened on first use so an idle
+        # collector holds no connections; the semaphore keeps in-flight
+        # requests within the pool so they never queue inside httpx
+        self._client: Optional[httpx.AsyncClient] = None
+        self._semaphore = asyncio.Semaphore(PROMETHEUS_MAX_CONNECTIONS)
+    
+    def _get_client(self) -> httpx.AsyncClient:
+        """Return the pooled HTTP client, creating it if needed."""
+        if self._client is None:
+            self._client = httpx.AsyncClient(
+                base_url=self.prometheus_url,
+                timeout=10.0,
+                limits=httpx.Limits(
+                    max_connections=PROMETHEUS_MAX_CONNECTIONS,
+                    max_keepalive_connections=PROMETHEUS_MAX_CONNECTIONS // 2,
+                ),
+            )
+        return self._client
+    
+    async def close(self):
+        """Close the pooled HTTP client, if one was opened."""
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
     
     async def collect_metrics(
         self,
@@ -219,10 +282,7 @@ class ExperimentMetricsCollector:
         Returns:
             Aggregated metrics for the variant
         """
-        # TODO: Implement actual Prometheus queries
-        # This is a placeholder showing the structure
-        
-        _queries = {
+        queries = {
             "requests": f'sum(rate(request_latency_seconds_count{{experiment="{experiment_name}",variant="{variant_name}"}}[{duration}]))',
             "avg_latency": f'avg(rate(request_latency_seconds_sum{{experiment="{experiment_name}",variant="{variant_name}"}}[{duration}]) / rate(request_latency_seconds_count{{experiment="{experiment_name}",variant="{variant_name}"}}[{duration}]))',
             "avg_cost": f'avg(rate(llm_cost_dollars_total{{experiment="{experiment_name}",variant="{variant_name}"}}[{duration}]))',
@@ -230,13 +290,27 @@ class ExperimentMetricsCollector:
             "positive_feedback_rate": f'sum(rate(user_feedback_total{{sentiment="positive",experiment="{experiment_name}",variant="{variant_name}"}}[{duration}])) / sum(rate(user_feedback_total{{experiment="{experiment_name}",variant="{variant_name}"}}[{duration}]))',
         }
         
-        # Execute queries and aggregate
+        # Execute all queries concurrently and aggregate
         metrics = ExperimentMetrics(variant_name=variant_name)
         
-        # TODO: Execute queries against Prometheus
-        # For now, return placeholder metrics
+        values = await asyncio.gather(*[
+            self._query(promql) for promql in queries.values()
+        ])
+        
+        for field_name, value in zip(queries, values):
+            if value is None:
+                continue
+            if field_name == "requests":
+                value = round(value)
+            setattr(metrics, field_name, value)
+        
         return metrics
     
+    async def _query(self, promql: str) -> Optional[float]:
+        """Run an instant PromQL query; None when it fails or returns no sample."""
+        async with self._semaphore:
+            return await instant_query(self._get_client(), promql)
+    
     async def compare_variants(
         self,
         experiment_name: str,
@@ -254,17 +328,12 @@ class ExperimentMetricsCollector:
         Returns:
             Dict mapping variant name to metrics
         """
-        results = {}
+        metrics_list = await asyncio.gather(*[
+            self.collect_metrics(experiment_name, variant_name, duration)
+            for variant_name in variant_names
+        ])
         
-        for variant_name in variant_names:
-            metrics = await self.collect_metrics(
-                experiment_name,
-                variant_name,
-                duration
-            )
-            results[variant_name] = metrics
-        
-        return results
+        return dict(zip(variant_names, metrics_list))
 
 
 # ============================================================================
@@ -314,10 +383,13 @@ track_rag_retrieval(
 
 # After 7 days, compare:
 collector = ExperimentMetricsCollector()
-results = await collector.compare_variants(
-    "embedding_model_v2",
-    ["control", "treatment"]
-)
+try:
+    results = await collector.compare_variants(
+        "embedding_model_v2",
+        ["control", "treatment"]
+    )
+finally:
+    await collector.close()
 
 # Decision:
 if results["treatment"].avg_similarity > results["control"].avg_similarity:
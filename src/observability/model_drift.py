@@ -2,20 +2,80 @@
 ML Observability - Model drift detection and monitoring.
 """
 
-from typing import Dict, List, Optional
+import asyncio
+import bisect
+import math
+import sys
+import time
+from array import array
+from concurrent.futures import ThreadPoolExecutor
+from collections import deque
+from itertools import islice
+from typing import Deque, Dict, List, NamedTuple, Optional, Tuple
 from dataclasses import dataclass
 from datetime import datetime, timedelta
 from enum import Enum
 
+import httpx
+import numpy as np
+
+from .prometheus import instant_query
+
+try:
+    from numba import njit
+except ImportError:  # numba is optional; kernels then run as plain Python
+    def njit(*args, **kwargs):
+        if args and callable(args[0]):
+            return args[0]
+        return lambda func: func
+
+# Seconds a Prometheus query result is reused before querying again
+PROMETHEUS_CACHE_TTL_SECONDS = 60.0
+
+# PromQL for each monitored metric
+METRIC_QUERIES = {
+    "avg_similarity": "avg(rag_similarity_score)",
+    "cache_hit_rate": 'rate(cache_operations_total{operation="hit"}[1h]) / rate(cache_operations_total[1h])',
+    "completion_rate": 'rate(task_completion_total{status="completed"}[1h]) / rate(task_completion_total[1h])',
+    "routing_confidence": "avg(agent_routing_confidence)",
+    "avg_latency": 'avg(rate(request_latency_seconds_sum[1h]) / rate(request_latency_seconds_count[1h]))',
+    "error_rate": 'rate(http_errors_total[1h]) / rate(request_latency_seconds_count[1h])',
+    "handoff_rate": 'rate(human_handoff_total[1h]) / rate(request_latency_seconds_count[1h])',
+    "avg_cost": 'rate(llm_cost_dollars_total[1h])',
+}
+
+# Adaptive drift thresholds: checks per metric before percentiles replace the
+# fixed thresholds, and the smallest relative change they can flag
+ADAPTIVE_MIN_SAMPLES = 30
+ADAPTIVE_THRESHOLD_FLOOR = 0.01
+
+# Z-score drift: samples before alerting (exact running stats until then),
+# EWMA weight of each new sample afterwards, and severity cut-offs
+ZSCORE_MIN_SAMPLES = 10
+ZSCORE_SMOOTHING = 0.1
+ZSCORE_WARNING = 2.0
+ZSCORE_CRITICAL = 3.0
+
+# Ordinal of each severity value, lowest first
+_SEVERITY_RANK = {"normal": 0, "warning": 1, "critical": 2}
+
 
 class DriftSeverity(Enum):
     """Drift severity level."""
     NORMAL = "normal"
     WARNING = "warning"
     CRITICAL = "critical"
+    
+    @property
+    def rank(self) -> int:
+        """Ordinal for severity comparisons (NORMAL < WARNING < CRITICAL)."""
+        return _SEVERITY_RANK[self._value_]
+
 
+_SEVERITY_BY_RANK = sorted(DriftSeverity, key=lambda severity: severity.rank)
 
-@dataclass
+
+@dataclass(slots=True, frozen=True)
 class MetricWindow:
     """Time window for metric aggregation."""
     start: datetime
@@ -29,7 +89,7 @@ class MetricWindow:
         return (self.end - self.start).total_seconds() / 3600
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class DriftDetection:
     """Drift detection result."""
     metric_name: str
@@ -37,8 +97,117 @@ class DriftDetection:
     current_value: float
     percent_change: float
     severity: DriftSeverity
-    detected_at: datetime
+    detected_at_ns: int  # time.time_ns() at detection
     message: str
+    
+    @property
+    def detected_at(self) -> datetime:
+        """Detection time as a local datetime, built on access."""
+        return datetime.fromtimestamp(self.detected_at_ns / 1e9)
+
+
+class MetricSpec(NamedTuple):
+    """A monitored metric and the direction in which it degrades."""
+    name: str
+    direction: str  # "decrease" or "increase"
+    description: str
+
+
+# Monitored metrics, with interned names so lookups by a detection's
+# (also interned) metric_name match on identity
+_METRIC_SPECS = tuple(
+    MetricSpec(sys.intern(name), direction, description)
+    for name, direction, description in (
+        ("avg_similarity", "decrease", "RAG retrieval quality"),
+        ("cache_hit_rate", "decrease", "Cache efficiency"),
+        ("completion_rate", "decrease", "Task success rate"),
+        ("routing_confidence", "decrease", "Routing quality"),
+        ("avg_latency", "increase", "Response speed"),
+        ("error_rate", "increase", "System reliability"),
+        ("handoff_rate", "increase", "Human escalation"),
+        ("avg_cost", "increase", "LLM spend"),
+    )
+)
+_METRIC_BY_NAME = {spec.name: spec for spec in _METRIC_SPECS}
+
+
+@njit(cache=True, nogil=True)
+def _relative_changes(baseline, current):
+    """|current - baseline| / baseline per metric; a zero baseline is infinite drift unless current is zero too."""
+    n = baseline.shape[0]
+    percent_change = np.empty(n, dtype=np.float64)
+    for i in range(n):
+        if baseline[i] == 0:
+            percent_change[i] = np.inf if current[i] != 0 else 0.0
+        else:
+            percent_change[i] = abs((current[i] - baseline[i]) / baseline[i])
+    return percent_change
+
+
+@njit(cache=True, nogil=True)
+def _severity_ranks(percent_change, warning, critical):
+    """Severity rank per metric (0 normal, 1 warning, 2 critical); NaN changes are normal."""
+    n = percent_change.shape[0]
+    severity = np.zeros(n, dtype=np.int64)
+    for i in range(n):
+        if percent_change[i] >= critical[i]:
+            severity[i] = 2
+        elif percent_change[i] >= warning[i]:
+            severity[i] = 1
+    return severity
+
+
+@njit(cache=True, nogil=True)
+def _drift_kernel(baseline, current, warning, critical):
+    """Relative change and severity rank per metric in one pass over the arrays."""
+    percent_change = _relative_changes(baseline, current)
+    return percent_change, _severity_ranks(percent_change, warning, critical)
+
+
+# Compile (or load from the numba cache) at import, not on the first check
+_drift_kernel(np.ones(1), np.ones(1), np.ones(1), np.ones(1))
+
+
+class StreamingPercentile:
+    """
+    Constant-memory percentile estimate over a stream of non-negative values.
+    
+    Values are counted into n_bins equal-width bins over [0, upper). When a
+    value lands past upper, adjacent bins are merged pairwise and the range
+    doubles, so every update is a single pass with fixed memory.
+    """
+    
+    def __init__(self, n_bins: int = 64, upper: float = 1.0):
+        self.counts = np.zeros(n_bins, dtype=np.int64)
+        self.upper = upper
+        self.n = 0
+    
+    def update(self, value: float):
+        """Add one observation (non-finite values are ignored)."""
+        if not math.isfinite(value):
+            return
+        
+        n_bins = len(self.counts)
+        while value >= self.upper:
+            half = n_bins // 2
+            self.counts[:half] = self.counts.reshape(half, 2).sum(axis=1)
+            self.counts[half:] = 0
+            self.upper *= 2
+        
+        self.counts[int(value / self.upper * n_bins)] += 1
+        self.n += 1
+    
+    def percentile(self, q: float) -> float:
+        """Estimate the q-th quantile (0-1), interpolating within its bin."""
+        if self.n == 0:
+            return 0.0
+        
+        cumulative = np.cumsum(self.counts)
+        target = q * self.n
+        i = min(int(np.searchsorted(cumulative, target)), len(self.counts) - 1)
+        below = cumulative[i - 1] if i else 0
+        fraction = (target - below) / self.counts[i] if self.counts[i] else 0.0
+        return float((i + fraction) * self.upper / len(self.counts))
 
 
 class ModelDriftDetector:
@@ -47,17 +216,31 @@ class ModelDriftDetector:
     
     Monitors key metrics over time and alerts when significant
     changes are detected compared to baseline.
+    
+    With adaptive_thresholds, each metric's thresholds become the P95/P99 of
+    its own past changes once ADAPTIVE_MIN_SAMPLES checks have been seen, so
+    noisy metrics alert less and stable ones more.
     """
     
     def __init__(
         self,
         warning_threshold: float = 0.15,  # 15% change
-        critical_threshold: float = 0.30  # 30% change
+        critical_threshold: float = 0.30,  # 30% change
+        retention: timedelta = timedelta(days=7),
+        adaptive_thresholds: bool = False
     ):
         self.warning_threshold = warning_threshold
         self.critical_threshold = critical_threshold
+        self.retention = retention
+        self.adaptive_thresholds = adaptive_thresholds
+        self._change_percentiles: Dict[str, StreamingPercentile] = {}
+        # check_drift_zscore state per metric: [mean, variance, n]
+        self._zscore_stats: Dict[str, List[float]] = {}
         self.baselines: Dict[str, float] = {}
-        self.history: List[DriftDetection] = []
+        # Oldest first; detections older than `retention` are evicted on append.
+        # _times holds each detection's detected_at_ns, in step with history, for bisecting.
+        self.history: Deque[DriftDetection] = deque()
+        self._times = array("q")
     
     def set_baseline(self, metric_name: str, value: float):
         """
@@ -101,25 +284,177 @@ class ModelDriftDetector:
             percent_change = abs((current_value - baseline_value) / baseline_value)
         
         # Determine severity
-        if percent_change >= self.critical_threshold:
+        warning_threshold, critical_threshold = self._thresholds(metric_name, percent_change)
+        if percent_change >= critical_threshold:
             severity = DriftSeverity.CRITICAL
-        elif percent_change >= self.warning_threshold:
+        elif percent_change >= warning_threshold:
             severity = DriftSeverity.WARNING
         else:
             severity = DriftSeverity.NORMAL
         
         # Only return detection if drift is significant
-        if severity == DriftSeverity.NORMAL:
+        if severity is DriftSeverity.NORMAL:
+            return None
+        
+        return self._record(metric_name, baseline_value, current_value, percent_change, severity)
+    
+    def check_drift_many(self, current_metrics: Dict[str, float]) -> List[DriftDetection]:
+        """
+        Check several metrics against their stored baselines in one vectorized pass.
+        
+        Metrics without a baseline have their current value stored as the
+        baseline, as in check_drift().
+        
+        Args:
+            current_metrics: Current value per metric name
+        
+        Returns:
+            Drift detections, in the order of current_metrics
+        """
+        names = []
+        for metric_name, current_value in current_metrics.items():
+            if metric_name in self.baselines:
+                names.append(metric_name)
+            else:
+                self.set_baseline(metric_name, current_value)
+        
+        if not names:
+            return []
+        
+        baseline = np.fromiter((self.baselines[n] for n in names), dtype=np.float64, count=len(names))
+        current = np.fromiter((current_metrics[n] for n in names), dtype=np.float64, count=len(names))
+        
+        if self.adaptive_thresholds:
+            percent_change = _relative_changes(baseline, current)
+            thresholds = np.array([
+                self._thresholds(name, change)
+                for name, change in zip(names, percent_change.tolist())
+            ])
+            severity = _severity_ranks(
+                percent_change,
+                np.ascontiguousarray(thresholds[:, 0]),
+                np.ascontiguousarray(thresholds[:, 1]),
+            )
+        else:
+            percent_change, severity = _drift_kernel(
+                baseline,
+                current,
+                np.full(len(names), self.warning_threshold, dtype=np.float64),
+                np.full(len(names), self.critical_threshold, dtype=np.float64),
+            )
+        
+        return [
+            self._record(
+                names[i],
+                float(baseline[i]),
+                float(current[i]),
+                float(percent_change[i]),
+                _SEVERITY_BY_RANK[severity[i]],
+            )
+            for i in np.flatnonzero(severity).tolist()
+        ]
+    
+    def check_drift_zscore(
+        self,
+        metric_name: str,
+        current_value: float
+    ) -> Optional[DriftDetection]:
+        """
+        Check a value against the metric's own running mean and spread.
+        
+        No baseline is needed: the first ZSCORE_MIN_SAMPLES values build exact
+        running statistics (Welford), after which each value is blended in
+        with weight ZSCORE_SMOOTHING so the reference follows slow trends.
+        Severity is WARNING at |z| >= 2 and CRITICAL at |z| >= 3; any change
+        after a constant run (zero spread) is CRITICAL.
+        
+        Args:
+            metric_name: Name of metric
+            current_value: Current metric value
+        
+        Returns:
+            DriftDetection if drift detected, None otherwise
+        """
+        stats = self._zscore_stats.get(metric_name)
+        if stats is None:
+            self._zscore_stats[metric_name] = [current_value, 0.0, 1]
             return None
         
-        # Create detection
+        mean, variance, n = stats
+        delta = current_value - mean
+        std = math.sqrt(variance)
+        if std > 0:
+            z = abs(delta) / std
+        else:
+            # Any move away from a constant history is as far out as it gets
+            z = math.inf if delta != 0 else 0.0
+        warmed_up = n >= ZSCORE_MIN_SAMPLES
+        
+        # Fold the value in after scoring it against the earlier ones
+        if warmed_up:
+            stats[0] = mean + ZSCORE_SMOOTHING * delta
+            stats[1] = (1 - ZSCORE_SMOOTHING) * (variance + ZSCORE_SMOOTHING * delta * delta)
+        else:
+            n += 1
+            new_mean = mean + delta / n
+            stats[:] = new_mean, variance + (delta * (current_value - new_mean) - variance) / n, n
+            return None
+        
+        if z >= ZSCORE_CRITICAL:
+            severity = DriftSeverity.CRITICAL
+        elif z >= ZSCORE_WARNING:
+            severity = DriftSeverity.WARNING
+        else:
+            return None
+        
+        # Report the change relative to the running mean it was scored against
+        if mean == 0:
+            percent_change = float('inf') if current_value != 0 else 0
+        else:
+            percent_change = abs(delta / mean)
+        
+        return self._record(metric_name, mean, current_value, percent_change, severity)
+    
+    def _thresholds(self, metric_name: str, percent_change: float) -> Tuple[float, float]:
+        """
+        Warning/critical thresholds for this check, then record the change.
+        
+        Adaptive thresholds come from the metric's earlier changes only, and
+        fall back to the fixed ones until enough changes have been seen.
+        """
+        if not self.adaptive_thresholds:
+            return self.warning_threshold, self.critical_threshold
+        
+        estimator = self._change_percentiles.get(metric_name)
+        if estimator is None:
+            estimator = self._change_percentiles[metric_name] = StreamingPercentile()
+        
+        if estimator.n < ADAPTIVE_MIN_SAMPLES:
+            thresholds = self.warning_threshold, self.critical_threshold
+        else:
+            warning = max(estimator.percentile(0.95), ADAPTIVE_THRESHOLD_FLOOR)
+            thresholds = warning, max(estimator.percentile(0.99), warning)
+        
+        estimator.update(percent_change)
+        return thresholds
+    
+    def _record(
+        self,
+        metric_name: str,
+        baseline_value: float,
+        current_value: float,
+        percent_change: float,
+        severity: DriftSeverity
+    ) -> DriftDetection:
+        """Create a detection (percent_change as a fraction) and add it to history."""
+        metric_name = sys.intern(metric_name)
         detection = DriftDetection(
             metric_name=metric_name,
             baseline_value=baseline_value,
             current_value=current_value,
             percent_change=percent_change * 100,  # Convert to percentage
             severity=severity,
-            detected_at=datetime.now(),
+            detected_at_ns=time.time_ns(),
             message=self._format_message(
                 metric_name,
                 baseline_value,
@@ -128,8 +463,15 @@ class ModelDriftDetector:
             )
         )
         
-        # Store in history
+        # Store in history, dropping anything past retention
+        now_ns = detection.detected_at_ns
         self.history.append(detection)
+        self._times.append(now_ns)
+        expired = bisect.bisect_left(self._times, now_ns - self.retention // timedelta(microseconds=1) * 1000)
+        if expired:
+            del self._times[:expired]
+            for _ in range(expired):
+                self.history.popleft()
         
         return detection
     
@@ -162,15 +504,18 @@ class ModelDriftDetector:
         Returns:
             List of recent drift detections
         """
-        cutoff = datetime.now() - timedelta(hours=hours)
-        severity_order = [DriftSeverity.NORMAL, DriftSeverity.WARNING, DriftSeverity.CRITICAL]
-        min_severity_index = severity_order.index(min_severity)
-        
-        return [
-            d for d in self.history
-            if d.detected_at >= cutoff
-            and severity_order.index(d.severity) >= min_severity_index
+        min_rank = min_severity.rank
+        
+        # History is time-ordered, so bisect the timestamps for the window start
+        # and read only the entries after it, newest first
+        start = bisect.bisect_left(self._times, time.time_ns() - hours * 3_600_000_000_000)
+        recent = [
+            d for d in islice(reversed(self.history), len(self.history) - start)
+            if d.severity.rank >= min_rank
         ]
+        
+        recent.reverse()
+        return recent
 
 
 class PerformanceMonitor:
@@ -181,24 +526,23 @@ class PerformanceMonitor:
     degradation or improvement.
     """
     
-    MONITORED_METRICS = {
-        # Metric name: (direction, description)
-        "avg_similarity": ("decrease", "RAG retrieval quality"),
-        "cache_hit_rate": ("decrease", "Cache efficiency"),
-        "completion_rate": ("decrease", "Task success rate"),
-        "routing_confidence": ("decrease", "Routing quality"),
-        "avg_latency": ("increase", "Response speed"),
-        "error_rate": ("increase", "System reliability"),
-        "handoff_rate": ("increase", "Human escalation"),
-        "avg_cost": ("increase", "LLM spend"),
-    }
+    MONITORED_METRICS: Tuple[MetricSpec, ...] = _METRIC_SPECS
     
     def __init__(self, prometheus_url: str = "http://localhost:9090"):
         self.prometheus_url = prometheus_url
+        self.collector = PrometheusMetricsCollector(prometheus_url)
         self.drift_detector = ModelDriftDetector(
             warning_threshold=0.15,  # 15%
             critical_threshold=0.30  # 30%
         )
+        # Drift math runs here, off the event loop; one worker keeps
+        # detector updates in order
+        self._cpu_pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="drift")
+    
+    async def close(self):
+        """Close the Prometheus client and the drift worker."""
+        await self.collector.close()
+        self._cpu_pool.shutdown(wait=False)
     
     async def collect_baseline(self, lookback_days: int = 7):
         """
@@ -230,27 +574,22 @@ class PerformanceMonitor:
         Returns:
             List of detected drifts
         """
-        # TODO: Query current metrics from Prometheus
-        # For now, use placeholder values
-        current_metrics = {
-            "avg_similarity": 0.70,  # -15% drift (warning)
-            "cache_hit_rate": 0.63,  # Normal
-            "completion_rate": 0.52,  # -31% drift (critical)
-            "routing_confidence": 0.84,  # Normal
-            "avg_latency": 2.1,  # +40% drift (critical)
-            "error_rate": 0.024,  # Normal
-            "handoff_rate": 0.12,  # Normal
-            "avg_cost": 0.07,  # +40% drift (critical)
+        current_metrics = await self._gather_currents()
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._cpu_pool, self._compute_drift, current_metrics)
+    
+    async def _gather_currents(self) -> Dict[str, float]:
+        """Query every monitored metric in one concurrent batch."""
+        # Metrics that Prometheus can't answer are skipped rather than treated as zero
+        names = [spec.name for spec in self.MONITORED_METRICS]
+        values = await self.collector.query_many([METRIC_QUERIES[name] for name in names])
+        return {
+            name: value for name, value in zip(names, values) if value is not None
         }
-        
-        drifts = []
-        
-        for metric_name, current_value in current_metrics.items():
-            drift = self.drift_detector.check_drift(metric_name, current_value)
-            if drift:
-                drifts.append(drift)
-        
-        return drifts
+    
+    def _compute_drift(self, current_metrics: Dict[str, float]) -> List[DriftDetection]:
+        """Compare current values with the baselines (pure compute, no I/O)."""
+        return self.drift_detector.check_drift_many(current_metrics)
     
     def generate_report(self, drifts: List[DriftDetection]) -> str:
         """
@@ -265,46 +604,52 @@ class PerformanceMonitor:
         if not drifts:
             return "✅ No significant drift detected. All metrics within normal range."
         
-        # Group by severity
-        critical = [d for d in drifts if d.severity == DriftSeverity.CRITICAL]
-        warning = [d for d in drifts if d.severity == DriftSeverity.WARNING]
+        # Group by severity in one pass
+        critical: List[DriftDetection] = []
+        warning: List[DriftDetection] = []
+        for d in drifts:
+            severity = d.severity
+            if severity is DriftSeverity.CRITICAL:
+                critical.append(d)
+            elif severity is DriftSeverity.WARNING:
+                warning.append(d)
         
-        lines = ["# Model Drift Report", ""]
-        lines.append(f"Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
-        lines.append("")
+        critical_section = warning_section = critical_actions = warning_actions = ""
         
         if critical:
-            lines.append("## 🔴 CRITICAL Drifts")
-            lines.append("")
-            for d in critical:
-                lines.append(f"- **{d.metric_name}**: {d.message}")
-            lines.append("")
-        
-        if warning:
-            lines.append("## ⚠️ WARNING Drifts")
-            lines.append("")
-            for d in warning:
-                lines.append(f"- **{d.metric_name}**: {d.message}")
-            lines.append("")
-        
-        lines.append("## Recommendations")
-        lines.append("")
-        
-        if critical:
-            lines.append("**Immediate action required:**")
-            for d in critical:
-                direction, desc = self.MONITORED_METRICS.get(d.metric_name, ("", ""))
-                if direction == "decrease" and d.current_value < d.baseline_value:
-                    lines.append(f"- Investigate {d.metric_name} degradation ({desc})")
-                elif direction == "increase" and d.current_value > d.baseline_value:
-                    lines.append(f"- Investigate {d.metric_name} spike ({desc})")
+            critical_section = "## 🔴 CRITICAL Drifts\n\n" + "".join(
+                f"- **{d.metric_name}**: {d.message}\n" for d in critical
+            ) + "\n"
+            critical_actions = "\n**Immediate action required:**" + "".join(
+                f"\n- {action}" for action in map(self._recommendation, critical) if action
+            )
         
         if warning:
-            lines.append("**Monitor closely:**")
-            for d in warning:
-                lines.append(f"- Watch {d.metric_name} trend")
+            warning_section = "## ⚠️ WARNING Drifts\n\n" + "".join(
+                f"- **{d.metric_name}**: {d.message}\n" for d in warning
+            ) + "\n"
+            warning_actions = "\n**Monitor closely:**" + "".join(
+                f"\n- Watch {d.metric_name} trend" for d in warning
+            )
         
-        return "\n".join(lines)
+        return (
+            f"# Model Drift Report\n\n"
+            f"Generated: {datetime.now():%Y-%m-%d %H:%M:%S}\n\n"
+            f"{critical_section}{warning_section}"
+            f"## Recommendations\n"
+            f"{critical_actions}{warning_actions}"
+        )
+    
+    def _recommendation(self, drift: DriftDetection) -> str:
+        """Action line for a critical drift in its bad direction; empty otherwise."""
+        spec = _METRIC_BY_NAME.get(drift.metric_name)
+        if spec is None:
+            return ""
+        if spec.direction == "decrease" and drift.current_value < drift.baseline_value:
+            return f"Investigate {drift.metric_name} degradation ({spec.description})"
+        if spec.direction == "increase" and drift.current_value > drift.baseline_value:
+            return f"Investigate {drift.metric_name} spike ({spec.description})"
+        return ""
 
 
 # ============================================================================
@@ -316,8 +661,25 @@ class PrometheusMetricsCollector:
     Collects metrics from Prometheus for drift detection.
     """
     
-    def __init__(self, prometheus_url: str = "http://localhost:9090"):
+    def __init__(
+        self,
+        prometheus_url: str = "http://localhost:9090",
+        cache_ttl_seconds: float = PROMETHEUS_CACHE_TTL_SECONDS
+    ):
         self.prometheus_url = prometheus_url
+        self.cache_ttl_seconds = cache_ttl_seconds
+        # One keep-alive client for every query
+        self._client = httpx.AsyncClient(
+            base_url=prometheus_url,
+            timeout=5.0,
+            limits=httpx.Limits(max_keepalive_connections=16),
+        )
+        # query -> (expires_at, value) on the monotonic clock
+        self._cache: Dict[str, Tuple[float, Optional[float]]] = {}
+    
+    async def close(self):
+        """Close the HTTP client."""
+        await self._client.aclose()
     
     async def query_metric(
         self,
@@ -332,11 +694,46 @@ class PrometheusMetricsCollector:
             time_range: Time range for query
         
         Returns:
-            Metric value
+            Metric value (0.0 when Prometheus returns no sample)
+        """
+        value, = await self.query_many([query])
+        return 0.0 if value is None else value
+    
+    async def query_many(self, queries: List[str]) -> List[Optional[float]]:
+        """
+        Execute several Prometheus queries concurrently.
+        
+        Results are cached for cache_ttl_seconds, so repeated drift checks
+        within that window don't hit Prometheus again.
+        
+        Args:
+            queries: PromQL queries
+        
+        Returns:
+            One value per query, None where the query failed or had no sample
         """
-        # TODO: Implement actual Prometheus API call
-        # For now, return placeholder
-        return 0.0
+        now = time.monotonic()
+        values: List[Optional[float]] = [None] * len(queries)
+        misses = []
+        for i, query in enumerate(queries):
+            cached = self._cache.get(query)
+            if cached is not None and cached[0] > now:
+                values[i] = cached[1]
+            else:
+                misses.append(i)
+        
+        if misses:
+            fetched = await asyncio.gather(*[self._query(queries[i]) for i in misses])
+            expires_at = time.monotonic() + self.cache_ttl_seconds
+            for i, value in zip(misses, fetched):
+                values[i] = value
+                self._cache[queries[i]] = (expires_at, value)
+        
+        return values
+    
+    async def _query(self, query: str) -> Optional[float]:
+        """Run one instant query; None when it fails or returns no sample."""
+        return await instant_query(self._client, query)
     
     async def collect_metric_window(
         self,
@@ -354,18 +751,7 @@ class PrometheusMetricsCollector:
             Aggregated metric window
         """
         # Map metric name to Prometheus query
-        queries = {
-            "avg_similarity": "avg(rag_similarity_score)",
-            "cache_hit_rate": 'rate(cache_operations_total{operation="hit"}[1h]) / rate(cache_operations_total[1h])',
-            "completion_rate": 'rate(task_completion_total{status="completed"}[1h]) / rate(task_completion_total[1h])',
-            "routing_confidence": "avg(agent_routing_confidence)",
-            "avg_latency": 'avg(rate(request_latency_seconds_sum[1h]) / rate(request_latency_seconds_count[1h]))',
-            "error_rate": 'rate(http_errors_total[1h]) / rate(request_latency_seconds_count[1h])',
-            "handoff_rate": 'rate(human_handoff_total[1h]) / rate(request_latency_seconds_count[1h])',
-            "avg_cost": 'rate(llm_cost_dollars_total[1h])',
-        }
-        
-        query = queries.get(metric_name)
+        query = METRIC_QUERIES.get(metric_name)
         if not query:
             raise ValueError(f"Unknown metric: {metric_name}")
         
@@ -0,0 +1,33 @@
+"""
+Prometheus HTTP API helpers shared by drift monitoring and experiments.
+"""
+
+import math
+from typing import Optional
+
+import httpx
+
+
+async def instant_query(client: httpx.AsyncClient, promql: str) -> Optional[float]:
+    """
+    Run an instant PromQL query and return its first sample.
+    
+    Args:
+        client: HTTP client whose base_url is the Prometheus server
+        promql: PromQL query
+    
+    Returns:
+        Sample value, or None when the request fails, the response is
+        malformed, or there is no (non-NaN) sample
+    """
+    try:
+        response = await client.get("/api/v1/query", params={"query": promql})
+        response.raise_for_status()
+        result = response.json()["data"]["result"]
+        if not result:
+            return None
+        value = float(result[0]["value"][1])
+    except (httpx.HTTPError, KeyError, IndexError, TypeError, ValueError):
+        return None
+    
+    return None if math.isnan(value) else value
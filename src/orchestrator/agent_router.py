@@ -2,9 +2,20 @@
 Agent router with routing accuracy tracking.
 """
 
+import re
+import sys
+import time
+from collections import OrderedDict
 from typing import Tuple, Optional
 from enum import Enum
-from ..api.metrics import track_agent_routing, track_agent_rerouting
+from ..api.metrics import track_agent_routing, track_agent_rerouting, track_cache_operation
+
+# Number of classified messages kept per router
+CLASSIFY_CACHE_SIZE = 1024
+
+# Rule-based confidence at which detect_wrong_agent trusts a keyword match
+# that agrees with the current agent
+RULE_CONFIRM_CONFIDENCE = 0.7
 
 
 class AgentType(Enum):
@@ -28,6 +39,44 @@ class RerouteReason(Enum):
     ESCALATION = "escalation"
 
 
+def _keyword_pattern(keywords: Tuple[str, ...]) -> "re.Pattern[str]":
+    """Compile keywords into a single case-insensitive substring alternation."""
+    return re.compile("|".join(map(re.escape, keywords)), re.IGNORECASE)
+
+
+# Rule-based fallback: (keyword pattern, intent, confidence), first match wins
+_INTENT_RULES = (
+    # Service scheduling keywords
+    (_keyword_pattern((
+        "schedule", "appointment", "book", "reservation",
+        "service appointment", "make appointment",
+    )), "schedule_service", 0.75),
+    # Technical documentation keywords
+    (_keyword_pattern((
+        "how to", "manual", "guide", "instructions",
+        "documentation", "spec", "feature",
+    )), "technical_question", 0.70),
+    # Troubleshooting keywords
+    (_keyword_pattern((
+        "problem", "issue", "not working", "broken",
+        "error", "fix", "repair", "diagnose",
+    )), "diagnose_problem", 0.72),
+)
+
+
+# Agent for each intent; unknown intents go to specs
+_INTENT_AGENTS = {
+    sys.intern(intent): agent
+    for intent, agent in (
+        ("technical_question", AgentType.SPECS),
+        ("schedule_service", AgentType.MAINTENANCE),
+        ("check_history", AgentType.MAINTENANCE),
+        ("diagnose_problem", AgentType.TROUBLESHOOT),
+        ("troubleshoot", AgentType.TROUBLESHOOT),
+    )
+}
+
+
 class AgentRouter:
     """
     Routes messages to appropriate agent with metrics tracking.
@@ -37,6 +86,8 @@ class AgentRouter:
         self.intent_classifier = intent_classifier
         self.high_confidence_threshold = 0.8
         self.medium_confidence_threshold = 0.5
+        # Recent classifier results by exact message, least recently used first
+        self._classify_cache: OrderedDict[str, Tuple[str, float]] = OrderedDict()
     
     async def route(self, message: str) -> Tuple[AgentType, float]:
         """
@@ -81,13 +132,26 @@ class AgentRouter:
         Returns:
             Tuple of (intent, confidence)
         """
+        start = time.perf_counter()
+        cached = self._classify_cache.get(message)
+        if cached is not None:
+            self._classify_cache.move_to_end(message)
+            track_cache_operation("hit", "intent", (time.perf_counter() - start) * 1000)
+            return cached
+        
         # Try LLM-based classification first
         try:
             result = await self.intent_classifier.classify(message)
-            return result["intent"], result["confidence"]
         except Exception:
-            # Fallback to rule-based
+            # Fallback to rule-based (not cached, so the LLM is retried next time)
             return self._rule_based_classification(message)
+        
+        classified = (result["intent"], result["confidence"])
+        self._classify_cache[message] = classified
+        if len(self._classify_cache) > CLASSIFY_CACHE_SIZE:
+            self._classify_cache.popitem(last=False)
+        track_cache_operation("miss", "intent", (time.perf_counter() - start) * 1000)
+        return classified
     
     def _rule_based_classification(self, message: str) -> Tuple[str, float]:
         """
@@ -99,31 +163,11 @@ class AgentRouter:
         Returns:
             Tuple of (intent, confidence)
         """
-        message_lower = message.lower()
-        
-        # Service scheduling keywords
-        schedule_keywords = [
-            "schedule", "appointment", "book", "reservation",
-            "service appointment", "make appointment"
-        ]
-        if any(keyword in message_lower for keyword in schedule_keywords):
-            return "schedule_service", 0.75
-        
-        # Technical documentation keywords
-        tech_keywords = [
-            "how to", "manual", "guide", "instructions",
-            "documentation", "spec", "feature"
-        ]
-        if any(keyword in message_lower for keyword in tech_keywords):
-            return "technical_question", 0.70
-        
-        # Troubleshooting keywords
-        trouble_keywords = [
-            "problem", "issue", "not working", "broken",
-            "error", "fix", "repair", "diagnose"
-        ]
-        if any(keyword in message_lower for keyword in trouble_keywords):
-            return "diagnose_problem", 0.72
+        # Rule groups are checked in priority order; each is one compiled,
+        # case-insensitive scan, so the message is never lowered
+        for pattern, intent, confidence in _INTENT_RULES:
+            if pattern.search(message):
+                return intent, confidence
         
         # Default to technical question with low confidence
         return "technical_question", 0.45
@@ -143,22 +187,12 @@ class AgentRouter:
         Returns:
             Agent to handle request
         """
-        intent_map = {
-            "technical_question": AgentType.SPECS,
-            "schedule_service": AgentType.MAINTENANCE,
-            "check_history": AgentType.MAINTENANCE,
-            "diagnose_problem": AgentType.TROUBLESHOOT,
-            "troubleshoot": AgentType.TROUBLESHOOT,
-        }
+        # Fallback routing always goes to specs
+        if routing_method is RoutingMethod.FALLBACK:
+            return AgentType.SPECS
         
         # Get agent from map or default to specs
-        agent = intent_map.get(intent, AgentType.SPECS)
-        
-        # If fallback routing, always use specs as default
-        if routing_method == RoutingMethod.FALLBACK:
-            agent = AgentType.SPECS
-        
-        return agent
+        return _INTENT_AGENTS.get(intent, AgentType.SPECS)
     
     def reroute(
         self,
@@ -194,7 +228,20 @@ class AgentRouter:
         
         Returns:
             Correct agent if mismatch detected, None otherwise
+        
+        Each detected mismatch is tracked as a reroute, so await this once per
+        message and keep the result. Repeat calls for the same message reuse
+        the cached classification rather than calling the classifier again.
         """
+        # Cheap keyword check first: a confident rule-based match that agrees
+        # with the current agent settles it without an LLM call
+        intent, confidence = self._rule_based_classification(message)
+        if (
+            confidence >= RULE_CONFIRM_CONFIDENCE
+            and self._intent_to_agent(intent, RoutingMethod.RULE_BASED) == current_agent
+        ):
+            return None
+        
         # Re-classify to see if agent is correct
         intent, confidence = await self._classify_intent(message)
         correct_agent = self._intent_to_agent(intent, RoutingMethod.INTENT_CLASSIFICATION)
@@ -226,9 +273,9 @@ agent, confidence = await router.route("How to change oil?")
 # Returns: (AgentType.SPECS, 0.92)
 # Metrics tracked: agent_routing_total, agent_routing_confidence
 
-# During conversation, detect if wrong agent
-if await router.detect_wrong_agent(message, current_agent=AgentType.MAINTENANCE):
-    correct_agent = await router.detect_wrong_agent(message, AgentType.MAINTENANCE)
+# During conversation, detect if wrong agent (await once: each detected
+# mismatch is tracked as a reroute)
+if correct_agent := await router.detect_wrong_agent(message, current_agent=AgentType.MAINTENANCE):
     # Switch to correct agent
     # Metrics tracked: agent_rerouting_total
 
@@ -1,8 +1,12 @@
 """LangGraph workflow orchestrator."""
 
-from typing import TypedDict, List, Optional, Literal, Annotated
+import asyncio
+import time
+from functools import lru_cache
+from typing import TypedDict, Dict, List, Optional, Literal, Annotated, Tuple
 import operator
 
+import numpy as np
 import structlog
 from langgraph.graph import StateGraph, END
 from langchain_openai import ChatOpenAI
@@ -12,10 +16,53 @@ from src.api.config import get_settings
 from src.agents.specs.agent import SpecsAgent
 from src.agents.maintenance.agent import MaintenanceAgent
 from src.agents.troubleshoot.agent import TroubleshootAgent
+from src.rag.embeddings import CachedEmbeddingService
 
 logger = structlog.get_logger()
 settings = get_settings()
 
+# Example messages per intent; their embedding centroids classify new messages
+INTENT_EXEMPLARS: Dict[str, Tuple[str, ...]] = {
+    "SPECS": (
+        "What is the towing capacity of my truck?",
+        "How much horsepower does the engine have?",
+        "What type of oil does my car use?",
+        "How do I connect my phone to the infotainment system?",
+        "What is the recommended tire pressure?",
+        "How does the adaptive cruise control work?",
+        "Where can I find the owner's manual section on child seats?",
+        "What is the fuel tank capacity?",
+    ),
+    "MAINTENANCE": (
+        "I need to schedule an oil change.",
+        "Can I book a service appointment for next Tuesday?",
+        "When is my next maintenance due?",
+        "Show me my vehicle's service history.",
+        "I want to reschedule my appointment.",
+        "Remind me when the tires need rotating.",
+        "Is there an opening at the dealership this week?",
+        "Cancel my service booking for tomorrow.",
+    ),
+    "TROUBLESHOOT": (
+        "My check engine light is on.",
+        "The car makes a grinding noise when I brake.",
+        "My engine won't start in the morning.",
+        "There is a warning message on the dashboard.",
+        "The air conditioning is blowing warm air.",
+        "I see smoke coming from under the hood.",
+        "The battery keeps dying overnight.",
+        "I got error code P0420, what does it mean?",
+    ),
+}
+
+# Minimum gap between the best and second-best centroid similarity for the
+# embedding classification to stand; tighter calls go to the LLM
+INTENT_MARGIN = 0.1
+
+# Seconds to skip embedding classification after building the centroids
+# failed, so an embedding outage doesn't re-embed every exemplar per message
+PROTOTYPE_RETRY_SECONDS = 60.0
+
 
 class AgentState(TypedDict):
     """State schema for the agent workflow."""
@@ -29,6 +76,28 @@ class AgentState(TypedDict):
     context: dict
 
 
+# Defaults for every AgentState key; copied per request instead of rebuilding the literal
+_STATE_TEMPLATE: AgentState = {
+    "messages": [],
+    "session_id": "",
+    "customer_id": None,
+    "vehicle_id": None,
+    "metadata": {},
+    "current_agent": None,
+    "context": {},
+}
+
+
+def new_agent_state() -> AgentState:
+    """Create an agent state from the shared template."""
+    state = _STATE_TEMPLATE.copy()
+    # Mutable containers must not be shared with the template
+    state["messages"] = []
+    state["metadata"] = {}
+    state["context"] = {}
+    return state
+
+
 def create_llm() -> ChatOpenAI:
     """Create LLM instance using OpenRouter."""
     return ChatOpenAI(
@@ -51,6 +120,12 @@ class Orchestrator:
         self.specs_agent = SpecsAgent()
         self.maintenance_agent = MaintenanceAgent()
         self.troubleshoot_agent = TroubleshootAgent()
+        self.embeddings = CachedEmbeddingService()
+        self._intents = tuple(INTENT_EXEMPLARS)
+        self._prototypes: Optional[np.ndarray] = None  # (intents, dims), unit rows
+        self._prototype_lock = asyncio.Lock()
+        # time.monotonic() before which a failed centroid build is not retried
+        self._prototype_retry_at = 0.0
 
     async def classify_intent(self, state: AgentState) -> AgentState:
         """Classify user intent and determine which agent to use."""
@@ -59,6 +134,65 @@ class Orchestrator:
         last_message = state["messages"][-1]
         user_input = last_message.get("content", "") if isinstance(last_message, dict) else str(last_message)
 
+        intent = await self._classify_by_prototype(user_input)
+        if intent is None:
+            intent, confidence = await self._classify_with_llm(user_input)
+        else:
+            confidence = 0.85
+
+        logger.info("Intent classified", intent=intent, confidence=confidence, session_id=state["session_id"])
+
+        state["current_agent"] = intent.lower()
+        state["context"]["classified_intent"] = intent
+        state["context"]["confidence"] = confidence
+        state["context"]["agent"] = intent.lower()
+
+        return state
+
+    async def _classify_by_prototype(self, user_input: str) -> Optional[str]:
+        """Nearest intent centroid by cosine similarity, or None if too close to call."""
+        try:
+            prototypes = await self._get_prototypes()
+            if prototypes is None:
+                return None  # Backing off after a failed build
+            embedding = np.asarray(await self.embeddings.embed_query(user_input), dtype=np.float32)
+        except Exception as e:
+            logger.warning("Embedding intent classification unavailable", error=str(e))
+            return None
+
+        norm = np.linalg.norm(embedding)
+        if not norm:
+            return None
+
+        scores = prototypes @ (embedding / norm)
+        second, best = np.partition(scores, -2)[-2:]
+        if best - second < INTENT_MARGIN:
+            return None
+        return self._intents[int(np.argmax(scores))]
+
+    async def _get_prototypes(self) -> Optional[np.ndarray]:
+        """Embed the exemplars once and cache one normalized centroid per intent.
+
+        After a failed build, returns None until PROTOTYPE_RETRY_SECONDS have passed.
+        """
+        if self._prototypes is None and time.monotonic() >= self._prototype_retry_at:
+            async with self._prototype_lock:
+                if self._prototypes is None and time.monotonic() >= self._prototype_retry_at:
+                    texts = [text for intent in self._intents for text in INTENT_EXEMPLARS[intent]]
+                    try:
+                        result = await self.embeddings.embed_texts(texts)
+                    except Exception:
+                        self._prototype_retry_at = time.monotonic() + PROTOTYPE_RETRY_SECONDS
+                        raise
+                    vectors = np.asarray(result.embeddings, dtype=np.float32)
+
+                    bounds = np.cumsum([0] + [len(INTENT_EXEMPLARS[intent]) for intent in self._intents])
+                    centroids = np.stack([vectors[a:b].mean(axis=0) for a, b in zip(bounds, bounds[1:])])
+                    self._prototypes = centroids / np.linalg.norm(centroids, axis=1, keepdims=True)
+        return self._prototypes
+
+    async def _classify_with_llm(self, user_input: str) -> Tuple[str, float]:
+        """Ask the LLM for the intent label."""
         classification_prompt = f"""Analyze the following user message and classify it into one of these categories:
 
 1. SPECS - Questions about vehicle specifications, manuals, technical documentation, features, how things work
@@ -82,14 +216,7 @@ Respond with only one word: SPECS, MAINTENANCE, or TROUBLESHOOT"""
         else:
             confidence = 0.85  # High confidence for successful classification
 
-        logger.info("Intent classified", intent=intent, confidence=confidence, session_id=state["session_id"])
-
-        state["current_agent"] = intent.lower()
-        state["context"]["classified_intent"] = intent
-        state["context"]["confidence"] = confidence
-        state["context"]["agent"] = intent.lower()
-
-        return state
+        return intent, confidence
 
     async def route_to_agent(self, state: AgentState) -> Literal["specs", "maintenance", "troubleshoot"]:
         """Route to the appropriate agent based on classification."""
@@ -151,3 +278,13 @@ def create_workflow() -> StateGraph:
 
     # Compile and return
     return workflow.compile()
+
+
+@lru_cache
+def get_workflow():
+    """Get the compiled workflow, built once per process.
+
+    The graph and its agents hold no per-request state, so a single compiled
+    instance is shared by all requests.
+    """
+    return create_workflow()
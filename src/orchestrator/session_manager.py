@@ -2,8 +2,9 @@
 Session manager with task completion tracking.
 """
 
+import heapq
 import time
-from typing import Dict, Optional
+from typing import Callable, Dict, List, Optional, Tuple
 from enum import Enum
 from ..api.metrics import track_task_completion, track_human_handoff
 
@@ -32,7 +33,8 @@ class ChatSession:
         self,
         session_id: str,
         agent: str,
-        user_id: Optional[str] = None
+        user_id: Optional[str] = None,
+        on_activity: Optional[Callable[[str, float], None]] = None
     ):
         self.session_id = session_id
         self.agent = agent
@@ -40,7 +42,16 @@ class ChatSession:
         self.start_time = time.time()
         self.status = "active"
         self.messages = []
+        # Bound once; add_message is called for every message
+        self._append = self.messages.append
+        self._now = time.time
         self.handoff_triggered = False
+        # Time of the latest message (start_time until there is one)
+        self.last_activity_ts = self.start_time
+        # Confidence of the latest assistant message that reported one
+        self._last_assistant_confidence: Optional[float] = None
+        # Called with (session_id, timestamp) for every message added
+        self.on_activity = on_activity
     
     def add_message(self, role: str, content: str, confidence: Optional[float] = None):
         """
@@ -51,12 +62,19 @@ class ChatSession:
             content: Message content
             confidence: Confidence score (for assistant messages)
         """
-        self.messages.append({
+        timestamp = self._now()
+        self._append({
             "role": role,
             "content": content,
             "confidence": confidence,
-            "timestamp": time.time()
+            "timestamp": timestamp
         })
+        self.last_activity_ts = timestamp
+        if role == "assistant" and confidence is not None:
+            self._last_assistant_confidence = confidence
+        
+        if self.on_activity is not None:
+            self.on_activity(self.session_id, timestamp)
     
     def check_abandonment(self, timeout_seconds: int = 300) -> bool:
         """
@@ -71,10 +89,7 @@ class ChatSession:
         if not self.messages:
             return False
         
-        last_message_time = self.messages[-1]["timestamp"]
-        time_since_last = time.time() - last_message_time
-        
-        return time_since_last > timeout_seconds
+        return time.time() - self.last_activity_ts > timeout_seconds
     
     def check_low_confidence(self, threshold: float = 0.7) -> bool:
         """
@@ -86,15 +101,9 @@ class ChatSession:
         Returns:
             True if recent response is below threshold
         """
-        if not self.messages:
-            return False
-        
-        # Check last assistant message
-        for msg in reversed(self.messages):
-            if msg["role"] == "assistant" and msg["confidence"] is not None:
-                return msg["confidence"] < threshold
-        
-        return False
+        # Last assistant confidence, kept up to date by add_message
+        confidence = self._last_assistant_confidence
+        return confidence is not None and confidence < threshold
     
     def trigger_handoff(
         self,
@@ -156,6 +165,10 @@ class SessionManager:
     
     def __init__(self):
         self.sessions: Dict[str, ChatSession] = {}
+        # (last activity, session_id), oldest first; entries superseded by a
+        # later message are skipped when popped
+        self._expiry_heap: List[Tuple[float, str]] = []
+        self._last_activity: Dict[str, float] = {}
     
     def create_session(
         self,
@@ -174,10 +187,17 @@ class SessionManager:
         Returns:
             New ChatSession instance
         """
-        session = ChatSession(session_id, agent, user_id)
+        session = ChatSession(session_id, agent, user_id, on_activity=self._touch)
         self.sessions[session_id] = session
+        # Forget any activity recorded for a session this one replaces
+        self._last_activity.pop(session_id, None)
         return session
     
+    def _touch(self, session_id: str, timestamp: float):
+        """Record a session's latest message time in the expiry index."""
+        self._last_activity[session_id] = timestamp
+        heapq.heappush(self._expiry_heap, (timestamp, session_id))
+    
     def get_session(self, session_id: str) -> Optional[ChatSession]:
         """Get existing session."""
         return self.sessions.get(session_id)
@@ -189,16 +209,21 @@ class SessionManager:
         Args:
             timeout_seconds: Time threshold for abandonment (default 10 min)
         """
-        abandoned = []
+        # Only sessions idle past the timeout can be abandoned, and they sit
+        # at the front of the heap, so the sweep stops at the first recent one
+        cutoff = time.time() - timeout_seconds
+        heap = self._expiry_heap
         
-        for session_id, session in self.sessions.items():
-            if session.status == "active" and session.check_abandonment(timeout_seconds):
+        while heap and heap[0][0] < cutoff:
+            timestamp, session_id = heapq.heappop(heap)
+            if self._last_activity.get(session_id) != timestamp:
+                continue  # Session has newer activity (or is gone)
+            
+            del self._last_activity[session_id]
+            session = self.sessions.get(session_id)
+            if session is not None and session.status == "active":
                 session.mark_abandoned()
-                abandoned.append(session_id)
-        
-        # Remove abandoned sessions
-        for session_id in abandoned:
-            del self.sessions[session_id]
+                del self.sessions[session_id]
 
 
 # ============================================================================
@@ -13,6 +13,15 @@ from langchain_text_splitters import (
 
 logger = structlog.get_logger()
 
+# Paragraph break: a blank (or whitespace-only) line
+_PARAGRAPH_BREAK = re.compile(r'\n\s*\n')
+
+# Markdown indicators at the start of any line: headers, bold, links, code blocks
+_MARKDOWN_PATTERN = re.compile(
+    r'^(?:#{1,6}\s+|\*\*.*\*\*|\[.*\]\(.*\)|```)',
+    re.MULTILINE,
+)
+
 
 class ChunkingStrategy(str, Enum):
     """Available chunking strategies."""
@@ -122,10 +131,12 @@ class DocumentChunker:
     def _chunk_semantic(self, text: str) -> List[str]:
         """Semantic chunking based on paragraphs and sections."""
         # Split by double newlines (paragraphs)
-        paragraphs = re.split(r'\n\s*\n', text)
+        paragraphs = _PARAGRAPH_BREAK.split(text)
         
         chunks = []
-        current_chunk = ""
+        # Paragraphs of the chunk being built and its joined length
+        current_parts: List[str] = []
+        current_len = 0
         
         for para in paragraphs:
             para = para.strip()
@@ -133,24 +144,25 @@ class DocumentChunker:
                 continue
                 
             # If adding this paragraph exceeds chunk size, save current and start new
-            if len(current_chunk) + len(para) + 2 > self.config.chunk_size:
-                if current_chunk:
-                    chunks.append(current_chunk.strip())
-                current_chunk = para
+            if current_len + len(para) + 2 > self.config.chunk_size:
+                if current_parts:
+                    chunks.append("\n\n".join(current_parts))
+                current_parts = [para]
+                current_len = len(para)
             else:
-                current_chunk += "\n\n" + para if current_chunk else para
+                current_len += len(para) + 2 if current_parts else len(para)
+                current_parts.append(para)
         
         # Don't forget the last chunk
-        if current_chunk:
-            chunks.append(current_chunk.strip())
+        if current_parts:
+            chunks.append("\n\n".join(current_parts))
         
         # Handle overlap by including end of previous chunk
-        if self.config.chunk_overlap > 0 and len(chunks) > 1:
-            overlapped_chunks = [chunks[0]]
-            for i in range(1, len(chunks)):
-                prev_end = chunks[i-1][-self.config.chunk_overlap:]
-                overlapped_chunks.append(prev_end + "\n\n" + chunks[i])
-            chunks = overlapped_chunks
+        overlap = self.config.chunk_overlap
+        if overlap > 0 and len(chunks) > 1:
+            chunks = [chunks[0]] + [
+                f"{prev[-overlap:]}\n\n{chunk}" for prev, chunk in zip(chunks, chunks[1:])
+            ]
         
         return chunks
 
@@ -194,16 +206,14 @@ class DocumentChunker:
 
     def _chunk_fixed(self, text: str) -> List[str]:
         """Simple fixed-size chunking."""
-        chunks = []
-        start = 0
-        
-        while start < len(text):
-            end = start + self.config.chunk_size
-            chunk = text[start:end]
-            chunks.append(chunk)
-            start = end - self.config.chunk_overlap
-        
-        return chunks
+        size = self.config.chunk_size
+        step = size - self.config.chunk_overlap
+        if step <= 0:
+            raise ValueError(
+                f"chunk_overlap ({self.config.chunk_overlap}) must be smaller than "
+                f"chunk_size ({size}) for fixed-size chunking"
+            )
+        return [text[start:start + size] for start in range(0, len(text), step)]
 
 
 def auto_detect_strategy(content: str, filename: str = None) -> ChunkingStrategy:
@@ -214,17 +224,9 @@ def auto_detect_strategy(content: str, filename: str = None) -> ChunkingStrategy
         if filename.endswith('.md'):
             return ChunkingStrategy.MARKDOWN
     
-    # Check content for markdown indicators
-    markdown_patterns = [
-        r'^#{1,6}\s+',  # Headers
-        r'^\*\*.*\*\*',  # Bold
-        r'^\[.*\]\(.*\)',  # Links
-        r'^```',  # Code blocks
-    ]
-    
-    for pattern in markdown_patterns:
-        if re.search(pattern, content, re.MULTILINE):
-            return ChunkingStrategy.MARKDOWN
+    # Check content for markdown indicators (one scan for all of them)
+    if _MARKDOWN_PATTERN.search(content):
+        return ChunkingStrategy.MARKDOWN
     
     # Default to recursive (most versatile)
     return ChunkingStrategy.RECURSIVE
@@ -1,9 +1,11 @@
 """Embedding service for RAG - supports OpenRouter and local models."""
 
-from typing import List
+import asyncio
+from typing import List, Optional
 
 import structlog
 import httpx
+import numpy as np
 from pydantic import BaseModel
 
 from src.api.config import get_settings
@@ -11,6 +13,35 @@ from src.api.config import get_settings
 logger = structlog.get_logger()
 settings = get_settings()
 
+# Seconds a cached embedding is kept in Redis
+EMBEDDING_CACHE_TTL_SECONDS = 86400  # 24 hours
+
+# HTTP client shared by every EmbeddingService, so connections are pooled
+# across requests; closed on application shutdown
+_http_client: Optional[httpx.AsyncClient] = None
+
+
+def get_http_client() -> httpx.AsyncClient:
+    """Get the shared embedding API client."""
+    global _http_client
+    
+    if _http_client is None:
+        _http_client = httpx.AsyncClient(
+            timeout=60.0,
+            limits=httpx.Limits(max_connections=32, max_keepalive_connections=16),
+        )
+    
+    return _http_client
+
+
+async def close_http_client():
+    """Close the shared embedding API client."""
+    global _http_client
+    
+    if _http_client is not None:
+        await _http_client.aclose()
+        _http_client = None
+
 
 class EmbeddingResult(BaseModel):
     """Result of embedding operation."""
@@ -39,17 +70,27 @@ class EmbeddingService:
         self.base_url = base_url or settings.openrouter_base_url
         self.model = model or settings.embedding_model
         self.dimensions = settings.embedding_dimension
+        # Sent with every request on the shared client
+        self._url = f"{self.base_url.rstrip('/')}/embeddings"
+        self._headers = {
+            "Authorization": f"Bearer {self.api_key}",
+            "Content-Type": "application/json",
+            "HTTP-Referer": "https://github.com/genai-auto",
+            "X-Title": "GenAI Auto RAG",
+        }
 
     async def embed_texts(
         self,
         texts: List[str],
         batch_size: int = 100,
+        max_concurrent: int = 8,
     ) -> EmbeddingResult:
         """Generate embeddings for multiple texts.
         
         Args:
             texts: List of texts to embed
             batch_size: Number of texts per API call
+            max_concurrent: Maximum API calls in flight at once
             
         Returns:
             EmbeddingResult with all embeddings
@@ -60,15 +101,21 @@ class EmbeddingService:
             model=self.model,
         )
 
-        all_embeddings = []
-        total_tokens = 0
+        # Batches are independent API calls, so send them concurrently
+        semaphore = asyncio.Semaphore(max_concurrent)
 
-        # Process in batches
-        for i in range(0, len(texts), batch_size):
-            batch = texts[i:i + batch_size]
-            result = await self._embed_batch(batch)
-            all_embeddings.extend(result["embeddings"])
-            total_tokens += result.get("tokens", 0)
+        async def embed_batch(batch: List[str]) -> dict:
+            async with semaphore:
+                return await self._embed_batch(batch)
+
+        results = await asyncio.gather(*(
+            embed_batch(texts[i:i + batch_size])
+            for i in range(0, len(texts), batch_size)
+        ))
+
+        # gather keeps batch order, so embeddings stay aligned with texts
+        all_embeddings = [embedding for result in results for embedding in result["embeddings"]]
+        total_tokens = sum(result.get("tokens", 0) for result in results)
 
         logger.info(
             "Embeddings generated",
@@ -102,48 +149,42 @@ class EmbeddingService:
         # Clean texts
         texts = [self._clean_text(t) for t in texts]
         
-        async with httpx.AsyncClient(timeout=60.0) as client:
-            try:
-                response = await client.post(
-                    f"{self.base_url}/embeddings",
-                    headers={
-                        "Authorization": f"Bearer {self.api_key}",
-                        "Content-Type": "application/json",
-                        "HTTP-Referer": "https://github.com/genai-auto",
-                        "X-Title": "GenAI Auto RAG",
-                    },
-                    json={
-                        "model": self.model,
-                        "input": texts,
-                    },
-                )
-                response.raise_for_status()
-                data = response.json()
-
-                # Extract embeddings from response
-                embeddings = [
-                    item["embedding"] 
-                    for item in sorted(data["data"], key=lambda x: x["index"])
-                ]
-                
-                tokens = data.get("usage", {}).get("total_tokens", 0)
-                
-                return {
-                    "embeddings": embeddings,
-                    "tokens": tokens,
-                }
-
-            except httpx.HTTPStatusError as e:
-                logger.error(
-                    "Embedding API error",
-                    status_code=e.response.status_code,
-                    detail=e.response.text,
-                )
-                raise ValueError(f"Embedding API error: {e.response.text}")
+        try:
+            response = await get_http_client().post(
+                self._url,
+                headers=self._headers,
+                json={
+                    "model": self.model,
+                    "input": texts,
+                },
+            )
+            response.raise_for_status()
+            data = response.json()
+
+            # Extract embeddings from response
+            embeddings = [
+                item["embedding"] 
+                for item in sorted(data["data"], key=lambda x: x["index"])
+            ]
+            
+            tokens = data.get("usage", {}).get("total_tokens", 0)
+            
+            return {
+                "embeddings": embeddings,
+                "tokens": tokens,
+            }
 
-            except Exception as e:
-                logger.error("Embedding generation failed", error=str(e))
-                raise
+        except httpx.HTTPStatusError as e:
+            logger.error(
+                "Embedding API error",
+                status_code=e.response.status_code,
+                detail=e.response.text,
+            )
+            raise ValueError(f"Embedding API error: {e.response.text}")
+
+        except Exception as e:
+            logger.error("Embedding generation failed", error=str(e))
+            raise
 
     def _clean_text(self, text: str) -> str:
         """Clean text before embedding."""
@@ -161,25 +202,31 @@ class CachedEmbeddingService(EmbeddingService):
 
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
-        self._cache_prefix = "genai:embedding"
+        # Values are raw float32 bytes; the version keeps them apart from
+        # entries written in the earlier JSON format
+        self._cache_prefix = "genai:embedding:v2"
+
+    def _cache_key(self, text: str) -> str:
+        """Redis key for a text's embedding under the current model."""
+        import hashlib
+
+        text_hash = hashlib.sha256(text.encode()).hexdigest()[:16]
+        return f"{self._cache_prefix}:{self.model}:{text_hash}"
 
     async def embed_query(self, text: str) -> List[float]:
         """Generate embedding with caching."""
-        from src.api.cache import get_redis
-        import hashlib
-        import json
+        from src.api.cache import get_redis_binary
 
         # Generate cache key
-        text_hash = hashlib.sha256(text.encode()).hexdigest()[:16]
-        cache_key = f"{self._cache_prefix}:{self.model}:{text_hash}"
+        cache_key = self._cache_key(text)
 
         try:
-            redis = await get_redis()
+            redis = await get_redis_binary()
             cached = await redis.get(cache_key)
             
             if cached:
                 logger.debug("Embedding cache hit", key=cache_key)
-                return json.loads(cached)
+                return np.frombuffer(cached, dtype=np.float32).tolist()
         except Exception as e:
             logger.warning("Cache read failed", error=str(e))
 
@@ -188,13 +235,65 @@ class CachedEmbeddingService(EmbeddingService):
 
         # Cache it
         try:
-            redis = await get_redis()
+            redis = await get_redis_binary()
             await redis.setex(
                 cache_key,
-                86400,  # 24 hours
-                json.dumps(embedding),
+                EMBEDDING_CACHE_TTL_SECONDS,
+                np.asarray(embedding, dtype=np.float32).tobytes(),
             )
         except Exception as e:
             logger.warning("Cache write failed", error=str(e))
 
         return embedding
+
+    async def embed_queries(self, texts: List[str]) -> List[List[float]]:
+        """Generate embeddings for many queries with caching.
+        
+        Uses one MGET for all cache lookups, one embedding request for the
+        misses and one pipelined write to cache them.
+        
+        Args:
+            texts: Query texts to embed
+            
+        Returns:
+            Embedding vectors, in the order of texts
+        """
+        from src.api.cache import get_redis_binary
+
+        keys = [self._cache_key(text) for text in texts]
+        embeddings: List[Optional[List[float]]] = [None] * len(texts)
+
+        try:
+            redis = await get_redis_binary()
+            for i, cached in enumerate(await redis.mget(keys)):
+                if cached:
+                    embeddings[i] = np.frombuffer(cached, dtype=np.float32).tolist()
+        except Exception as e:
+            logger.warning("Cache read failed", error=str(e))
+
+        misses = [i for i, embedding in enumerate(embeddings) if embedding is None]
+        if not misses:
+            return embeddings
+
+        logger.debug("Embedding cache misses", hits=len(texts) - len(misses), misses=len(misses))
+
+        # Generate the missing embeddings in one request
+        result = await self.embed_texts([texts[i] for i in misses])
+        for i, embedding in zip(misses, result.embeddings):
+            embeddings[i] = embedding
+
+        # Cache them in one round trip
+        try:
+            redis = await get_redis_binary()
+            pipe = redis.pipeline()
+            for i in misses:
+                pipe.setex(
+                    keys[i],
+                    EMBEDDING_CACHE_TTL_SECONDS,
+                    np.asarray(embeddings[i], dtype=np.float32).tobytes(),
+                )
+            await pipe.execute()
+        except Exception as e:
+            logger.warning("Cache write failed", error=str(e))
+
+        return embeddings
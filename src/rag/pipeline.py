@@ -1,7 +1,8 @@
 """Main RAG pipeline for document ingestion and retrieval."""
 
 import io
-from typing import List
+from contextlib import AbstractAsyncContextManager
+from typing import List, Optional
 
 import structlog
 from sqlalchemy.ext.asyncio import AsyncSession
@@ -225,6 +226,7 @@ class RAGPipeline:
         document_type: str = None,
         source: str = None,
         min_score: float = 0.5,
+        db_lock: Optional[AbstractAsyncContextManager] = None,
     ) -> List[SearchResult]:
         """Query the RAG system for relevant documents.
         
@@ -234,6 +236,7 @@ class RAGPipeline:
             document_type: Filter by type
             source: Filter by source
             min_score: Minimum similarity threshold
+            db_lock: Held around the database query only (see VectorStore.search)
             
         Returns:
             List of relevant document chunks
@@ -244,6 +247,7 @@ class RAGPipeline:
             document_type=document_type,
             source=source,
             min_score=min_score,
+            db_lock=db_lock,
         )
 
     async def get_context(
@@ -269,7 +273,11 @@ class RAGPipeline:
             top_k=top_k,
             document_type=document_type,
         )
+        return self.format_context(results, max_tokens=max_tokens)
 
+    @staticmethod
+    def format_context(results: List[SearchResult], max_tokens: int = 3000) -> str:
+        """Format already-retrieved chunks as LLM context (see get_context)."""
         if not results:
             return "No relevant documents found in the knowledge base."
 
@@ -1,6 +1,7 @@
 """Vector store using PostgreSQL + pgvector."""
 
-from typing import List, Dict, Any
+from contextlib import AbstractAsyncContextManager, nullcontext
+from typing import List, Dict, Any, Optional
 from uuid import uuid4
 from datetime import datetime
 
@@ -139,6 +140,7 @@ class VectorStore:
         document_type: str = None,
         source: str = None,
         min_score: float = 0.0,
+        db_lock: Optional[AbstractAsyncContextManager] = None,
     ) -> List[SearchResult]:
         """Search for similar documents.
         
@@ -148,6 +150,8 @@ class VectorStore:
             document_type: Filter by document type
             source: Filter by source
             min_score: Minimum similarity score (0-1)
+            db_lock: Held around the database query only, e.g. an asyncio.Lock
+                shared by tasks using the same session
             
         Returns:
             List of SearchResult objects
@@ -197,8 +201,9 @@ class VectorStore:
             LIMIT :top_k
         """
 
-        result = await self.db.execute(text(sql), params)
-        rows = result.fetchall()
+        async with db_lock or nullcontext():
+            result = await self.db.execute(text(sql), params)
+            rows = result.fetchall()
 
         results = [
             SearchResult(
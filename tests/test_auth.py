@@ -1,11 +1,15 @@
 """Authentication tests."""
 
+import pytest
+from fastapi import HTTPException
+
 from src.api.auth.jwt_auth import (
     hash_password,
     verify_password,
     create_token,
     decode_token,
     create_tokens,
+    verify_access_token,
 )
 
 
@@ -109,3 +113,30 @@ class TestJWTTokens:
         )
 
         assert tokens.access_token != tokens.refresh_token
+
+    def test_verify_access_token_cached(self):
+        """Test verified access tokens are served from the cache."""
+        token = create_token(
+            user_id="user-123",
+            email="test@example.com",
+            name="Test User",
+            token_type="access"
+        )
+
+        first = verify_access_token(token)
+        second = verify_access_token(token)
+
+        assert first.user_id == "user-123"
+        assert second is first
+
+    def test_verify_access_token_rejects_refresh(self):
+        """Test refresh tokens are not accepted as access tokens."""
+        token = create_token(
+            user_id="user-123",
+            email="test@example.com",
+            name="Test User",
+            token_type="refresh"
+        )
+
+        with pytest.raises(HTTPException):
+            verify_access_token(token)
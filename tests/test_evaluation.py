@@ -1,8 +1,20 @@
 """Evaluation module tests."""
 
+import asyncio
+from contextlib import nullcontext
+
 import pytest
-from src.evaluation.metrics import MetricsCalculator, RetrievalMetrics, GenerationMetrics
+from src.evaluation import metrics
+from src.evaluation.metrics import (
+    MetricsCalculator,
+    RAGEvaluator,
+    RetrievalMetrics,
+    GenerationMetrics,
+    _parse_score,
+)
+from src.rag.vectorstore import SearchResult
 from src.evaluation.dataset import TestCase, EvaluationDataset, create_sample_dataset
+from src.evaluation.runner import EvaluationRunner
 
 
 class TestMetricsCalculator:
@@ -79,6 +91,231 @@ class TestMetricsCalculator:
         assert calc.ndcg([0.9]) == 1.0
 
 
+class TestJudgeScoreParsing:
+    """LLM judge score parsing tests."""
+
+    def test_parse_score(self):
+        """Test scores are extracted from noisy judge output."""
+        assert _parse_score("0.8") == 0.8
+        assert _parse_score("Score: 0.75") == 0.75
+        assert _parse_score("1/1") == 1.0
+        assert _parse_score(".9") == 0.9
+        
+        # Nothing usable falls back to the neutral score
+        assert _parse_score("N/A") == 0.5
+        assert _parse_score("10 out of 10") == 0.5
+
+
+def search_results(query: str, k: int = 5) -> list:
+    """Deterministic fake search results: doc ids q-0..q-{k-1}, decreasing scores."""
+    return [
+        SearchResult(
+            content=f"{query} context {i}",
+            score=0.9 - 0.15 * i,
+            metadata={},
+            document_id=f"{query}-{i}",
+        )
+        for i in range(k)
+    ]
+
+
+class FakeJudge:
+    """LLM judge returning fixed scores."""
+
+    async def evaluate_faithfulness(self, answer, contexts):
+        return 0.9
+
+    async def evaluate_answer_relevance(self, query, answer):
+        return 0.8
+
+    async def evaluate_context_relevance(self, query, contexts):
+        return 0.7
+
+    async def evaluate_completeness(self, query, answer, expected_answer=None):
+        return 0.6
+
+
+class FakePipeline:
+    """RAG pipeline serving fake search results; queries containing "fail" raise."""
+
+    def __init__(self, db):
+        self.db = db
+
+    async def query(self, query, top_k=5, db_lock=None):
+        if "fail" in query:
+            raise RuntimeError("search failed")
+        async with db_lock or nullcontext():
+            return search_results(query, top_k)
+
+    @staticmethod
+    def format_context(results):
+        return "\n".join(r.content for r in results)
+
+
+class SlowPipeline(FakePipeline):
+    """Fake pipeline taking 20 ms to embed (unlocked) and 20 ms in the DB (locked)."""
+
+    embedding = 0
+    max_embedding = 0
+
+    async def query(self, query, top_k=5, db_lock=None):
+        SlowPipeline.embedding += 1
+        SlowPipeline.max_embedding = max(SlowPipeline.max_embedding, SlowPipeline.embedding)
+        await asyncio.sleep(0.02)
+        SlowPipeline.embedding -= 1
+        async with db_lock or nullcontext():
+            await asyncio.sleep(0.02)
+        return search_results(query, top_k)
+
+
+class GatedPipeline(FakePipeline):
+    """Fake pipeline whose "slow" queries wait until `release` is set."""
+
+    release: asyncio.Event = None
+
+    async def query(self, query, top_k=5, db_lock=None):
+        if query.startswith("slow"):
+            await GatedPipeline.release.wait()
+        return await super().query(query, top_k, db_lock)
+
+
+class FakeAgent:
+    """Agent echoing the user message."""
+
+    async def process(self, state):
+        return f"answer to {state['messages'][-1]['content']}"
+
+
+@pytest.fixture
+def evaluator(monkeypatch):
+    """RAGEvaluator wired to fake pipeline, agent and judge (no DB or LLM)."""
+    import src.agents.specs.agent
+    import src.rag.pipeline
+
+    monkeypatch.setattr(metrics, "LLMJudge", FakeJudge)
+    monkeypatch.setattr(src.rag.pipeline, "RAGPipeline", FakePipeline)
+    monkeypatch.setattr(src.agents.specs.agent, "SpecsAgent", FakeAgent)
+    return RAGEvaluator(db_session=object())
+
+
+class TestRAGEvaluator:
+    """RAGEvaluator batch path tests."""
+
+    async def test_retrieval_batch_matches_single(self, evaluator):
+        """Test batched retrieval metrics equal per-query evaluate_retrieval."""
+        batch = [
+            (search_results("a"), ["a-0", "a-3", "missing"]),
+            (search_results("b"), None),
+            (search_results("c", 2), ["c-1"]),
+            ([], ["x"]),
+            (search_results("d"), ["none"]),
+        ]
+        
+        batched = evaluator.evaluate_retrieval_batch(batch, k=5)
+        
+        for (docs, relevant_doc_ids), result in zip(batch, batched):
+            single = await evaluator.evaluate_retrieval("q", docs, relevant_doc_ids, k=5)
+            assert result.to_dict() == single.to_dict()
+
+    async def test_evaluate_many_matches_evaluate_single(self, evaluator):
+        """Test evaluate_many keeps case order and scores like evaluate_single."""
+        cases = [
+            TestCase(id="1", query="a", relevant_doc_ids=["a-1"]),
+            TestCase(id="2", query="b"),
+            TestCase(id="3", query="c", relevant_doc_ids=["c-0", "c-4"]),
+        ]
+        
+        results = await evaluator.evaluate_many(cases, k=5, max_concurrent=2)
+        
+        assert [r.query for r in results] == ["a", "b", "c"]
+        for case, result in zip(cases, results):
+            single = await evaluator.evaluate_single(case.query, relevant_doc_ids=case.relevant_doc_ids)
+            assert result.generated_answer == single.generated_answer
+            assert result.retrieval_metrics.to_dict() == single.retrieval_metrics.to_dict()
+            assert result.generation_metrics.to_dict() == single.generation_metrics.to_dict()
+
+    async def test_evaluate_many_raises_first_failure(self, evaluator):
+        """Test evaluate_many raises a failed case by default."""
+        cases = [TestCase(id="1", query="a"), TestCase(id="2", query="fail")]
+        
+        with pytest.raises(RuntimeError, match="search failed"):
+            await evaluator.evaluate_many(cases)
+
+    async def test_evaluate_many_locks_only_db_and_excludes_wait(self, evaluator, monkeypatch):
+        """Test embedding runs concurrently and lock queueing is not retrieval latency."""
+        import src.rag.pipeline
+
+        monkeypatch.setattr(src.rag.pipeline, "RAGPipeline", SlowPipeline)
+        cases = [TestCase(id=str(i), query=f"q{i}") for i in range(5)]
+        
+        results = await evaluator.evaluate_many(cases, max_concurrent=5)
+        
+        assert SlowPipeline.max_embedding == 5
+        # 40 ms of own work each; queued behind the lock the last would report ~120 ms
+        assert max(r.latency_metrics.retrieval_ms for r in results) < 80
+
+    async def test_evaluate_stream_yields_as_cases_finish(self, evaluator, monkeypatch):
+        """Test finished cases are yielded, fully scored, before slower ones complete."""
+        import src.rag.pipeline
+
+        monkeypatch.setattr(src.rag.pipeline, "RAGPipeline", GatedPipeline)
+        GatedPipeline.release = asyncio.Event()
+        cases = [
+            TestCase(id="1", query="slow"),
+            TestCase(id="2", query="a", relevant_doc_ids=["a-0"]),
+            TestCase(id="3", query="fail"),
+        ]
+        seen = []
+        
+        async def consume():
+            async for i, outcome in evaluator.evaluate_stream(cases, max_concurrent=3):
+                seen.append((i, outcome))
+                if len(seen) == 2:
+                    GatedPipeline.release.set()
+        
+        await asyncio.wait_for(consume(), timeout=5)
+        
+        assert sorted(i for i, _ in seen[:2]) == [1, 2]
+        assert seen[2][0] == 0
+        outcomes = dict(seen)
+        assert isinstance(outcomes[2], RuntimeError)
+        assert outcomes[1].retrieval_metrics.hit_rate == 1.0
+        assert outcomes[0].query == "slow"
+
+    async def test_evaluate_many_returns_exceptions_in_place(self, evaluator):
+        """Test return_exceptions keeps failures in their case's slot."""
+        cases = [
+            TestCase(id="1", query="a"),
+            TestCase(id="2", query="fail"),
+            TestCase(id="3", query="c"),
+        ]
+        
+        outcomes = await evaluator.evaluate_many(cases, return_exceptions=True)
+        
+        assert isinstance(outcomes[1], RuntimeError)
+        assert [outcomes[0].query, outcomes[2].query] == ["a", "c"]
+
+    async def test_run_dataset_records_failures(self, evaluator):
+        """Test run_dataset goes through evaluate_many and counts failed cases."""
+        runner = EvaluationRunner()
+        runner.evaluator = evaluator
+        dataset = EvaluationDataset(name="test")
+        dataset.add_test_case(TestCase(id="1", query="a", category="x"))
+        dataset.add_test_case(TestCase(id="2", query="fail", category="x"))
+        dataset.add_test_case(TestCase(id="3", query="c", category="y"))
+        
+        report = await runner.run_dataset(dataset, max_concurrent=2)
+        
+        assert report.successful_queries == 2
+        assert report.failed_queries == 1
+        assert sorted(r.query for r in report.results) == ["a", "c"]
+        assert report.errors[0]["test_case_id"] == "2"
+        assert set(report.category_scores) == {"x", "y"}
+        assert report.avg_overall_score == pytest.approx(
+            sum(r.overall_score for r in report.results) / 2
+        )
+
+
 class TestRetrievalMetrics:
     """RetrievalMetrics dataclass tests."""
 
@@ -213,6 +450,38 @@ class TestEvaluationDataset:
         
         assert len(easy) == 2
 
+    def test_get_by_tag(self):
+        """Test filtering by tag."""
+        dataset = EvaluationDataset()
+        dataset.add_test_cases([
+            TestCase(id="1", query="Q1", tags=["oil", "service"]),
+            TestCase(id="2", query="Q2", tags=["brakes"]),
+            TestCase(id="3", query="Q3", tags=["oil"]),
+        ])
+        
+        oil = dataset.get_by_tag("oil")
+        oil.clear()
+        
+        assert [tc.id for tc in dataset.get_by_tag("oil")] == ["1", "3"]
+    
+    def test_filter(self):
+        """Test combined category/difficulty filtering stays current after adds."""
+        dataset = EvaluationDataset()
+        dataset.add_test_cases([
+            TestCase(id="1", query="Q1", category="specs", difficulty="easy"),
+            TestCase(id="2", query="Q2", category="maintenance", difficulty="easy"),
+            TestCase(id="3", query="Q3", category="specs", difficulty="hard"),
+        ])
+        
+        assert [tc.id for tc in dataset.filter(["specs"])] == ["1", "3"]
+        assert [tc.id for tc in dataset.filter(["specs"], ["easy"])] == ["1"]
+        assert len(dataset.filter()) == 3
+        
+        dataset.add_test_case(TestCase(id="4", query="Q4", category="specs", difficulty="easy"))
+        
+        assert [tc.id for tc in dataset.filter(["specs"], ["easy"])] == ["1", "4"]
+        assert dataset.get_by_tag("missing") == []
+
     def test_iteration(self):
         """Test iterating over dataset."""
         dataset = EvaluationDataset()
@@ -255,3 +524,14 @@ class TestSampleDataset:
         assert "easy" in difficulties
         assert "medium" in difficulties
         assert "hard" in difficulties
+
+    def test_sample_datasets_are_independent(self):
+        """Test changes to one sample dataset don't leak into another."""
+        first = create_sample_dataset()
+        second = create_sample_dataset()
+        
+        first.test_cases[0].query = "changed"
+        first.test_cases[0].tags.append("changed")
+        
+        assert second.test_cases[0].query != "changed"
+        assert "changed" not in second.test_cases[0].tags
@@ -0,0 +1,124 @@
+"""A/B testing experiment tests."""
+
+from collections import Counter
+
+import httpx
+import pytest
+
+from src.experiments.ab_testing import Experiment, ExperimentMetricsCollector, Variant
+
+
+def make_experiment(name: str = "prompt_test", weights=(0.5, 0.3, 0.2)) -> Experiment:
+    """Build an experiment with one variant per weight."""
+    return Experiment(
+        name=name,
+        description="test",
+        variants=[Variant(name=f"v{i}", weight=w, config={}) for i, w in enumerate(weights)],
+    )
+
+
+class TestAssignVariant:
+    """Variant assignment tests."""
+
+    def test_assignment_is_deterministic(self):
+        """Test a user gets the same variant across calls and experiment instances."""
+        first = make_experiment()
+        second = make_experiment()
+
+        for i in range(500):
+            user_id = f"user-{i}"
+            assigned = first.assign_variant(user_id).name
+            assert first.assign_variant(user_id).name == assigned
+            assert second.assign_variant(user_id).name == assigned
+            assert first._assign(user_id).name == assigned
+
+    def test_assignment_depends_on_experiment_name(self):
+        """Test experiments with different names split users independently."""
+        a = make_experiment("a")
+        b = make_experiment("b")
+
+        users = [f"user-{i}" for i in range(500)]
+
+        assert [a.assign_variant(u).name for u in users] != [b.assign_variant(u).name for u in users]
+
+    def test_split_matches_weights(self):
+        """Test the traffic split follows the configured weights."""
+        experiment = make_experiment()
+        n = 20_000
+
+        counts = Counter(experiment.assign_variant(f"user-{i}").name for i in range(n))
+
+        for variant in experiment.variants:
+            assert counts[variant.name] / n == pytest.approx(variant.weight, abs=0.02)
+
+    def test_zero_weight_variant_never_assigned(self):
+        """Test a variant with no weight receives no traffic."""
+        experiment = make_experiment(weights=(0.0, 1.0))
+
+        assert {experiment.assign_variant(f"user-{i}").name for i in range(1000)} == {"v1"}
+
+
+def mock_collector(handler) -> ExperimentMetricsCollector:
+    """Collector whose Prometheus requests are answered by handler."""
+    collector = ExperimentMetricsCollector()
+    collector._client = httpx.AsyncClient(
+        base_url=collector.prometheus_url,
+        transport=httpx.MockTransport(handler),
+    )
+    return collector
+
+
+class TestExperimentMetricsCollector:
+    """Prometheus-backed variant metrics tests."""
+
+    async def test_malformed_samples_are_skipped(self):
+        """Test partial or non-numeric samples leave defaults instead of raising."""
+        bodies = [
+            {"data": {"result": [{"metric": {}}]}},
+            {"data": {"result": [{"value": [0]}]}},
+            {"data": {"result": [{"value": None}]}},
+            {"data": {"result": [{"value": [0, "abc"]}]}},
+            {"data": {}},
+        ]
+        calls = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            calls.append(request)
+            return httpx.Response(200, json=bodies[len(calls) % len(bodies)])
+
+        collector = mock_collector(handler)
+
+        results = await collector.compare_variants("exp", ["control", "treatment"])
+
+        assert len(calls) == 10
+        for name, metrics in results.items():
+            assert metrics.variant_name == name
+            assert metrics.requests == 0
+            assert metrics.avg_latency == 0.0
+
+    async def test_collect_metrics_reads_samples(self):
+        """Test well-formed samples fill the metrics, with requests rounded."""
+        def handler(request: httpx.Request) -> httpx.Response:
+            is_requests = request.url.params["query"].startswith("sum(rate(request_latency_seconds_count")
+            value = "41.6" if is_requests else "0.25"
+            return httpx.Response(200, json={"data": {"result": [{"metric": {}, "value": [0, value]}]}})
+
+        metrics = await mock_collector(handler).collect_metrics("exp", "control")
+
+        assert metrics.requests == 42
+        assert metrics.avg_latency == 0.25
+        assert metrics.error_rate == 0.25
+
+    async def test_client_opened_lazily_and_closed(self):
+        """Test a collector opens no pool until queried and close() releases it."""
+        collector = ExperimentMetricsCollector()
+        assert collector._client is None
+        await collector.close()
+
+        client = collector._get_client()
+        assert collector._get_client() is client
+
+        await collector.close()
+
+        assert client.is_closed
+        assert collector._client is None
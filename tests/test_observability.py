@@ -0,0 +1,312 @@
+"""Observability (model drift) tests."""
+
+import httpx
+import numpy as np
+import pytest
+
+from src.observability.model_drift import (
+    ADAPTIVE_MIN_SAMPLES,
+    DriftSeverity,
+    ModelDriftDetector,
+    PrometheusMetricsCollector,
+    StreamingPercentile,
+    ZSCORE_MIN_SAMPLES,
+    ZSCORE_SMOOTHING,
+)
+
+
+def detection_fields(detection) -> tuple:
+    """A detection without its timestamp, for comparing two detectors."""
+    return (
+        detection.metric_name,
+        detection.baseline_value,
+        detection.current_value,
+        detection.percent_change,
+        detection.severity,
+        detection.message,
+    )
+
+
+class TestStreamingPercentile:
+    """Streaming percentile estimator tests."""
+
+    @pytest.mark.parametrize("q", [0.5, 0.9, 0.95, 0.99])
+    def test_close_to_numpy_percentile(self, q):
+        """Test estimates land within one bin of the exact percentile."""
+        values = np.random.default_rng(0).exponential(0.2, 5000)
+        estimator = StreamingPercentile()
+        for value in values:
+            estimator.update(float(value))
+
+        bin_width = estimator.upper / len(estimator.counts)
+        assert estimator.percentile(q) == pytest.approx(np.percentile(values, q * 100), abs=bin_width)
+
+    def test_value_past_upper_merges_bins(self):
+        """Test a value past upper merges bins pairwise and doubles the range."""
+        estimator = StreamingPercentile(n_bins=4, upper=1.0)
+        for value in (0.1, 0.3, 0.6):
+            estimator.update(value)
+        assert estimator.counts.tolist() == [1, 1, 1, 0]
+
+        estimator.update(1.5)
+
+        assert estimator.upper == 2.0
+        assert estimator.counts.tolist() == [2, 1, 0, 1]
+        assert estimator.n == 4
+
+    def test_value_far_past_upper_merges_repeatedly(self):
+        """Test the range keeps doubling until the value fits."""
+        estimator = StreamingPercentile(n_bins=4, upper=1.0)
+        estimator.update(0.1)
+
+        estimator.update(5.0)
+
+        assert estimator.upper == 8.0
+        assert estimator.counts.tolist() == [1, 0, 1, 0]
+
+    def test_non_finite_values_ignored(self):
+        """Test inf and NaN are not counted."""
+        estimator = StreamingPercentile()
+        for value in (float("inf"), float("nan"), 0.5):
+            estimator.update(value)
+
+        assert estimator.n == 1
+        assert estimator.upper == 1.0
+
+    def test_empty(self):
+        """Test an empty estimator reports zero."""
+        assert StreamingPercentile().percentile(0.95) == 0.0
+
+
+class TestAdaptiveThresholds:
+    """Adaptive drift threshold tests."""
+
+    def test_fixed_thresholds_until_enough_samples(self):
+        """Test fixed thresholds apply until ADAPTIVE_MIN_SAMPLES changes are seen."""
+        adaptive = ModelDriftDetector(adaptive_thresholds=True)
+        fixed = ModelDriftDetector()
+
+        for _ in range(ADAPTIVE_MIN_SAMPLES):
+            a = adaptive.check_drift("avg_latency", 1.2, baseline_value=1.0)
+            f = fixed.check_drift("avg_latency", 1.2, baseline_value=1.0)
+            assert a.severity is f.severity is DriftSeverity.WARNING
+
+    def test_thresholds_follow_past_changes(self):
+        """Test a routinely seen change stops alerting and a larger one is critical."""
+        detector = ModelDriftDetector(adaptive_thresholds=True)
+        for _ in range(ADAPTIVE_MIN_SAMPLES):
+            detector.check_drift("avg_latency", 1.2, baseline_value=1.0)
+
+        assert detector.check_drift("avg_latency", 1.2, baseline_value=1.0) is None
+        assert detector.check_drift("avg_latency", 1.25, baseline_value=1.0).severity is DriftSeverity.CRITICAL
+
+    def test_stable_metric_alerts_on_small_change(self):
+        """Test a metric that never changed alerts on a change of a few percent."""
+        detector = ModelDriftDetector(adaptive_thresholds=True)
+        for _ in range(ADAPTIVE_MIN_SAMPLES):
+            detector.check_drift("avg_latency", 1.0, baseline_value=1.0)
+
+        assert detector.check_drift("avg_latency", 1.005, baseline_value=1.0) is None
+        assert detector.check_drift("avg_latency", 1.02, baseline_value=1.0) is not None
+
+
+class TestCheckDriftZscore:
+    """Z-score drift check tests."""
+
+    def warmed_up(self, values) -> ModelDriftDetector:
+        """Detector that has seen ZSCORE_MIN_SAMPLES values cycled from `values`."""
+        detector = ModelDriftDetector()
+        for i in range(ZSCORE_MIN_SAMPLES):
+            assert detector.check_drift_zscore("avg_latency", values[i % len(values)]) is None
+        return detector
+
+    def test_no_alerts_during_warm_up(self):
+        """Test values during warm-up only build statistics."""
+        detector = self.warmed_up([1.0, 100.0, -50.0, 1e6])
+
+        assert detector._zscore_stats["avg_latency"][2] == ZSCORE_MIN_SAMPLES
+
+    def test_jump_after_constant_warm_up_is_critical(self):
+        """Test the first change after identical samples is flagged despite zero spread."""
+        detector = self.warmed_up([1.0])
+
+        assert detector.check_drift_zscore("avg_latency", 1.0) is None
+        drift = detector.check_drift_zscore("avg_latency", 1.5)
+
+        assert drift.severity is DriftSeverity.CRITICAL
+        assert drift.baseline_value == 1.0
+        assert drift.percent_change == pytest.approx(50.0)
+
+    @pytest.mark.parametrize("value, severity", [
+        (2.9, None),  # z = 1.9
+        (3.5, DriftSeverity.WARNING),  # z = 2.5
+        (-1.5, DriftSeverity.WARNING),  # z = 2.5 below the mean
+        (4.5, DriftSeverity.CRITICAL),  # z = 3.5
+    ])
+    def test_severity_cut_offs(self, value, severity):
+        """Test 2 and 3 standard deviations separate normal, warning and critical."""
+        detector = self.warmed_up([0.0, 2.0])  # mean 1, std 1
+
+        drift = detector.check_drift_zscore("avg_latency", value)
+
+        assert (drift and drift.severity) is severity
+
+    def test_ewma_update_after_warm_up(self):
+        """Test each value after warm-up is blended in with weight ZSCORE_SMOOTHING."""
+        detector = self.warmed_up([0.0, 2.0])
+        mean, variance, n = detector._zscore_stats["avg_latency"]
+        assert (mean, variance, n) == (pytest.approx(1.0), pytest.approx(1.0), ZSCORE_MIN_SAMPLES)
+
+        detector.check_drift_zscore("avg_latency", 3.0)
+
+        delta = 3.0 - mean
+        assert detector._zscore_stats["avg_latency"] == [
+            pytest.approx(mean + ZSCORE_SMOOTHING * delta),
+            pytest.approx((1 - ZSCORE_SMOOTHING) * (variance + ZSCORE_SMOOTHING * delta * delta)),
+            ZSCORE_MIN_SAMPLES,
+        ]
+
+
+class TestCheckDriftMany:
+    """Vectorized drift check tests."""
+
+    BASELINES = {
+        "avg_similarity": 0.8,
+        "cache_hit_rate": 0.5,
+        "error_rate": 0.0,
+        "handoff_rate": 0.0,
+        "avg_latency": 2.0,
+    }
+    CURRENT = {
+        "avg_similarity": 0.7,  # 12.5%: normal
+        "cache_hit_rate": 0.4,  # 20%: warning
+        "error_rate": 0.0,  # zero baseline, unchanged
+        "handoff_rate": 0.1,  # zero baseline, infinite change
+        "avg_latency": 3.0,  # 50%: critical
+        "avg_cost": 1.0,  # no baseline yet
+    }
+
+    def make_detector(self, **kwargs) -> ModelDriftDetector:
+        """Detector with BASELINES already set."""
+        detector = ModelDriftDetector(**kwargs)
+        for name, value in self.BASELINES.items():
+            detector.set_baseline(name, value)
+        return detector
+
+    def test_matches_check_drift(self):
+        """Test check_drift_many equals one check_drift call per metric."""
+        single = self.make_detector()
+        many = self.make_detector()
+
+        expected = [single.check_drift(name, value) for name, value in self.CURRENT.items()]
+        detections = many.check_drift_many(self.CURRENT)
+
+        assert [detection_fields(d) for d in detections] == [
+            detection_fields(d) for d in expected if d is not None
+        ]
+        assert [d.metric_name for d in detections] == ["cache_hit_rate", "handoff_rate", "avg_latency"]
+        assert many.baselines == single.baselines
+        assert many.baselines["avg_cost"] == 1.0
+
+    def test_matches_check_drift_adaptive(self):
+        """Test the adaptive path agrees with check_drift over many rounds."""
+        single = self.make_detector(adaptive_thresholds=True)
+        many = self.make_detector(adaptive_thresholds=True)
+
+        for round_ in range(40):
+            current = {name: value * (1 + 0.01 * (round_ % 7)) for name, value in self.CURRENT.items()}
+            expected = [single.check_drift(name, value) for name, value in current.items()]
+            detections = many.check_drift_many(current)
+
+            assert [detection_fields(d) for d in detections] == [
+                detection_fields(d) for d in expected if d is not None
+            ]
+
+    def test_no_baselines(self):
+        """Test a first call only stores baselines."""
+        detector = ModelDriftDetector()
+
+        assert detector.check_drift_many(self.CURRENT) == []
+        assert detector.baselines == self.CURRENT
+
+
+def prometheus_response(value) -> dict:
+    """Instant-query body with one sample, or none when value is None."""
+    result = [] if value is None else [{"metric": {}, "value": [0, value]}]
+    return {"status": "success", "data": {"resultType": "vector", "result": result}}
+
+
+@pytest.fixture
+def prometheus():
+    """Collector whose HTTP client answers from a query -> response table."""
+    responses = {}
+    calls = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        query = request.url.params["query"]
+        calls.append(query)
+        response = responses[query]
+        if isinstance(response, httpx.Response):
+            return response
+        return httpx.Response(200, json=response)
+
+    collector = PrometheusMetricsCollector()
+    collector._client = httpx.AsyncClient(
+        base_url=collector.prometheus_url,
+        transport=httpx.MockTransport(handler),
+    )
+    collector.responses = responses
+    collector.calls = calls
+    return collector
+
+
+class TestPrometheusMetricsCollector:
+    """Prometheus query tests."""
+
+    async def test_query_many_keeps_order(self, prometheus):
+        """Test values come back aligned with their queries."""
+        prometheus.responses.update({
+            "a": prometheus_response("1.5"),
+            "b": prometheus_response(None),
+            "c": prometheus_response("3"),
+        })
+
+        assert await prometheus.query_many(["a", "b", "c"]) == [1.5, None, 3.0]
+
+    async def test_query_many_caches_within_ttl(self, prometheus):
+        """Test repeated queries are served from the cache until it expires."""
+        prometheus.responses.update({"a": prometheus_response("1"), "b": prometheus_response("2")})
+
+        await prometheus.query_many(["a"])
+        assert await prometheus.query_many(["a", "b"]) == [1.0, 2.0]
+        assert prometheus.calls == ["a", "b"]
+
+        prometheus.cache_ttl_seconds = 0.0
+        prometheus._cache.clear()
+        await prometheus.query_many(["a"])
+        await prometheus.query_many(["a"])
+        assert prometheus.calls == ["a", "b", "a", "a"]
+
+    async def test_failed_queries_return_none(self, prometheus):
+        """Test HTTP errors and malformed or non-numeric samples yield None."""
+        prometheus.responses.update({
+            "http_error": httpx.Response(500),
+            "not_json": httpx.Response(200, content=b"oops"),
+            "no_data": {"status": "error"},
+            "no_value": {"data": {"result": [{"metric": {}}]}},
+            "short_value": {"data": {"result": [{"value": [0]}]}},
+            "not_a_number": prometheus_response("abc"),
+            "nan": prometheus_response("NaN"),
+            "ok": prometheus_response("4"),
+        })
+        queries = list(prometheus.responses)
+
+        values = await prometheus.query_many(queries)
+
+        assert values == [None] * (len(queries) - 1) + [4.0]
+
+    async def test_query_metric_defaults_to_zero(self, prometheus):
+        """Test query_metric maps a missing sample to 0.0."""
+        prometheus.responses["a"] = prometheus_response(None)
+
+        assert await prometheus.query_metric("a") == 0.0
@@ -0,0 +1,244 @@
+"""Orchestrator tests."""
+
+import pytest
+
+from src.orchestrator import agent_router, graph, session_manager
+from src.orchestrator.agent_router import AgentRouter, AgentType
+from src.orchestrator.session_manager import SessionManager
+from src.rag.embeddings import EmbeddingResult
+
+
+class FakeClassifier:
+    """Intent classifier counting calls; messages containing "down" raise."""
+
+    def __init__(self):
+        self.calls = []
+
+    async def classify(self, message):
+        self.calls.append(message)
+        if "down" in message:
+            raise RuntimeError("classifier down")
+        return {"intent": "schedule_service", "confidence": 0.9}
+
+
+@pytest.fixture
+def router(monkeypatch):
+    """Router with a fake classifier, a two-entry cache and recorded cache metrics."""
+    operations = []
+    monkeypatch.setattr(agent_router, "CLASSIFY_CACHE_SIZE", 2)
+    monkeypatch.setattr(
+        agent_router,
+        "track_cache_operation",
+        lambda operation, cache_type, latency_ms: operations.append(operation),
+    )
+    router = AgentRouter(FakeClassifier())
+    router.cache_operations = operations
+    return router
+
+
+class TestClassifyCache:
+    """Intent classification cache tests."""
+
+    async def test_hit_skips_classifier(self, router):
+        """Test a repeated message is answered from the cache."""
+        assert await router.route("book a service") == (AgentType.MAINTENANCE, 0.9)
+        assert await router.route("book a service") == (AgentType.MAINTENANCE, 0.9)
+
+        assert router.intent_classifier.calls == ["book a service"]
+        assert router.cache_operations == ["miss", "hit"]
+
+    async def test_evicts_least_recently_used(self, router):
+        """Test the oldest unused message is evicted once the cache is full."""
+        await router.route("a")
+        await router.route("b")
+        await router.route("a")  # hit, so "b" becomes least recently used
+        await router.route("c")  # evicts "b"
+
+        assert list(router._classify_cache) == ["a", "c"]
+
+        await router.route("a")
+        await router.route("b")
+
+        assert router.intent_classifier.calls == ["a", "b", "c", "b"]
+        assert router.cache_operations == ["miss", "miss", "hit", "miss", "hit", "miss"]
+
+    async def test_classifier_failure_not_cached(self, router):
+        """Test rule-based fallbacks are not cached, so the classifier is retried."""
+        assert await router.route("server down, need to fix") == (AgentType.TROUBLESHOOT, 0.72)
+        await router.route("server down, need to fix")
+
+        assert router.intent_classifier.calls == ["server down, need to fix"] * 2
+        assert not router._classify_cache
+        assert router.cache_operations == []
+
+
+class FakeClock:
+    """Settable replacement for time.time."""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def sessions(monkeypatch):
+    """Session manager on a fake clock, recording completion statuses."""
+    clock = FakeClock()
+    completions = []
+    monkeypatch.setattr(session_manager.time, "time", clock)
+    monkeypatch.setattr(
+        session_manager,
+        "track_task_completion",
+        lambda status, agent, duration_seconds: completions.append(status),
+    )
+    manager = SessionManager()
+    manager.clock = clock
+    manager.completions = completions
+    return manager
+
+
+class TestAbandonedSessionCleanup:
+    """Expiry heap cleanup tests."""
+
+    def test_removes_only_idle_sessions(self, sessions):
+        """Test sessions idle past the timeout are abandoned and removed."""
+        idle = sessions.create_session("idle", "specs")
+        idle.add_message("user", "hi")
+        sessions.clock.now = 500.0
+        sessions.create_session("recent", "specs").add_message("user", "hi")
+
+        sessions.clock.now = 700.0
+        sessions.cleanup_abandoned_sessions(timeout_seconds=600)
+
+        assert idle.status == "abandoned"
+        assert list(sessions.sessions) == ["recent"]
+        assert sessions.completions == ["abandoned"]
+
+    def test_stale_entries_skipped(self, sessions):
+        """Test an old heap entry does not expire a session with newer activity."""
+        session = sessions.create_session("s", "specs")
+        session.add_message("user", "hi")
+        sessions.clock.now = 500.0
+        session.add_message("user", "still here")
+
+        sessions.clock.now = 700.0
+        sessions.cleanup_abandoned_sessions(timeout_seconds=600)
+
+        assert session.status == "active"
+        assert sessions.get_session("s") is session
+        assert sessions._expiry_heap == [(500.0, "s")]
+
+        sessions.clock.now = 1200.0
+        sessions.cleanup_abandoned_sessions(timeout_seconds=600)
+
+        assert session.status == "abandoned"
+        assert sessions.get_session("s") is None
+        assert sessions._expiry_heap == []
+
+    def test_replaced_session_not_expired_by_old_activity(self, sessions):
+        """Test a recreated session ignores activity recorded for the one it replaced."""
+        old = sessions.create_session("s", "specs")
+        old.add_message("user", "hi")
+        sessions.clock.now = 500.0
+        new = sessions.create_session("s", "maintenance")
+
+        sessions.clock.now = 700.0
+        sessions.cleanup_abandoned_sessions(timeout_seconds=600)
+
+        assert sessions.get_session("s") is new
+        assert new.status == "active"
+        assert sessions.completions == []
+
+    def test_completed_sessions_not_abandoned(self, sessions):
+        """Test an idle session that already completed keeps its status."""
+        session = sessions.create_session("s", "specs")
+        session.add_message("user", "hi")
+        session.complete_successfully()
+
+        sessions.clock.now = 700.0
+        sessions.cleanup_abandoned_sessions(timeout_seconds=600)
+
+        assert session.status == "completed"
+        assert sessions.completions == ["completed"]
+        assert sessions.get_session("s") is session
+
+    def test_sessions_without_messages_kept(self, sessions):
+        """Test a session with no messages is never treated as abandoned."""
+        session = sessions.create_session("s", "specs")
+
+        sessions.clock.now = 700.0
+        sessions.cleanup_abandoned_sessions(timeout_seconds=600)
+
+        assert session.status == "active"
+        assert sessions.get_session("s") is session
+
+
+class FakeEmbeddings:
+    """Embedding service whose exemplar batch fails while `down` is set."""
+
+    def __init__(self):
+        self.down = True
+        self.batches = 0
+        self.queries = 0
+
+    async def embed_texts(self, texts):
+        self.batches += 1
+        if self.down:
+            raise ConnectionError("embedding API down")
+        # One axis per intent, in INTENT_EXEMPLARS order
+        per_intent = len(texts) // len(graph.INTENT_EXEMPLARS)
+        embeddings = [[float(i // per_intent == axis) for axis in range(3)] for i in range(len(texts))]
+        return EmbeddingResult(embeddings=embeddings, model="fake", dimensions=3)
+
+    async def embed_query(self, text):
+        self.queries += 1
+        return [0.0, 1.0, 0.0]
+
+
+@pytest.fixture
+def orchestrator(monkeypatch):
+    """Orchestrator with fake embeddings, a fake monotonic clock and no LLM or agents."""
+    clock = FakeClock()
+    monkeypatch.setattr(graph.time, "monotonic", clock)
+    monkeypatch.setattr(graph, "create_llm", lambda: None)
+    for name in ("SpecsAgent", "MaintenanceAgent", "TroubleshootAgent"):
+        monkeypatch.setattr(graph, name, lambda: None)
+    monkeypatch.setattr(graph, "CachedEmbeddingService", FakeEmbeddings)
+    orchestrator = graph.Orchestrator()
+    orchestrator.clock = clock
+    return orchestrator
+
+
+class TestPrototypeClassification:
+    """Embedding-centroid intent classification tests."""
+
+    async def test_failed_build_not_retried_until_back_off_expires(self, orchestrator):
+        """Test an embedding outage costs one exemplar batch per back-off window."""
+        embeddings = orchestrator.embeddings
+
+        assert await orchestrator._classify_by_prototype("book a service") is None
+        assert await orchestrator._classify_by_prototype("book a service") is None
+
+        assert embeddings.batches == 1
+        assert embeddings.queries == 0
+
+        embeddings.down = False
+        orchestrator.clock.now = graph.PROTOTYPE_RETRY_SECONDS - 1
+        assert await orchestrator._classify_by_prototype("book a service") is None
+        assert embeddings.batches == 1
+
+        orchestrator.clock.now = graph.PROTOTYPE_RETRY_SECONDS
+        assert await orchestrator._classify_by_prototype("book a service") == "MAINTENANCE"
+        assert embeddings.batches == 2
+        assert embeddings.queries == 1
+
+    async def test_prototypes_built_once(self, orchestrator):
+        """Test a successful build is reused for later messages."""
+        orchestrator.embeddings.down = False
+
+        for _ in range(3):
+            assert await orchestrator._classify_by_prototype("book a service") == "MAINTENANCE"
+
+        assert orchestrator.embeddings.batches == 1
@@ -1,6 +1,13 @@
 """RAG pipeline tests."""
 
+import re
+
+import httpx
+import numpy as np
+import orjson
 import pytest
+from src.rag import embeddings
+from src.rag.embeddings import EMBEDDING_CACHE_TTL_SECONDS, CachedEmbeddingService, EmbeddingService
 from src.rag.chunker import (
     DocumentChunker,
     ChunkerConfig,
@@ -9,6 +16,51 @@ from src.rag.chunker import (
 )
 
 
+# Texts of assorted lengths for comparing chunkers against reference implementations
+_SAMPLE_TEXTS = [
+    "",
+    "short",
+    "x" * 100,
+    "0123456789" * 37,
+    "First paragraph.\n\nSecond one is longer than the first.\n\n  \n\nThird.",
+    "\n\n".join(f"Paragraph {i} " + "word " * (i * 7 % 40) for i in range(30)),
+]
+
+
+def reference_chunk_fixed(text: str, size: int, overlap: int) -> list:
+    """Fixed-size chunking as originally written, stepping start by size - overlap."""
+    chunks = []
+    start = 0
+    while start < len(text):
+        end = start + size
+        chunks.append(text[start:end])
+        start = end - overlap
+    return chunks
+
+
+def reference_chunk_semantic(text: str, size: int, overlap: int) -> list:
+    """Paragraph chunking as originally written, growing each chunk by concatenation."""
+    chunks = []
+    current_chunk = ""
+    for para in re.split(r"\n\s*\n", text):
+        para = para.strip()
+        if not para:
+            continue
+        if len(current_chunk) + len(para) + 2 > size:
+            if current_chunk:
+                chunks.append(current_chunk.strip())
+            current_chunk = para
+        else:
+            current_chunk += "\n\n" + para if current_chunk else para
+    if current_chunk:
+        chunks.append(current_chunk.strip())
+    if overlap > 0 and len(chunks) > 1:
+        chunks = [chunks[0]] + [
+            chunks[i - 1][-overlap:] + "\n\n" + chunks[i] for i in range(1, len(chunks))
+        ]
+    return chunks
+
+
 class TestDocumentChunker:
     """Document chunker tests."""
 
@@ -136,3 +188,231 @@ The engine is a 2.0L turbocharged four-cylinder.
             chunks = chunker.chunk(sample_text, strategy=strategy)
             assert len(chunks) > 0, f"Strategy {strategy} produced no chunks"
             assert all(c.content for c in chunks), f"Strategy {strategy} produced empty chunks"
+
+
+class TestFixedChunking:
+    """Fixed-size chunking tests."""
+
+    @pytest.mark.parametrize("size, overlap", [(10, 0), (10, 3), (50, 49), (100, 20), (1000, 200)])
+    def test_matches_reference(self, size, overlap):
+        """Test chunks match the original start-offset loop."""
+        chunker = DocumentChunker(ChunkerConfig(chunk_size=size, chunk_overlap=overlap))
+
+        for text in _SAMPLE_TEXTS:
+            assert chunker._chunk_fixed(text) == reference_chunk_fixed(text, size, overlap)
+
+    @pytest.mark.parametrize("overlap", [100, 150])
+    def test_overlap_not_smaller_than_size_rejected(self, overlap):
+        """Test an overlap of at least chunk_size raises instead of looping."""
+        chunker = DocumentChunker(ChunkerConfig(chunk_size=100, chunk_overlap=overlap))
+
+        with pytest.raises(ValueError, match="chunk_overlap"):
+            chunker.chunk("x" * 500, strategy=ChunkingStrategy.FIXED)
+
+
+class TestSemanticChunking:
+    """Paragraph-based chunking tests."""
+
+    @pytest.mark.parametrize("size, overlap", [(10, 0), (40, 5), (100, 20), (300, 0), (1000, 200)])
+    def test_matches_reference(self, size, overlap):
+        """Test chunks match the original string-concatenation version."""
+        chunker = DocumentChunker(ChunkerConfig(chunk_size=size, chunk_overlap=overlap))
+
+        for text in _SAMPLE_TEXTS:
+            assert chunker._chunk_semantic(text) == reference_chunk_semantic(text, size, overlap)
+
+
+def fake_embedding(text: str) -> list:
+    """Deterministic float32-exact embedding for a text."""
+    return [float(len(text)), 0.5, -2.0]
+
+
+@pytest.fixture
+def embedding_api(monkeypatch):
+    """Shared embedding client backed by a mock API; returns the requests it saw."""
+    requests = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(request)
+        texts = orjson.loads(request.content)["input"]
+        data = [{"index": i, "embedding": fake_embedding(t)} for i, t in reversed(list(enumerate(texts)))]
+        return httpx.Response(200, json={"data": data, "usage": {"total_tokens": len(texts)}})
+
+    client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    monkeypatch.setattr(embeddings, "_http_client", client)
+    return requests
+
+
+class TestEmbeddingService:
+    """Embedding API client tests."""
+
+    async def test_services_share_one_client(self, embedding_api):
+        """Test every service uses the shared client with its own URL and key."""
+        first = EmbeddingService(api_key="key-1", base_url="https://one.example/v1/")
+        second = EmbeddingService(api_key="key-2", base_url="https://two.example/api")
+
+        assert await first.embed_query("abc") == fake_embedding("abc")
+        assert await second.embed_query("de") == fake_embedding("de")
+
+        assert [str(r.url) for r in embedding_api] == [
+            "https://one.example/v1/embeddings",
+            "https://two.example/api/embeddings",
+        ]
+        assert [r.headers["Authorization"] for r in embedding_api] == ["Bearer key-1", "Bearer key-2"]
+
+    async def test_embed_texts_keeps_order_across_batches(self, embedding_api):
+        """Test embeddings stay aligned with texts when split into batches."""
+        texts = ["a" * n for n in range(1, 8)]
+
+        result = await EmbeddingService(api_key="k").embed_texts(texts, batch_size=3)
+
+        assert result.embeddings == [fake_embedding(t) for t in texts]
+        assert result.tokens_used == len(texts)
+        assert len(embedding_api) == 3
+
+    async def test_close_http_client(self, embedding_api):
+        """Test closing the shared client makes the next request open a new one."""
+        client = embeddings.get_http_client()
+
+        await embeddings.close_http_client()
+
+        assert client.is_closed
+        assert embeddings._http_client is None
+        replacement = embeddings.get_http_client()
+        assert replacement is not client
+        await embeddings.close_http_client()
+
+
+class FakeRedis:
+    """In-memory stand-in for the binary Redis client; records commands."""
+
+    def __init__(self):
+        self.store = {}
+        self.commands = []
+
+    async def get(self, key):
+        self.commands.append(("get", key))
+        return self.store.get(key)
+
+    async def mget(self, keys):
+        self.commands.append(("mget", list(keys)))
+        return [self.store.get(key) for key in keys]
+
+    async def setex(self, key, ttl, value):
+        self.commands.append(("setex", key, ttl))
+        self.store[key] = value
+
+    def pipeline(self):
+        return FakePipeline(self)
+
+
+class FakePipeline:
+    """Buffers setex calls until execute, like a redis pipeline."""
+
+    def __init__(self, redis):
+        self.redis = redis
+        self.queued = []
+
+    def setex(self, key, ttl, value):
+        self.queued.append((key, ttl, value))
+        return self
+
+    async def execute(self):
+        self.redis.commands.append(("execute", [key for key, _, _ in self.queued]))
+        for key, _, value in self.queued:
+            self.redis.store[key] = value
+
+
+@pytest.fixture
+def fake_redis(monkeypatch):
+    """Binary Redis client replaced by a FakeRedis."""
+    import src.api.cache
+
+    redis = FakeRedis()
+
+    async def get_redis_binary():
+        return redis
+
+    monkeypatch.setattr(src.api.cache, "get_redis_binary", get_redis_binary)
+    return redis
+
+
+class TestCachedEmbeddingService:
+    """Redis-cached embedding tests."""
+
+    async def test_embed_queries_mixes_hits_and_misses_in_order(self, embedding_api, fake_redis):
+        """Test cached and newly embedded vectors come back in input order."""
+        service = CachedEmbeddingService(api_key="k")
+        await service.embed_queries(["bb", "dddd"])
+        embedding_api.clear()
+        fake_redis.commands.clear()
+
+        texts = ["a", "bb", "ccc", "dddd", "eeeee"]
+        result = await service.embed_queries(texts)
+
+        assert result == [fake_embedding(t) for t in texts]
+        assert orjson.loads(embedding_api[0].content)["input"] == ["a", "ccc", "eeeee"]
+        assert fake_redis.commands == [
+            ("mget", [service._cache_key(t) for t in texts]),
+            ("execute", [service._cache_key(t) for t in ("a", "ccc", "eeeee")]),
+        ]
+
+    async def test_embed_queries_all_cached(self, embedding_api, fake_redis):
+        """Test a fully cached batch makes no API call and no writes."""
+        service = CachedEmbeddingService(api_key="k")
+        await service.embed_queries(["a", "bb"])
+        embedding_api.clear()
+        fake_redis.commands.clear()
+
+        assert await service.embed_queries(["bb", "a"]) == [fake_embedding("bb"), fake_embedding("a")]
+        assert embedding_api == []
+        assert [command[0] for command in fake_redis.commands] == ["mget"]
+
+    async def test_embed_queries_cache_failure_falls_back(self, embedding_api, monkeypatch):
+        """Test an unreachable cache still returns embeddings from the API."""
+        import src.api.cache
+
+        async def get_redis_binary():
+            raise ConnectionError("redis down")
+
+        monkeypatch.setattr(src.api.cache, "get_redis_binary", get_redis_binary)
+
+        result = await CachedEmbeddingService(api_key="k").embed_queries(["a", "bb"])
+
+        assert result == [fake_embedding("a"), fake_embedding("bb")]
+
+    async def test_embed_query_stores_float32_bytes(self, embedding_api, fake_redis):
+        """Test a cached embedding is raw float32 bytes and reads back unchanged."""
+        service = CachedEmbeddingService(api_key="k")
+        key = service._cache_key("abc")
+
+        first = await service.embed_query("abc")
+        second = await service.embed_query("abc")
+
+        assert fake_redis.commands == [
+            ("get", key),
+            ("setex", key, EMBEDDING_CACHE_TTL_SECONDS),
+            ("get", key),
+        ]
+        assert fake_redis.store[key] == np.array(fake_embedding("abc"), dtype=np.float32).tobytes()
+        assert second == first == fake_embedding("abc")
+        assert len(embedding_api) == 1
+
+    async def test_cached_values_round_to_float32(self, fake_redis):
+        """Test values read from the cache are the float32 rounding of what was stored."""
+        service = CachedEmbeddingService(api_key="k")
+        vector = [0.1, -1 / 3, 1e-8, 123456.789]
+        fake_redis.store[service._cache_key("q")] = np.asarray(vector, dtype=np.float32).tobytes()
+
+        cached = await service.embed_query("q")
+
+        assert cached == np.asarray(vector, dtype=np.float32).tolist()
+        assert all(isinstance(value, float) for value in cached)
+        assert cached == pytest.approx(vector, rel=1e-6)
+
+    def test_cache_key_versioned_per_model(self):
+        """Test float32 entries never share keys with the old JSON format or other models."""
+        key = CachedEmbeddingService(api_key="k", model="m1")._cache_key("q")
+
+        assert key.startswith("genai:embedding:v2:m1:")
+        assert key != CachedEmbeddingService(api_key="k", model="m2")._cache_key("q")
@@ -0,0 +1,99 @@
+"""WebSocket outbound queue and frame encoding tests."""
+
+import orjson
+
+from src.api.routes.websocket import FrameQueue, _merge_token_frames
+
+
+def drain(queue: FrameQueue) -> list:
+    """Take every queued frame in order."""
+    frames = []
+    while not queue.empty():
+        frames.append(queue.get_nowait())
+    return frames
+
+
+class TestFrameQueue:
+    """Outbound frame queue tests."""
+
+    def test_tokens_queue_while_room(self):
+        """Test each token gets its own frame while the queue has room."""
+        queue = FrameQueue(maxsize=4)
+
+        assert queue.put_token("a")
+        assert queue.put_token("b")
+
+        assert drain(queue) == [["a"], ["b"]]
+
+    def test_full_queue_coalesces_into_newest_token_frame(self):
+        """Test tokens join the newest token frame when the queue is full."""
+        queue = FrameQueue(maxsize=2)
+        queue.put_nowait({"type": "progress"})
+        queue.put_token("a")
+
+        assert queue.put_token("b")
+        assert queue.put_token("c")
+
+        assert drain(queue) == [{"type": "progress"}, ["a", "b", "c"]]
+
+    def test_full_queue_of_control_frames_drops_token(self):
+        """Test a token is dropped when the newest frame is not a token frame."""
+        queue = FrameQueue(maxsize=2)
+        queue.put_token("a")
+        queue.put_nowait({"type": "progress"})
+
+        assert not queue.put_token("b")
+        assert drain(queue) == [["a"], {"type": "progress"}]
+
+    def test_control_frame_closes_token_frame(self):
+        """Test tokens after a control frame never jump ahead of it."""
+        queue = FrameQueue(maxsize=2)
+        queue.put_token("a")
+        queue.get_nowait()
+        queue.put_token("b")
+        queue.put_nowait({"type": "complete"})
+
+        assert not queue.put_token("c")
+        assert drain(queue) == [["b"], {"type": "complete"}]
+
+    def test_taken_token_frame_is_not_extended(self):
+        """Test a token frame taken by the writer no longer receives tokens."""
+        queue = FrameQueue(maxsize=1)
+        queue.put_token("a")
+        taken = queue.get_nowait()
+
+        queue.put_token("b")
+        queue.put_token("c")
+
+        assert taken == ["a"]
+        assert drain(queue) == [["b", "c"]]
+
+
+class TestMergeTokenFrames:
+    """Token frame merging tests."""
+
+    def test_single_token_frame(self):
+        """Test a lone token is encoded as a token frame."""
+        frames = _merge_token_frames([["hi"]])
+
+        assert [orjson.loads(f) for f in frames] == [{"type": "token", "token": "hi"}]
+
+    def test_consecutive_tokens_merge(self):
+        """Test consecutive token frames become one token_batch frame."""
+        frames = _merge_token_frames([["a"], ["b", "c"]])
+
+        assert [orjson.loads(f) for f in frames] == [
+            {"type": "token_batch", "tokens": ["a", "b", "c"]}
+        ]
+
+    def test_order_preserved_around_other_frames(self):
+        """Test tokens stay on their side of non-token frames."""
+        progress = {"type": "progress"}
+        complete = b'{"type":"complete"}'
+
+        frames = _merge_token_frames([["a"], progress, ["b"], ["c"], complete])
+
+        assert frames[1] is progress
+        assert frames[3] is complete
+        assert orjson.loads(frames[0]) == {"type": "token", "token": "a"}
+        assert orjson.loads(frames[2]) == {"type": "token_batch", "tokens": ["b", "c"]}